@@ -0,0 +1,68 @@
+"""
+Per-call overhead of going through the registry: the raw function, the wrapped
+function, `registry.get(...)` on every call, the bound `compehndly.<name>`
+accessor, and the "auto" adapter mode against a registry pinned to one adapter.
+"""
+
+import numpy as np
+import pyarrow as pa
+
+import compehndly
+
+from compehndly.adapters import get_adapter
+
+N_VERSIONS = 20
+FUNCTION = "standardize_creatinine"
+
+
+def _identity(x):
+    return x
+
+
+class Dispatch:
+    def setup(self):
+        self.registry = compehndly.FunctionRegistry()
+        for minor in range(N_VERSIONS):
+            self.registry.register("identity", f"0.{minor}.0", _identity)
+        compehndly._set_registry_builder(lambda: self.registry)
+        self.accessor = compehndly.identity
+        self.wrapped = self.registry.get("identity")
+
+    def teardown(self):
+        compehndly._set_registry_builder(None)
+
+    def time_raw(self):
+        _identity(1)
+
+    def time_wrapped(self):
+        self.wrapped(1)
+
+    def time_get_latest(self):
+        self.registry.get("identity")(1)
+
+    def time_get_version(self):
+        self.registry.get("identity", "0.3.0")(1)
+
+    def time_accessor(self):
+        self.accessor(1)
+
+
+class AutoAdapter:
+    params = [["numpy", "pandas", "polars"], [10, 10_000, 1_000_000]]
+    param_names = ["library", "rows"]
+
+    def setup(self, library, rows):
+        try:
+            adapter = get_adapter(library)
+        except ValueError as e:
+            raise NotImplementedError(str(e)) from None
+        rng = np.random.default_rng(0)
+        self.args = [adapter.from_arrow(pa.array(x)) for x in [rng.lognormal(size=rows), rng.uniform(50, 150, rows)]]
+        self.pinned = compehndly.FunctionRegistry.from_manifest(adapter=library).get(FUNCTION)
+        self.auto = compehndly.FunctionRegistry.from_manifest(adapter="auto").get(FUNCTION)
+
+    def time_pinned(self, library, rows):
+        self.pinned(*self.args)
+
+    def time_auto(self, library, rows):
+        self.auto(*self.args)
@@ -0,0 +1,104 @@
+"""
+Execution modes of registered functions: serial versus the thread pool, eager
+versus fused (expression backend) pipelines, and calls under a memory budget.
+"""
+
+import numpy as np
+import pyarrow as pa
+
+import compehndly
+
+ROWS = [10**6, 10**7]
+FUNCTION = "normalize_specific_gravity"
+
+# a 3-step derived-variable chain
+SPEC = {
+    "lipids": {"function": "total_lipid_concentration", "inputs": ["chol", "trigl"]},
+    "pcb153_lip": {"function": "standardize_lipid", "inputs": ["pcb153", "lipids"]},
+    "pcb153_mb": {
+        "function": "medium_bound_imputation",
+        "inputs": ["pcb153_lip"],
+        "params": {"loq": 0.5, "lod": 0.2},
+    },
+}
+
+# backend and rows per chunk of the input table
+PIPELINE_MODES = {
+    "eager": ("eager", None),
+    "eager-chunked": ("eager", 1 << 16),
+    "expression": ("expression", None),
+}
+
+
+def _gravity_inputs(rows: int) -> tuple[pa.Array, pa.Array]:
+    rng = np.random.default_rng(0)
+    return pa.array(rng.lognormal(size=rows)), pa.array(rng.uniform(1.0, 1.04, size=rows))
+
+
+class Parallel:
+    # 0 runs serially
+    params = [[0, 1, 2, 4, 8], ROWS]
+    param_names = ["workers", "rows"]
+    timeout = 600
+
+    def setup(self, workers, rows):
+        self.measured, self.sg = _gravity_inputs(rows)
+        self.func = compehndly.FunctionRegistry.from_manifest().get(FUNCTION, parallel=workers > 0)
+        self.context = compehndly.option_context(max_workers=max(workers, 1))
+        self.context.__enter__()
+
+    def teardown(self, workers, rows):
+        self.context.__exit__(None, None, None)
+
+    def time_call(self, workers, rows):
+        self.func(self.measured, self.sg, sg_ref=1.024)
+
+
+class Pipeline:
+    params = [list(PIPELINE_MODES), ROWS]
+    param_names = ["mode", "rows"]
+    timeout = 600
+
+    def setup(self, mode, rows):
+        backend, chunk_rows = PIPELINE_MODES[mode]
+        rng = np.random.default_rng(0)
+        table = pa.table(
+            {
+                "chol": rng.normal(200, 30, rows),
+                "trigl": rng.normal(150, 40, rows),
+                "pcb153": rng.lognormal(0, 1, rows),
+            }
+        )
+        if chunk_rows is not None:
+            table = pa.Table.from_batches(table.to_batches(max_chunksize=chunk_rows))
+        self.table = table
+        self.pipeline = compehndly.Pipeline(SPEC, backend=backend)
+
+    def time_run(self, mode, rows):
+        self.pipeline.run(self.table, outputs=["pcb153_mb"])
+
+    def peakmem_run(self, mode, rows):
+        self.pipeline.run(self.table, outputs=["pcb153_mb"])
+
+
+class MemoryBudget:
+    # budget: what the Arrow pool holds plus this many input columns; None is unbudgeted
+    params = [[None, 4, 1], ROWS]
+    param_names = ["headroom", "rows"]
+    timeout = 600
+
+    def setup(self, headroom, rows):
+        self.measured, self.sg = _gravity_inputs(rows)
+        self.func = compehndly.FunctionRegistry.from_manifest().get(FUNCTION)
+        budget = None if headroom is None else pa.total_allocated_bytes() + headroom * self.measured.nbytes
+        self.context = compehndly.option_context(max_memory=budget)
+        self.context.__enter__()
+
+    def teardown(self, headroom, rows):
+        self.context.__exit__(None, None, None)
+
+    def time_call(self, headroom, rows):
+        self.func(self.measured, self.sg, sg_ref=1.024)
+
+    def peakmem_call(self, headroom, rows):
+        self.func(self.measured, self.sg, sg_ref=1.024)
@@ -0,0 +1,71 @@
+"""
+Censored lognormal fits: maximum likelihood, regression on order statistics (ROS)
+and the scipy.stats-based reference, on data censored at two detection limits,
+with the error of the estimated parameters tracked next to the time; and the
+batched fit of one distribution per group.
+"""
+
+import numpy as np
+
+from compehndly.derived_variables.statsutils import (
+    _fit_censored_lognorm_reference,
+    fit_censored_lognorm,
+    fit_censored_lognorm_grouped,
+    fit_censored_lognorm_ros,
+)
+
+MU, SIGMA = 0.3, 1.2
+FITS = {
+    "mle": fit_censored_lognorm,
+    "ros": fit_censored_lognorm_ros,
+    "reference": _fit_censored_lognorm_reference,
+}
+# the reference fit takes minutes beyond this
+REFERENCE_MAX_ROWS = 10**6
+
+
+class CensoredFit:
+    params = [list(FITS), [10**4, 10**6, 10**7]]
+    param_names = ["method", "rows"]
+    timeout = 600
+
+    def setup(self, method, rows):
+        if method == "reference" and rows > REFERENCE_MAX_ROWS:
+            raise NotImplementedError(f"The reference fit is only benchmarked up to {REFERENCE_MAX_ROWS} rows")
+        rng = np.random.default_rng(0)
+        x = rng.lognormal(MU, SIGMA, size=rows)
+        limits = np.where(rng.random(rows) < 0.5, 0.5, 1.5)
+        self.censored = x < limits
+        self.values = np.where(self.censored, limits, x)
+        self.fit = FITS[method]
+
+    def time_fit(self, method, rows):
+        self.fit(self.values, self.censored)
+
+    def track_mu_error(self, method, rows):
+        return abs(np.log(self.fit(self.values, self.censored).kwds["scale"]) - MU)
+
+    def track_sigma_error(self, method, rows):
+        return abs(self.fit(self.values, self.censored).kwds["s"] - SIGMA)
+
+    track_mu_error.unit = "absolute error"
+    track_sigma_error.unit = "absolute error"
+
+
+class GroupedFit:
+    params = [[100, 1000], [200, 2000]]
+    param_names = ["groups", "rows_per_group"]
+    timeout = 600
+
+    def setup(self, groups, rows_per_group):
+        rng = np.random.default_rng(0)
+        self.groups = np.repeat(np.arange(groups), rows_per_group)
+        mu = rng.normal(0.0, 1.0, size=groups)[self.groups]
+        sigma = rng.uniform(0.3, 2.0, size=groups)[self.groups]
+        x = np.exp(mu + sigma * rng.normal(size=self.groups.size))
+        lod = np.where(self.groups % 3 == 0, 0.3, 0.6)
+        self.censored = x < lod
+        self.values = np.where(self.censored, lod, x)
+
+    def time_fit_grouped(self, groups, rows_per_group):
+        fit_censored_lognorm_grouped(self.values, self.censored, self.groups)
@@ -0,0 +1,74 @@
+"""
+Random imputation: by censored fraction, with the imputation step also timed on
+its own (the lognormal fit reads the whole column), and per group, in-process and
+on a process pool.
+"""
+
+import numpy as np
+import pyarrow as pa
+
+from compehndly.derived_variables.imputation import (
+    _censoring,
+    _fit_censored,
+    _impute_chunk,
+    _random_single_imputation_arrow_v0_0_1,
+    _random_single_imputation_grouped_arrow_v0_0_1,
+)
+
+LOD, LOQ = 2.0, 4.0
+
+
+def _biomarker(rows: int, fraction: float, seed: int = 0) -> pa.Array:
+    """Lognormal values above LOQ with `fraction` censored codes and a tenth of that null."""
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(size=rows) + LOQ
+    censored = rng.random(rows) < fraction
+    values[censored] = rng.choice([-1.0, -2.0, -3.0], size=censored.sum())
+    return pa.array(values, mask=rng.random(rows) < fraction / 10)
+
+
+class CensoredFraction:
+    params = [[0.01, 0.1, 0.5], [10**6, 10**7]]
+    param_names = ["censored", "rows"]
+    timeout = 600
+
+    def setup(self, censored, rows):
+        self.biomarker = _biomarker(rows, censored)
+        self.censoring = _censoring(self.biomarker)
+        self.dist = _fit_censored([self.censoring], LOD)
+
+    def time_random_single_imputation(self, censored, rows):
+        _random_single_imputation_arrow_v0_0_1(self.biomarker, LOD, LOQ, seed=0)
+
+    def time_impute(self, censored, rows):
+        _impute_chunk(self.censoring, self.dist, LOD, LOQ, seed=0, rows=0)
+
+    def peakmem_impute(self, censored, rows):
+        _impute_chunk(self.censoring, self.dist, LOD, LOQ, seed=0, rows=0)
+
+
+class Grouped:
+    params = [[100, 1000], [1, 4]]
+    param_names = ["groups", "workers"]
+    timeout = 600
+    ROWS_PER_GROUP = 1000
+
+    def setup(self, groups, workers):
+        rng = np.random.default_rng(0)
+        rows = groups * self.ROWS_PER_GROUP
+        self.groups = pa.array(rng.permutation(np.repeat(np.arange(groups), self.ROWS_PER_GROUP)))
+        mu = rng.normal(0.0, 0.5, size=groups)[self.groups.to_numpy()]
+        biomarker = np.exp(mu + rng.normal(size=rows))
+        biomarker[rng.random(rows) < 0.15] = -1.0
+        self.biomarker = pa.array(biomarker)
+        self.lod = {g: 0.3 + 0.2 * (g % 3) for g in range(groups)}
+        # the first call starts the process pool
+        self._impute(workers)
+
+    def _impute(self, workers):
+        _random_single_imputation_grouped_arrow_v0_0_1(
+            self.biomarker, self.groups, self.lod, LOQ, seed=0, max_workers=workers
+        )
+
+    def time_grouped(self, groups, workers):
+        self._impute(workers)
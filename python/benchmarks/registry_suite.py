@@ -0,0 +1,167 @@
+"""
+asv benchmarks of every function in the registry manifest, at 1e3 to 1e7 rows.
+
+- `Compute` times the Arrow implementation on Arrow inputs (`registry.get_raw`).
+- `Call` times the registered function end to end on the native inputs of each
+  adapter; the difference with `Compute` is the conversion and dispatch overhead.
+- `Conversion` times `to_arrow` / `from_arrow` of one float64 column per adapter.
+
+Arguments are generated from the signatures: array parameters get a lognormal
+column with censored codes and nulls, scalars come from `PARAMETERS`. A function
+with a required parameter that cannot be generated is skipped, so add it to
+`PARAMETERS` or `ARRAYS` when registering it.
+
+    cd python && asv run --bench registry_suite
+"""
+
+import inspect
+
+import numpy as np
+import pyarrow as pa
+
+from compehndly.adapters import get_adapter
+from compehndly.core.manifest import load_manifest
+from compehndly.core.registry import FunctionRegistry
+
+SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+ADAPTERS = ["base", "numpy", "pandas", "polars"]
+# columns passed to functions taking `*arrays`
+N_VARIADIC = 4
+N_GROUPS = 8
+
+# scalar arguments by parameter name; overrides defaults that would dominate the time
+PARAMETERS = {
+    "lod": 0.2,
+    "loq": 0.5,
+    "sg_ref": 1.024,
+    "m": 5,
+    "seed": 0,
+    "n_replicates": 100,
+}
+
+# array arguments that are not a data column, by parameter name
+ARRAYS = {
+    "edges": lambda rows, rng: pa.array([0.5, 1.0, 2.0, 4.0]),
+    "groups": lambda rows, rng: pa.array(rng.integers(0, N_GROUPS, size=rows).astype(str)),
+}
+
+# largest row count per function, where the full range would take minutes per run
+MAX_ROWS = {
+    "random_multiple_imputation": 10**6,
+    "geometric_mean_ci": 10**6,
+    "percentile_ci": 10**6,
+}
+
+FUNCTIONS = [f"{entry.name}@{entry.version}" for entry in load_manifest()]
+
+
+def column(rows: int, rng: np.random.Generator) -> pa.Array:
+    """Lognormal values with 20% censored (-1) and 2% null."""
+    x = rng.lognormal(size=rows)
+    x[rng.random(rows) < 0.2] = -1.0
+    return pa.array(x, mask=rng.random(rows) < 0.02)
+
+
+def _is_array(annotation) -> bool:
+    return "Array" in str(annotation)
+
+
+def make_arguments(func, rows: int, seed: int = 0) -> tuple[list, dict]:
+    """Arrow arguments for `func` at `rows` rows; NotImplementedError if one cannot be made."""
+    rng = np.random.default_rng(seed)
+    args, kwargs = [], {}
+    for name, parameter in inspect.signature(func).parameters.items():
+        if parameter.kind is inspect.Parameter.VAR_POSITIONAL:
+            args.extend(column(rows, rng) for _ in range(N_VARIADIC))
+        elif name in ARRAYS and _is_array(parameter.annotation):
+            kwargs[name] = ARRAYS[name](rows, rng)
+        elif name in PARAMETERS and _is_array(parameter.annotation):
+            # per-row parameter, e.g. the LOQ of `medium_bound_imputation_array`
+            kwargs[name] = pa.array(np.full(rows, PARAMETERS[name]))
+        elif name in PARAMETERS:
+            kwargs[name] = PARAMETERS[name]
+        elif parameter.default is not inspect.Parameter.empty:
+            continue
+        elif _is_array(parameter.annotation):
+            kwargs[name] = column(rows, rng)
+        else:
+            raise NotImplementedError(f"No benchmark value for parameter '{name}' of {func.__name__}")
+    # data columns are passed positionally, as in the docs
+    positional = [
+        name for name in list(kwargs) if isinstance(kwargs[name], pa.Array) and name not in {*ARRAYS, *PARAMETERS}
+    ]
+    return args + [kwargs.pop(name) for name in positional], kwargs
+
+
+def _split(function: str) -> tuple[str, str]:
+    name, version = function.rsplit("@", 1)
+    return name, version
+
+
+def _check_rows(name: str, rows: int):
+    if rows > MAX_ROWS.get(name, rows):
+        # asv skips a parameter combination whose setup raises NotImplementedError
+        raise NotImplementedError(f"{name} is only benchmarked up to {MAX_ROWS[name]} rows")
+
+
+def _native(adapter, value):
+    return adapter.from_arrow(value) if isinstance(value, pa.Array) else value
+
+
+class Compute:
+    params = [FUNCTIONS, SIZES]
+    param_names = ["function", "rows"]
+    timeout = 600
+
+    def setup(self, function, rows):
+        name, version = _split(function)
+        _check_rows(name, rows)
+        self.func = FunctionRegistry.from_manifest().get_raw(name, version)
+        self.args, self.kwargs = make_arguments(self.func, rows)
+
+    def time_compute(self, function, rows):
+        self.func(*self.args, **self.kwargs)
+
+    def peakmem_compute(self, function, rows):
+        self.func(*self.args, **self.kwargs)
+
+
+class Call:
+    params = [FUNCTIONS, ADAPTERS, SIZES]
+    param_names = ["function", "adapter", "rows"]
+    timeout = 600
+
+    def setup(self, function, adapter, rows):
+        name, version = _split(function)
+        _check_rows(name, rows)
+        try:
+            native = get_adapter(adapter)
+        except ValueError as e:
+            raise NotImplementedError(str(e)) from None
+        registry = FunctionRegistry.from_manifest(adapter=adapter)
+        self.func = registry.get(name, version)
+        args, kwargs = make_arguments(registry.get_raw(name, version), rows)
+        self.args = [_native(native, value) for value in args]
+        self.kwargs = {key: _native(native, value) for key, value in kwargs.items()}
+
+    def time_call(self, function, adapter, rows):
+        self.func(*self.args, **self.kwargs)
+
+
+class Conversion:
+    params = [ADAPTERS, SIZES]
+    param_names = ["adapter", "rows"]
+
+    def setup(self, adapter, rows):
+        try:
+            self.adapter = get_adapter(adapter)
+        except ValueError as e:
+            raise NotImplementedError(str(e)) from None
+        self.arrow = column(rows, np.random.default_rng(0))
+        self.native = self.adapter.from_arrow(self.arrow)
+
+    def time_to_arrow(self, adapter, rows):
+        self.adapter.to_arrow(self.native)
+
+    def time_from_arrow(self, adapter, rows):
+        self.adapter.from_arrow(self.arrow)
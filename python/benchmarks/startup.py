@@ -0,0 +1,28 @@
+"""
+Cold start of a short-lived job calling one registered function, each run in a
+fresh interpreter: the eager `build_registry` (imports every function module)
+versus the manifest-driven registry, and `import compehndly` alone.
+"""
+
+BUILDERS = {
+    "eager": "compehndly.FunctionRegistry.build_registry()",
+    "manifest": "compehndly.FunctionRegistry.from_manifest()",
+}
+
+
+class ColdStart:
+    params = list(BUILDERS)
+    param_names = ["registry"]
+
+    def timeraw_first_call(self, registry):
+        return f"""
+import pyarrow as pa
+import compehndly
+
+registry = {BUILDERS[registry]}
+registry.get("standardize_creatinine")(pa.array([50.0]), pa.array([25.0]))
+"""
+
+
+def timeraw_import():
+    return "import compehndly"
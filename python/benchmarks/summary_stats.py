@@ -0,0 +1,91 @@
+"""
+Summary statistics: streaming (t-digest) over record batches, with the percentile
+error against the exact value tracked next to the time; per group on Arrow hash
+aggregation (country x age band x sex); and blocked bootstrap intervals.
+"""
+
+import numpy as np
+import pyarrow as pa
+
+from compehndly.summary_stats.aggregators import Summary
+from compehndly.summary_stats.bootstrap import bootstrap
+from compehndly.summary_stats.grouped import grouped_summary
+
+QUANTILES = (0.5, 0.9, 0.95)
+
+
+def _censored_lognormal(rows: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    x = rng.lognormal(0.5, 1.0, size=rows)
+    x[rng.random(rows) < 0.2] = -1.0
+    return x
+
+
+class Streaming:
+    params = [[10**6, 10**7], [1 << 14, 1 << 17]]
+    param_names = ["rows", "batch_size"]
+    timeout = 600
+
+    def setup(self, rows, batch_size):
+        x = _censored_lognormal(rows)
+        self.batches = [pa.array(x[start : start + batch_size]) for start in range(0, rows, batch_size)]
+        # exact percentiles, censored values ranked lowest
+        ranks = (np.asarray(QUANTILES) * rows - np.sum(x < 0)).astype(np.int64)
+        self.exact = np.sort(x[x >= 0])[ranks]
+
+    def _summarise(self) -> Summary:
+        summary = Summary(QUANTILES)
+        for batch in self.batches:
+            summary.update(batch)
+        return summary
+
+    def time_summary(self, rows, batch_size):
+        self._summarise()
+
+    def peakmem_summary(self, rows, batch_size):
+        self._summarise()
+
+    def track_percentile_error(self, rows, batch_size):
+        estimate = np.array(self._summarise().percentiles(), dtype=np.float64)
+        return float(np.max(np.abs(estimate - self.exact) / self.exact))
+
+    track_percentile_error.unit = "relative error"
+
+
+class Grouped:
+    params = [[10**6, 10**7], [1, 4]]
+    param_names = ["rows", "workers"]
+    timeout = 600
+
+    def setup(self, rows, workers):
+        rng = np.random.default_rng(0)
+        countries = np.array([f"C{i:02d}" for i in range(25)])
+        self.table = pa.table(
+            {
+                "country": pa.array(countries[rng.integers(0, 25, size=rows)]),
+                "age_band": pa.DictionaryArray.from_arrays(
+                    pa.array(rng.integers(0, 20, size=rows, dtype=np.int32)),
+                    pa.array([f"{5 * i}-{5 * i + 4}" for i in range(20)]),
+                ),
+                "sex": pa.array(np.array(["F", "M"])[rng.integers(0, 2, size=rows)]),
+                "x": _censored_lognormal(rows),
+            }
+        )
+
+    def time_grouped_summary(self, rows, workers):
+        grouped_summary(self.table, ["country", "age_band", "sex"], ["x"], quantiles=QUANTILES, max_workers=workers)
+
+
+class Bootstrap:
+    params = [[10**5, 10**6], [100, 1000]]
+    param_names = ["rows", "replicates"]
+    timeout = 600
+
+    def setup(self, rows, replicates):
+        self.values = pa.array(_censored_lognormal(rows))
+
+    def time_bootstrap(self, rows, replicates):
+        bootstrap(self.values, (0.5, 0.95), replicates, seed=0)
+
+    def peakmem_bootstrap(self, rows, replicates):
+        bootstrap(self.values, (0.5, 0.95), replicates, seed=0)
@@ -0,0 +1,63 @@
+"""
+Row-wise reductions over many columns, e.g. 32 PCB or PFAS congeners, and binning
+by fixed edges, quantiles and per-group quantiles.
+"""
+
+import math
+
+import numpy as np
+import pyarrow as pa
+
+from compehndly.utils.bins import assign_bins, assign_group_bins, group_quantile_edges, quantile_edges
+from compehndly.utils.reductions import OPERATIONS, reduce_rows
+
+AGE_BANDS = [0, 18, 30, 45, 65, math.inf]
+
+
+class RowReductions:
+    params = [list(OPERATIONS), [4, 32]]
+    param_names = ["op", "columns"]
+    timeout = 600
+    ROWS = 10**6
+
+    def setup(self, op, columns):
+        rng = np.random.default_rng(0)
+        self.arrays = [
+            pa.array(rng.lognormal(size=self.ROWS), mask=rng.random(self.ROWS) < 0.1) for _ in range(columns)
+        ]
+
+    def time_reduce(self, op, columns):
+        reduce_rows(self.arrays, op)
+
+    def peakmem_reduce(self, op, columns):
+        reduce_rows(self.arrays, op)
+
+
+class Bins:
+    params = [[10**6, 10**7], [10, 1000]]
+    param_names = ["rows", "groups"]
+    timeout = 600
+    Q = 10
+
+    def setup(self, rows, groups):
+        rng = np.random.default_rng(0)
+        self.ages = pa.array(rng.uniform(0, 90, size=rows))
+        self.exposure = pa.array(rng.lognormal(size=rows))
+        self.groups = pa.array(rng.integers(0, groups, size=rows))
+        self.edges = quantile_edges(self.exposure, self.Q)
+        self.group_edges = group_quantile_edges(self.exposure, self.groups, self.Q)
+
+    def time_fixed_bins(self, rows, groups):
+        assign_bins(self.ages, AGE_BANDS)
+
+    def time_quantile_edges(self, rows, groups):
+        quantile_edges(self.exposure, self.Q)
+
+    def time_quantile_bins(self, rows, groups):
+        assign_bins(self.exposure, self.edges)
+
+    def time_group_quantile_edges(self, rows, groups):
+        group_quantile_edges(self.exposure, self.groups, self.Q)
+
+    def time_group_quantile_bins(self, rows, groups):
+        assign_group_bins(self.exposure, self.groups, self.group_edges)
@@ -1,12 +1,13 @@
 import functools
 
 from compehndly.core.registry import FunctionRegistry
-from compehndly.adapters import register_all_adapters
-
-register_all_adapters()
+from compehndly.core.config import config, option_context
+from compehndly.core import profiling
 
 # Internal override hook
 _REGISTRY_BUILDER = None
+# Bumped whenever the registry is rebuilt so bound accessors re-resolve
+_REGISTRY_GENERATION = 0
 
 
 def _set_registry_builder(builder):
@@ -14,9 +15,11 @@ def _set_registry_builder(builder):
     Test helper: override how the registry is built.
     `builder` must be a callable returning a FunctionRegistry instance.
     """
-    global _REGISTRY_BUILDER
+    global _REGISTRY_BUILDER, _REGISTRY_GENERATION
     _REGISTRY_BUILDER = builder
+    _REGISTRY_GENERATION += 1
     _REGISTRY.cache_clear()  # ensures next call uses new builder
+    _ACCESSORS.clear()
 
 
 @functools.lru_cache
@@ -27,7 +30,7 @@ def _REGISTRY():
     if _REGISTRY_BUILDER is not None:
         return _REGISTRY_BUILDER()
 
-    return FunctionRegistry.build_registry()
+    return FunctionRegistry.from_manifest()
 
 
 class _FunctionAccessor:
@@ -36,15 +39,31 @@ class _FunctionAccessor:
     and provides:
         compehndly.add_one(...)
         compehndly.add_one["0.0.1"](...)
+
+    The latest version is resolved once and bound; it is only looked up again
+    after the registry is rebuilt or a new version gets registered.
     """
 
     def __init__(self, name: str):
         self._name = name
+        self._bound = None
+        self._generation = None
+        self._registry = None
+        self._revision = None
+
+    def _bind(self):
+        registry = _REGISTRY()
+        self._bound = registry.get(self._name, version=None)
+        self._generation = _REGISTRY_GENERATION
+        self._registry = registry
+        self._revision = registry._revision
+        return self._bound
 
     def __call__(self, *args, **kwargs):
         """Invoke latest version."""
-        registry = _REGISTRY()
-        fn = registry.get(self._name, version=None)
+        fn = self._bound
+        if self._generation != _REGISTRY_GENERATION or self._revision != self._registry._revision:
+            fn = self._bind()
         return fn(*args, **kwargs)
 
     def __getitem__(self, version: str | None):
@@ -54,17 +73,31 @@ class _FunctionAccessor:
         return fn
 
 
+_ACCESSORS: dict[str, _FunctionAccessor] = {}
+
+
 def __getattr__(name: str):
     """
     Dynamically expose registered functions as attributes:
         compehndly.add_one
     """
+    if name == "Pipeline":
+        # pyarrow.compute is comparatively slow to import; keep it off the `import compehndly` path
+        from compehndly.core.pipeline import Pipeline
+
+        return Pipeline
+
+    accessor = _ACCESSORS.get(name)
+    if accessor is not None:
+        return accessor
+
     registry = _REGISTRY()
 
     if name in registry._functions:
-        return _FunctionAccessor(name)
+        accessor = _ACCESSORS[name] = _FunctionAccessor(name)
+        return accessor
 
     raise AttributeError(f"'compehndly' has no function '{name}'")
 
 
-__all__ = ["FunctionRegistry"]
+__all__ = ["FunctionRegistry", "Pipeline", "config", "option_context", "profiling"]
@@ -1,11 +1,15 @@
 import logging
+import sys
 
-from importlib.metadata import entry_points
 from compehndly.adapters.base import ArrayAdapter
 
 logger = logging.getLogger(__name__)
 
-_ADAPTERS = {}
+# name -> loaded adapter instance
+_ADAPTERS = {"base": ArrayAdapter()}
+# name -> entry point that has been discovered but not loaded yet
+_ENTRY_POINTS = {}
+_DISCOVERED = False
 
 
 def register_adapter(adapter: ArrayAdapter):
@@ -13,13 +17,81 @@ def register_adapter(adapter: ArrayAdapter):
 
 
 def register_all_adapters():
-    logger.debug("Registering adapters")
+    """
+    Record the `compehndly.adapters` entry points without loading them.
+    Loading an adapter imports its dataframe library, so that only happens
+    in `get_adapter` when the adapter is first needed.
+    """
+    global _DISCOVERED
+    # importlib.metadata is comparatively slow to import; keep it off the `import compehndly` path
+    from importlib.metadata import entry_points
+
+    logger.debug("Discovering adapters")
     for ep in entry_points(group="compehndly.adapters"):
-        try:
-            logger.debug(f"loading {ep}")
-            AdapterClass = ep.load()
-            register_adapter(AdapterClass())
-        except ImportError as e:
-            logger.warning(f"Failed to load {ep.name}: {e}")
-
-    register_adapter(ArrayAdapter())
+        if ep.name not in _ADAPTERS:
+            _ENTRY_POINTS.setdefault(ep.name, ep)
+    _DISCOVERED = True
+
+
+def _load_adapter(name: str) -> ArrayAdapter | None:
+    ep = _ENTRY_POINTS.pop(name)
+    try:
+        logger.debug(f"loading {ep}")
+        AdapterClass = ep.load()
+    except ImportError as e:
+        logger.warning(f"Failed to load {ep.name}: {e}")
+        return None
+
+    adapter = AdapterClass()
+    register_adapter(adapter)
+    return adapter
+
+
+def available_adapters() -> list[str]:
+    """Names of the registered adapters, whether loaded yet or not."""
+    if not _DISCOVERED:
+        register_all_adapters()
+    return sorted(set(_ADAPTERS) | set(_ENTRY_POINTS))
+
+
+def loaded_adapters() -> list[ArrayAdapter]:
+    return list(_ADAPTERS.values())
+
+
+def get_adapter(name: str) -> ArrayAdapter:
+    """Return the adapter called `name`, loading its entry point on first use."""
+    adapter = _ADAPTERS.get(name)
+    if adapter is not None:
+        return adapter
+
+    if not _DISCOVERED:
+        register_all_adapters()
+    if name in _ENTRY_POINTS:
+        adapter = _load_adapter(name)
+    if adapter is None:
+        raise ValueError(f"Unknown adapter '{name}'. Available: {', '.join(available_adapters())}")
+    return adapter
+
+
+def find_adapter(obj) -> ArrayAdapter:
+    """
+    Return the adapter whose `matches` accepts `obj`, falling back to the base adapter.
+    An object can only come from a library that is already imported, so only the
+    entry points named after an imported module are loaded to be checked.
+    """
+    if not _DISCOVERED:
+        register_all_adapters()
+    for name in list(_ENTRY_POINTS):
+        if name in sys.modules:
+            _load_adapter(name)
+
+    base = _ADAPTERS["base"]
+    for adapter in _ADAPTERS.values():
+        if adapter is not base and adapter.matches(obj):
+            return adapter
+    return base
+
+
+def matched_by_type(obj) -> bool:
+    """Whether `find_adapter(obj)` only depends on the type of `obj`, with the adapters loaded so far."""
+    return not any(isinstance(obj, adapter.value_matched_types) for adapter in _ADAPTERS.values())
@@ -1,5 +1,8 @@
 import logging
 import numbers
+
+from collections.abc import Mapping
+
 import pyarrow as pa
 
 logger = logging.getLogger(__name__)
@@ -7,18 +10,28 @@ logger = logging.getLogger(__name__)
 
 class ArrayAdapter:
     name: str = "base"
+    # types `matches` accepts or rejects by looking at the object itself (e.g. its ndim),
+    # so per-call dispatch cannot cache its answer by type
+    value_matched_types: tuple[type, ...] = ()
+
+    def matches(self, obj):
+        return isinstance(obj, (pa.Array, pa.ChunkedArray))
 
     def _to_arrow(self, obj):
         return pa.array(obj)
 
     def to_arrow(self, obj) -> pa.Array:
-        if isinstance(obj, (pa.Array, pa.Scalar)):
+        if isinstance(obj, (pa.Array, pa.ChunkedArray, pa.Scalar)):
             return obj
 
         # Python scalar → pass through unchanged
         elif isinstance(obj, (numbers.Number, bool, str)):
             return obj
 
+        # None and mappings are parameters (e.g. a per-group LOD), not data
+        elif obj is None or isinstance(obj, Mapping):
+            return obj
+
         # Python list/iterable → fallback to Arrow
         return self._to_arrow(obj)
 
@@ -9,6 +9,7 @@ logger = logging.getLogger(__name__)
 
 class NumpyAdapter(ArrayAdapter):
     name = "numpy"
+    value_matched_types = (np.ndarray,)
 
     def matches(self, obj):
         return isinstance(obj, np.ndarray) and obj.ndim == 1
@@ -17,4 +18,13 @@ class NumpyAdapter(ArrayAdapter):
         return pa.array(obj)  # zero copy for many numeric dtypes
 
     def from_arrow(self, arrow_obj):
-        return arrow_obj.to_numpy()  # zero-copy where possible
+        if isinstance(arrow_obj, pa.Scalar):
+            # aggregates such as summary statistics
+            return arrow_obj.as_py()
+        if isinstance(arrow_obj, pa.FixedSizeListArray):
+            # one row per element, as a 2-D array
+            return arrow_obj.flatten().to_numpy(zero_copy_only=False).reshape(-1, arrow_obj.type.list_size)
+        if isinstance(arrow_obj, pa.Array):
+            # zero-copy where possible; nulls become NaN (None for non-float types)
+            return arrow_obj.to_numpy(zero_copy_only=False)
+        return arrow_obj.to_numpy()
@@ -17,4 +17,16 @@ class PandasAdapter(ArrayAdapter):
         return pa.array(obj)  # may be zero-copy if ArrowExtensionArray
 
     def from_arrow(self, arrow_obj):
+        if isinstance(arrow_obj, pa.Scalar):
+            # aggregates such as summary statistics
+            return arrow_obj.as_py()
+        if isinstance(arrow_obj, pa.Table):
+            return arrow_obj.to_pandas()
+        if isinstance(arrow_obj, pa.ChunkedArray):
+            # the same dtype as for an Array: chunked results (parallel or memory-budgeted
+            # calls) must not come back as an Arrow-backed series
+            return arrow_obj.to_pandas()
+        if pa.types.is_dictionary(arrow_obj.type):
+            # dictionary-encoded labels (e.g. bins) as a categorical
+            return arrow_obj.to_pandas()
         return pd.Series(arrow_obj)
@@ -15,8 +15,16 @@ class PolarsAdapter(ArrayAdapter):
 
     def _to_arrow(self, obj):
         if isinstance(obj, pl.Series):
+            if obj.n_chunks() > 1:
+                # keep the chunk layout instead of rechunking into one contiguous array
+                return pa.chunked_array([chunk.to_arrow() for chunk in obj.get_chunks()])
             return obj.to_arrow()
         return pa.array(obj)
 
     def from_arrow(self, arrow_obj):
+        if isinstance(arrow_obj, pa.Scalar):
+            # aggregates such as summary statistics
+            return arrow_obj.as_py()
+        if isinstance(arrow_obj, pa.ChunkedArray):
+            return pl.from_arrow(arrow_obj, rechunk=False)
         return pl.from_arrow(arrow_obj)
@@ -0,0 +1,74 @@
+"""
+Command line entry point.
+
+    compehndly transform cohort/ derived/ --spec spec.yaml --keep id --partition-by country
+
+The spec file is a YAML mapping of output column to pipeline step, as accepted
+by `compehndly.Pipeline`.
+"""
+
+import argparse
+import logging
+import sys
+
+import yaml
+
+
+def _read_spec(path) -> dict:
+    with open(path) as f:
+        spec = yaml.safe_load(f)
+    if not isinstance(spec, dict) or not spec:
+        raise ValueError(f"{path}: expected a mapping of output column to pipeline step")
+    return spec
+
+
+def _transform(args) -> int:
+    # pyarrow.dataset is only needed by this command
+    from compehndly.core.dataset import transform_dataset
+
+    written = transform_dataset(
+        args.source,
+        _read_spec(args.spec),
+        args.output_dir,
+        outputs=args.outputs,
+        keep=args.keep,
+        partition_by=args.partition_by,
+        format=args.format,
+        source_format=args.source_format,
+        backend=args.backend,
+        batch_size=args.batch_size,
+        max_rows_per_file=args.max_rows_per_file,
+        overwrite=args.overwrite,
+    )
+    for path in written:
+        print(path)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="compehndly", description="Personal Exposure Health Registry")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log progress")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    transform = commands.add_parser("transform", help="compute pipeline outputs for a Parquet/IPC dataset")
+    transform.add_argument("source", help="source dataset file or directory")
+    transform.add_argument("output_dir", help="directory to write the output dataset to")
+    transform.add_argument("--spec", required=True, help="YAML pipeline spec")
+    transform.add_argument("--outputs", nargs="+", default=None, help="outputs to compute (default: all)")
+    transform.add_argument("--keep", nargs="+", default=[], help="source columns to copy to the output")
+    transform.add_argument("--partition-by", nargs="+", default=[], help="columns to partition the output by")
+    transform.add_argument("--format", choices=["parquet", "ipc"], default="parquet", help="output format")
+    transform.add_argument("--source-format", default="parquet", help="source format (parquet, ipc, csv, ...)")
+    transform.add_argument("--backend", choices=["eager", "expression"], default="eager")
+    transform.add_argument("--batch-size", type=int, default=1 << 17, help="rows per scanned batch")
+    transform.add_argument("--max-rows-per-file", type=int, default=0)
+    transform.add_argument("--overwrite", action="store_true", help="replace existing files in the output directory")
+    transform.set_defaults(handler=_transform)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,12 @@
 from compehndly.core.registry import FunctionRegistry
 
-__all__ = ["FunctionRegistry"]
+__all__ = ["FunctionRegistry", "Pipeline"]
+
+
+def __getattr__(name: str):
+    # imported on first use, pipeline.py pulls in pyarrow.compute
+    if name == "Pipeline":
+        from compehndly.core.pipeline import Pipeline
+
+        return Pipeline
+    raise AttributeError(f"module 'compehndly.core' has no attribute '{name}'")
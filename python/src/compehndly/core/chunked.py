@@ -0,0 +1,78 @@
+import pyarrow as pa
+
+
+def is_array(value) -> bool:
+    return isinstance(value, (pa.Array, pa.ChunkedArray))
+
+
+def has_chunked(args, kwargs) -> bool:
+    return any(isinstance(v, pa.ChunkedArray) for v in args) or any(
+        isinstance(v, pa.ChunkedArray) for v in kwargs.values()
+    )
+
+
+def chunk_boundaries(args, kwargs) -> list[int]:
+    """
+    Row offsets at which any ChunkedArray argument starts a new chunk, plus the total length.
+    Slicing every array argument at these offsets gives pieces that never cross a chunk boundary.
+    """
+    arrays = [v for v in (*args, *kwargs.values()) if is_array(v)]
+    if not arrays:
+        raise ValueError("At least one array argument is required")
+
+    length = len(arrays[0])
+    bounds = {0, length}
+    for arr in arrays:
+        if len(arr) != length:
+            raise ValueError("All array arguments must have the same length")
+        if isinstance(arr, pa.ChunkedArray):
+            offset = 0
+            for chunk in arr.chunks:
+                offset += len(chunk)
+                bounds.add(offset)
+    return sorted(bounds)
+
+
+def _slice(value, offset, length):
+    if isinstance(value, pa.ChunkedArray):
+        piece = value.slice(offset, length)
+        # a piece between two chunk boundaries is a single chunk, so this is zero-copy
+        return piece.chunk(0) if piece.num_chunks == 1 else piece.combine_chunks()
+    if isinstance(value, pa.Array):
+        return value.slice(offset, length)
+    return value
+
+
+def slice_arguments(args, kwargs, offset, length):
+    """Zero-copy slice of every array argument; scalars are passed through."""
+    return (
+        [_slice(v, offset, length) for v in args],
+        {k: _slice(v, offset, length) for k, v in kwargs.items()},
+    )
+
+
+def map_slices(func, args, kwargs, boundaries, executor=None) -> pa.ChunkedArray:
+    """
+    Call an elementwise `func` once per [boundaries[i], boundaries[i + 1]) row range and
+    assemble the results as a ChunkedArray with one chunk per range. With an
+    `executor` the ranges are processed concurrently.
+    """
+    ranges = list(zip(boundaries[:-1], boundaries[1:]))
+
+    def run(row_range):
+        start, stop = row_range
+        slice_args, slice_kwargs = slice_arguments(args, kwargs, start, stop - start)
+        return func(*slice_args, **slice_kwargs)
+
+    pieces = list(map(run, ranges) if executor is None else executor.map(run, ranges))
+
+    if not pieces:
+        # zero-length input: run once on the empty arrays to learn the output type
+        empty_args, empty_kwargs = slice_arguments(args, kwargs, 0, 0)
+        return pa.chunked_array([], type=func(*empty_args, **empty_kwargs).type)
+    return pa.chunked_array(pieces, type=pieces[0].type)
+
+
+def map_chunks(func, args, kwargs) -> pa.ChunkedArray:
+    """Run an elementwise `func` chunk by chunk, so intermediates never exceed one chunk."""
+    return map_slices(func, args, kwargs, chunk_boundaries(args, kwargs))
@@ -0,0 +1,80 @@
+import contextlib
+import dataclasses
+import re
+
+from dataclasses import dataclass
+
+_UNITS = {
+    "": 1,
+    "b": 1,
+    "kb": 10**3,
+    "mb": 10**6,
+    "gb": 10**9,
+    "tb": 10**12,
+    "kib": 2**10,
+    "mib": 2**20,
+    "gib": 2**30,
+    "tib": 2**40,
+}
+
+
+@dataclass
+class Config:
+    # run elementwise functions on a thread pool, slice by slice
+    parallel: bool = False
+    # thread pool size for parallel execution (None: os.cpu_count())
+    max_workers: int | None = None
+    # inputs are not split into slices smaller than this
+    min_slice_rows: int = 1 << 18
+    # budget in bytes for the Arrow memory of a call; elementwise functions are run
+    # in slices that fit (None: no budget). Set as a number or a string like "2GB".
+    max_memory: int | None = None
+
+
+_CONFIG = Config()
+
+
+def parse_bytes(value: int | float | str | None) -> int | None:
+    """Number of bytes in `value`: a number, or a string such as "512MiB" or "2 GB"."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        match = re.fullmatch(r"\s*([0-9.]+(?:e[0-9]+)?)\s*([a-z]*)\s*", value.lower())
+        if match is None or match.group(2) not in _UNITS:
+            raise ValueError(f"Cannot parse memory size '{value}', expected e.g. '512MB' or '2GiB'")
+        value = float(match.group(1)) * _UNITS[match.group(2)]
+    if value <= 0:
+        raise ValueError(f"Memory size must be positive, got {value}")
+    return int(value)
+
+
+def get_config() -> Config:
+    return _CONFIG
+
+
+def config(**options) -> Config:
+    """
+    Update the global execution options and return the resulting configuration:
+
+        compehndly.config(parallel=True, max_workers=16, max_memory="2GB")
+    """
+    fields = {f.name for f in dataclasses.fields(Config)}
+    unknown = set(options) - fields
+    if unknown:
+        raise TypeError(f"Unknown option(s): {', '.join(sorted(unknown))}. Available: {', '.join(sorted(fields))}")
+    if "max_memory" in options:
+        options["max_memory"] = parse_bytes(options["max_memory"])
+    for key, value in options.items():
+        setattr(_CONFIG, key, value)
+    return _CONFIG
+
+
+@contextlib.contextmanager
+def option_context(**options):
+    """Temporarily set execution options, restoring the previous values on exit."""
+    previous = {key: getattr(_CONFIG, key) for key in options}
+    config(**options)
+    try:
+        yield _CONFIG
+    finally:
+        config(**previous)
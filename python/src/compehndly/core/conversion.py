@@ -1,5 +1,119 @@
-def arrowize_arguments(func, adapter):
+import functools
+import itertools
+import numbers
+
+import pyarrow as pa
+
+from compehndly.adapters import find_adapter, get_adapter, matched_by_type
+from compehndly.core.chunked import has_chunked, map_chunks, map_slices
+from compehndly.core.config import get_config
+from compehndly.core.memory import (
+    DEFAULT_MEMORY_FACTOR,
+    MIN_SLICE_ROWS,
+    budget_rows,
+    map_budgeted,
+    row_bytes,
+    split_boundaries,
+)
+from compehndly.core.parallel import get_executor, slice_boundaries, worker_count
+from compehndly.core.profiling import STATE as PROFILING, profiled_call
+from compehndly.core.traits import get_traits
+
+# Adapter mode picking the adapter per call from the type of the first array argument
+AUTO = "auto"
+
+# argument type -> adapter handling it, or None for scalar-like arguments; types an
+# adapter matches by value (e.g. 1-D ndarrays only) are not cached
+_DISPATCH_CACHE = {}
+
+
+def _detect_adapter(obj):
+    if obj is None or isinstance(obj, (numbers.Number, bool, str, pa.Scalar)):
+        return None
+    return find_adapter(obj)
+
+
+def dispatch_adapter(args, kwargs):
+    """
+    Adapter for the first array argument, looked up by type so `matches` only runs once
+    per type, unless an adapter decides on the value of that type.
+    """
+    for value in itertools.chain(args, kwargs.values()):
+        cls = type(value)
+        try:
+            adapter = _DISPATCH_CACHE[cls]
+        except KeyError:
+            adapter = _detect_adapter(value)
+            if matched_by_type(value):
+                _DISPATCH_CACHE[cls] = adapter
+        if adapter is not None:
+            return adapter
+    return get_adapter("base")
+
+
+def _chunkwise(func, parallel=None):
+    """
+    Run elementwise functions slice by slice: chunk by chunk on ChunkedArray arguments,
+    and on the thread pool when parallel execution is requested (`parallel=True`) or,
+    with `parallel=None`, switched on globally through `compehndly.config`. Under a
+    memory budget (`compehndly.config(max_memory=...)`) slices are sized to fit it.
+    """
+    config = get_config()
+    memory_factor = get_traits(func).memory_factor
+
+    def run(*args, **kwargs):
+        if parallel or (parallel is None and config.parallel):
+            workers = worker_count(config.max_workers)
+            boundaries = slice_boundaries(args, kwargs, workers, config.min_slice_rows)
+            if config.max_memory is not None:
+                # the slices in flight share the budget
+                factor = DEFAULT_MEMORY_FACTOR if memory_factor is None else memory_factor
+                rows = budget_rows(factor * row_bytes(args, kwargs)) // workers
+                boundaries = split_boundaries(boundaries, max(rows, MIN_SLICE_ROWS))
+            if len(boundaries) > 2:
+                return map_slices(func, args, kwargs, boundaries, executor=get_executor(config.max_workers))
+        if config.max_memory is not None:
+            return map_budgeted(func, args, kwargs, memory_factor)
+        if has_chunked(args, kwargs):
+            return map_chunks(func, args, kwargs)
+        return func(*args, **kwargs)
+
+    return run
+
+
+def arrowize_arguments(func, adapter, parallel=None, name=None, version=None):
+    """
+    Wrap the Arrow implementation `func` to take and return the types of `adapter`.
+    `name` and `version` identify the function in profiling records.
+    """
+    original = func
+    name = original.__name__ if name is None else name
+    version = "" if version is None else str(version)
+    if get_traits(func).elementwise:
+        func = _chunkwise(func, parallel=parallel)
+    elif parallel:
+        raise ValueError(f"{original.__name__} is not elementwise and cannot be run in parallel slices")
+
+    if adapter == AUTO:
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            call_adapter = dispatch_adapter(args, kwargs)
+            if PROFILING.enabled:
+                return profiled_call(name, version, call_adapter, func, args, kwargs)
+            arr_args = [call_adapter.to_arrow(a) for a in args]
+            arr_kwargs = {k: call_adapter.to_arrow(v) for k, v in kwargs.items()}
+            result = func(*arr_args, **arr_kwargs)
+            # Return the result in the library the input came from
+            return call_adapter.from_arrow(result)
+
+        return wrapper
+
+    @functools.wraps(original)
     def wrapper(*args, **kwargs):
+        if PROFILING.enabled:
+            return profiled_call(name, version, adapter, func, args, kwargs)
+
         # Convert args → arrow
         arr_args = [adapter.to_arrow(a) for a in args]
 
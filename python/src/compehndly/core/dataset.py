@@ -0,0 +1,105 @@
+"""
+Out-of-core transform of a pyarrow dataset through a pipeline.
+
+The source dataset (e.g. partitioned Parquet) is scanned batch by batch, reading
+only the columns the pipeline needs; each batch is transformed and handed to the
+dataset writer, which writes the partitioned output files on background threads
+while the next batches are scanned and computed. Memory use is bounded by the
+scan batch size and read-ahead, not by the size of the dataset.
+
+    transform_dataset("cohort/", spec, "derived/", keep=["id"], partition_by=["country"])
+
+Functions are applied per scanned batch (see `Pipeline.iter_batches`), so
+functions fitting on a whole column, such as random imputation, only see one
+batch at a time; pass them parameters fitted on the whole dataset instead (e.g.
+`lognormal` from `fit_lognormal`). Row-indexed random draws are keyed on the row
+index in the dataset, in scan order.
+"""
+
+import logging
+
+from collections.abc import Iterable
+from pathlib import Path
+
+import pyarrow.dataset as ds
+
+from compehndly.core.pipeline import Pipeline
+from compehndly.core.registry import FunctionRegistry
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ("parquet", "ipc")
+DEFAULT_BATCH_SIZE = 1 << 17
+
+
+def open_dataset(source, format: str = "parquet", partitioning="hive") -> ds.Dataset:
+    """`source` as a pyarrow dataset: a dataset is returned as is, paths are opened lazily."""
+    if isinstance(source, ds.Dataset):
+        return source
+    if isinstance(source, Path):
+        source = str(source)
+    return ds.dataset(source, format=format, partitioning=partitioning)
+
+
+def transform_dataset(
+    source,
+    spec: dict | Pipeline,
+    output_dir,
+    *,
+    outputs: Iterable[str] | None = None,
+    keep: Iterable[str] = (),
+    partition_by: Iterable[str] = (),
+    format: str = "parquet",
+    source_format: str = "parquet",
+    backend: str = "eager",
+    registry: FunctionRegistry | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    batch_readahead: int = 4,
+    fragment_readahead: int = 2,
+    max_rows_per_file: int = 0,
+    max_rows_per_group: int = 0,
+    overwrite: bool = False,
+) -> list[str]:
+    """
+    Compute the pipeline `outputs` (default: all steps) for every row of `source`
+    and write them to `output_dir` as Parquet or Arrow IPC files. `keep` lists
+    source columns to copy to the output; `partition_by` source columns are kept
+    too and used for a hive-style partitioning of the output. Returns the paths
+    of the written files.
+    """
+    if format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{format}'. Available: {', '.join(OUTPUT_FORMATS)}")
+    pipeline = spec if isinstance(spec, Pipeline) else Pipeline(spec, registry=registry, backend=backend)
+    outputs = list(pipeline.steps) if outputs is None else list(outputs)
+    partition_by = list(partition_by)
+    kept = list(dict.fromkeys([*keep, *partition_by]))
+
+    dataset = open_dataset(source, format=source_format)
+    # projection pushdown: only the columns read by the planned steps, plus the kept ones
+    columns = list(dict.fromkeys(pipeline.required_columns(outputs) + kept))
+    missing = [c for c in columns if c not in dataset.schema.names]
+    if missing:
+        raise ValueError(f"Pipeline input columns not found: {', '.join(missing)}")
+    scanner = dataset.scanner(
+        columns=columns,
+        batch_size=batch_size,
+        batch_readahead=batch_readahead,
+        fragment_readahead=fragment_readahead,
+    )
+    logger.debug(f"scanning {columns} in batches of {batch_size} rows")
+    reader = pipeline.execute(scanner.to_reader(), outputs, keep_inputs=kept)
+
+    written = []
+    ds.write_dataset(
+        reader,
+        str(output_dir),
+        format=format,
+        partitioning=partition_by or None,
+        partitioning_flavor="hive" if partition_by else None,
+        max_rows_per_file=max_rows_per_file,
+        max_rows_per_group=max_rows_per_group or min(batch_size, 1 << 20),
+        existing_data_behavior="delete_matching" if overwrite else "error",
+        file_visitor=lambda written_file: written.append(written_file.path),
+    )
+    logger.info(f"wrote {len(written)} files to {output_dir}")
+    return sorted(written)
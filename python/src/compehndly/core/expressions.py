@@ -0,0 +1,53 @@
+"""
+Expression backend: registered functions marked `@elementwise(expression=True)` are
+built from pyarrow.compute calls only, so calling them with pc.Expression inputs
+returns an expression tree instead of computing arrays. A chain of such functions
+compiles into an Acero plan of projections that is evaluated batch by batch, so
+no full-length intermediate array is ever materialised.
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from pyarrow import acero
+
+from compehndly.core.traits import get_traits
+
+
+def to_expression(func, *args, **kwargs) -> pc.Expression:
+    """
+    Expression for `func(*args, **kwargs)`. String positional arguments refer to
+    columns; keyword arguments are scalar parameters.
+    """
+    if not get_traits(func).expression:
+        raise TypeError(f"{func.__name__} has no expression form")
+    args = [pc.field(a) if isinstance(a, str) else a for a in args]
+    result = func(*args, **kwargs)
+    if not isinstance(result, pc.Expression):
+        raise TypeError(f"{func.__name__} did not return an expression")
+    return result
+
+
+def source_declaration(source, columns: list[str]) -> acero.Declaration:
+    """
+    Acero source node reading `columns` from a table, a record batch reader or a
+    pyarrow.dataset.Dataset, in the source's row order.
+    """
+    if isinstance(source, pa.Table):
+        return acero.Declaration("table_source", acero.TableSourceNodeOptions(source.select(columns)))
+    if isinstance(source, pa.RecordBatchReader):
+        source = ds.InMemoryDataset(source)
+    if isinstance(source, ds.Dataset):
+        scan = acero.Declaration("scan", acero.ScanNodeOptions(source, columns=columns, implicit_ordering=True))
+        # the scan node appends fragment/batch index fields; keep only the requested columns
+        return acero.Declaration.from_sequence([scan, project(columns, [pc.field(c) for c in columns])])
+    raise TypeError(f"Expected a Table, RecordBatchReader or Dataset, got {type(source).__name__}")
+
+
+def project(names: list[str], expressions: list[pc.Expression]) -> acero.Declaration:
+    return acero.Declaration("project", acero.ProjectNodeOptions(expressions, names))
+
+
+def chain(nodes: list[acero.Declaration]) -> acero.Declaration:
+    return acero.Declaration.from_sequence(nodes)
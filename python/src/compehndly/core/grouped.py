@@ -0,0 +1,109 @@
+"""
+Group-wise execution of functions that have to see one group at a time, such as a
+distribution fit per laboratory or study.
+
+Rows are hash-partitioned by their group key once; each group's rows are then
+gathered into contiguous arrays, processed on their own, optionally on a process
+pool, and the results are scattered back into the original row order.
+"""
+
+import math
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from compehndly.core.config import get_config
+from compehndly.core.parallel import get_process_executor, worker_count
+
+
+@dataclass
+class GroupPartition:
+    # distinct group keys, in order of first appearance
+    keys: pa.Array
+    # row indices sorted by group; group i owns order[offsets[i]:offsets[i + 1]]
+    order: np.ndarray
+    offsets: np.ndarray
+
+    def __len__(self):
+        return len(self.keys)
+
+    def indices(self, i: int) -> np.ndarray:
+        return self.order[self.offsets[i] : self.offsets[i + 1]]
+
+
+def partition(groups: pa.Array | pa.ChunkedArray) -> GroupPartition:
+    """Partition rows by `groups` (any hashable Arrow type) with one hash pass and a stable counting sort."""
+    if groups.null_count:
+        raise ValueError("Group keys must not be null")
+    if pa.types.is_dictionary(groups.type):
+        # index_in needs plain values, e.g. for pandas categoricals or binned labels
+        groups = pc.cast(groups, groups.type.value_type)
+    keys = pc.unique(groups)
+    codes = pc.index_in(groups, value_set=keys).to_numpy(zero_copy_only=False)
+    order = np.argsort(codes, kind="stable")
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=len(keys)), out=offsets[1:])
+    return GroupPartition(keys=keys, order=order, offsets=offsets)
+
+
+def group_parameter(partition: GroupPartition, value, name: str) -> list:
+    """
+    Per-group value of a parameter given either as one value for all groups or as a
+    mapping from group key to value.
+    """
+    keys = partition.keys.to_pylist()
+    if not isinstance(value, Mapping):
+        return [value] * len(keys)
+    missing = [k for k in keys if k not in value]
+    if missing:
+        raise ValueError(f"No {name} given for group(s): {', '.join(map(str, missing[:10]))}")
+    return [value[k] for k in keys]
+
+
+def group_arrays(partition: GroupPartition, array: pa.Array | pa.ChunkedArray) -> list[pa.Array]:
+    """The rows of `array` for every group, each gathered into one contiguous array."""
+    taken = array.take(pa.array(partition.order))
+    if isinstance(taken, pa.ChunkedArray):
+        taken = taken.combine_chunks()
+    return [taken.slice(start, stop - start) for start, stop in zip(partition.offsets[:-1], partition.offsets[1:])]
+
+
+def scatter(partition: GroupPartition, results: list[np.ndarray]) -> np.ndarray:
+    """Per-group results back in the original row order."""
+    out = np.empty(int(partition.offsets[-1]), dtype=np.result_type(*results) if results else np.float64)
+    out[partition.order] = np.concatenate(results) if results else out[:0]
+    return out
+
+
+def _run_batch(func: Callable, tasks: list[tuple]) -> list:
+    return [func(*args, **kwargs) for args, kwargs in tasks]
+
+
+def map_groups(func: Callable, tasks: list[tuple], max_workers: int | None = None, rows: int | None = None) -> list:
+    """
+    Call `func(*args, **kwargs)` for every `(args, kwargs)` task, in order. With more
+    than one worker the tasks are sent in batches to the shared process pool, so
+    `func` and its arguments must be picklable; a handful of batches per worker
+    keeps the scheduling overhead low for many small groups.
+
+    The tasks run in-process unless `max_workers` asks for more than one worker or
+    parallel execution is switched on through `compehndly.config`. In the latter case
+    calls on fewer than `min_slice_rows` rows (if `rows` is given) stay in-process too,
+    where starting workers and pickling the groups would cost more than the work.
+    """
+    config = get_config()
+    if max_workers is None:
+        parallel = config.parallel and (rows is None or rows >= config.min_slice_rows)
+        max_workers = worker_count(config.max_workers) if parallel else 1
+    workers = worker_count(max_workers)
+    if min(workers, len(tasks)) <= 1:
+        return _run_batch(func, tasks)
+
+    size = math.ceil(len(tasks) / (4 * workers))
+    executor = get_process_executor(workers)
+    futures = [executor.submit(_run_batch, func, tasks[i : i + size]) for i in range(0, len(tasks), size)]
+    return [result for future in futures for result in future.result()]
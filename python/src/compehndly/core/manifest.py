@@ -0,0 +1,116 @@
+"""
+Declarative manifest of registered functions.
+
+The manifest lists, for every registered function, its name, version and the
+module/attribute implementing it. It lets a registry be built without importing
+any function module: modules are only imported when one of their functions is
+first called.
+
+The manifest files live in the top-level `registry/` directory and are generated
+from the module `__registrations__`:
+
+    python -m compehndly.core.manifest          # rewrite the manifest files
+    python -m compehndly.core.manifest --check  # fail if they are out of date
+"""
+
+import argparse
+import importlib
+import logging
+import sys
+
+from pathlib import Path
+
+import yaml
+
+from compehndly.core.models import ManifestEntry
+from compehndly.core.registry import MANIFEST_MODULES
+
+logger = logging.getLogger(__name__)
+
+_HEADER = """\
+# Generated from the module __registrations__ by `python -m compehndly.core.manifest`.
+# Regenerate after adding or changing a registered function; do not edit by hand.
+"""
+
+
+def default_manifest_dir() -> Path:
+    """Manifest directory shipped with the wheel, or the one in a source checkout."""
+    here = Path(__file__).resolve()
+    packaged = here.parent.parent / "registry"
+    if packaged.is_dir():
+        return packaged
+    return here.parents[4] / "registry"
+
+
+def manifest_paths(directory: Path | None = None) -> list[Path]:
+    directory = default_manifest_dir() if directory is None else Path(directory)
+    return [directory / f"{stem}.yaml" for stem in MANIFEST_MODULES]
+
+
+def load_manifest(paths=None) -> list[ManifestEntry]:
+    """Read manifest entries without importing any of the modules they point to."""
+    if paths is None:
+        paths = manifest_paths()
+
+    entries = []
+    for path in paths:
+        with open(path) as f:
+            content = yaml.safe_load(f) or {}
+        for item in content.get("functions") or []:
+            entries.append(
+                ManifestEntry(
+                    name=item["name"],
+                    version=str(item["version"]),
+                    module=item["module"],
+                    function=item["function"],
+                )
+            )
+    return entries
+
+
+def generate_manifest(modules) -> list[ManifestEntry]:
+    """Build manifest entries by importing `modules` and reading their `__registrations__`."""
+    entries = []
+    for module_path in modules:
+        module = importlib.import_module(module_path)
+        for registry_name, name, version, func in getattr(module, "__registrations__", []):
+            if registry_name != "default":
+                raise ValueError(f"Unsupported registry name '{registry_name}' in module '{module_path}'")
+            if getattr(module, func.__name__, None) is not func:
+                raise ValueError(f"Registered function {func.__name__} is not a module attribute of '{module_path}'")
+            entries.append(ManifestEntry(name=name, version=str(version), module=module_path, function=func.__name__))
+    return entries
+
+
+def dump_manifest(entries) -> str:
+    functions = [{"name": e.name, "version": e.version, "module": e.module, "function": e.function} for e in entries]
+    return _HEADER + yaml.safe_dump({"functions": functions}, sort_keys=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the registry manifest files.")
+    parser.add_argument("--directory", type=Path, default=None, help="manifest directory")
+    parser.add_argument("--check", action="store_true", help="only check that the manifest files are up to date")
+    args = parser.parse_args(argv)
+
+    directory = default_manifest_dir() if args.directory is None else args.directory
+    stale = []
+    for stem, modules in MANIFEST_MODULES.items():
+        path = directory / f"{stem}.yaml"
+        content = dump_manifest(generate_manifest(modules))
+        current = path.read_text() if path.exists() else None
+        if current == content:
+            continue
+        stale.append(path)
+        if not args.check:
+            path.write_text(content)
+            logger.info(f"wrote {path}")
+
+    if args.check and stale:
+        print("Out of date: " + ", ".join(str(p) for p in stale), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Memory-budgeted execution (`compehndly.config(max_memory="2GB")`).
+
+The budget bounds the bytes allocated from the Arrow memory pool, inputs and
+results of a call included. Elementwise functions are run in slices sized to what
+is left of the budget: the cost of a row is estimated as the function's
+`memory_factor` trait (default DEFAULT_MEMORY_FACTOR) times the bytes per row of
+its array arguments. Before each slice the remaining budget is read from
+`pa.total_allocated_bytes()`, and a slice that pushes the pool's peak higher than
+the estimate raises the estimate for the following slices.
+
+NumPy temporaries are not allocated from the Arrow pool; they are covered by the
+estimate only. A budget smaller than the inputs and the result cannot be met; the
+slices then shrink to MIN_SLICE_ROWS.
+"""
+
+import math
+
+import pyarrow as pa
+
+from compehndly.core.chunked import chunk_boundaries, is_array, slice_arguments
+from compehndly.core.config import get_config
+
+# peak memory of a call as a multiple of its array arguments, when not declared
+DEFAULT_MEMORY_FACTOR = 2.0
+# slices never get smaller than this, whatever the budget
+MIN_SLICE_ROWS = 1 << 12
+
+
+def row_bytes(args, kwargs) -> float:
+    """Bytes per row of the array arguments."""
+    total = 0.0
+    for value in (*args, *kwargs.values()):
+        if is_array(value) and len(value):
+            total += value.nbytes / len(value)
+    return total
+
+
+def budget_rows(bytes_per_row: float, budget: int | None = None) -> int | None:
+    """
+    Rows of `bytes_per_row` that fit in what is left of the memory budget, at least
+    MIN_SLICE_ROWS; None without a budget.
+    """
+    budget = get_config().max_memory if budget is None else budget
+    if budget is None:
+        return None
+    available = budget - pa.total_allocated_bytes()
+    return max(MIN_SLICE_ROWS, int(available // max(bytes_per_row, 1.0)))
+
+
+def split_boundaries(boundaries: list[int], max_rows: int) -> list[int]:
+    """Split the ranges between `boundaries` into pieces of at most `max_rows` rows."""
+    split = [boundaries[0]]
+    for start, stop in zip(boundaries[:-1], boundaries[1:]):
+        pieces = max(1, math.ceil((stop - start) / max_rows))
+        step = max(1, math.ceil((stop - start) / pieces))
+        split.extend(range(start + step, stop, step))
+        split.append(stop)
+    return split
+
+
+def map_budgeted(func, args, kwargs, memory_factor: float | None = None):
+    """
+    Run an elementwise `func` in consecutive slices that fit in the memory budget,
+    never crossing a chunk boundary. Returns the result of `func` itself when the
+    whole input fits, otherwise a ChunkedArray with one chunk per slice.
+    """
+    budget = get_config().max_memory
+    factor = DEFAULT_MEMORY_FACTOR if memory_factor is None else memory_factor
+    cost = factor * row_bytes(args, kwargs)
+    bounds = chunk_boundaries(args, kwargs)
+    if budget is None or len(bounds) == 2 and budget_rows(cost, budget) >= bounds[-1]:
+        return func(*args, **kwargs)
+
+    pool = pa.default_memory_pool()
+    pieces = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        while start < stop:
+            rows = min(stop - start, budget_rows(cost, budget))
+            slice_args, slice_kwargs = slice_arguments(args, kwargs, start, rows)
+            before, peak = pa.total_allocated_bytes(), pool.max_memory()
+            pieces.append(func(*slice_args, **slice_kwargs))
+            if pool.max_memory() > peak:
+                # this slice set a new peak, so that is its own peak: correct an underestimate
+                cost = max(cost, (pool.max_memory() - before) / rows)
+            start += rows
+    if not pieces:
+        return func(*args, **kwargs)
+    return pa.chunked_array(pieces, type=pieces[0].type)
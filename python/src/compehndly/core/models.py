@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -7,3 +7,36 @@ class FunctionMetadata:
     name: str
     description: str
     authors: list[str]
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    name: str
+    version: str
+    module: str
+    function: str
+
+
+@dataclass
+class FunctionTraits:
+    # output row i depends only on input row i, so inputs may be split into row slices
+    elementwise: bool = False
+    # built only from pyarrow.compute calls, so it also accepts pc.Expression inputs
+    # and then returns a pc.Expression
+    expression: bool = False
+    # peak memory of a call as a multiple of the bytes per row of its array arguments,
+    # used to size slices under a memory budget; None: the default estimate
+    memory_factor: float | None = None
+    # draws depend on the row index (compehndly.core.rng): takes a `row_offset`
+    # argument, the index of its first row in the whole column
+    row_indexed: bool = False
+
+
+@dataclass
+class PipelineStep:
+    function: str
+    # source or step output columns, passed positionally (list) or by keyword (dict)
+    inputs: list[str] | dict[str, str] = field(default_factory=list)
+    # scalar keyword arguments
+    params: dict = field(default_factory=dict)
+    version: str | None = None
@@ -0,0 +1,72 @@
+import math
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from compehndly.core.chunked import chunk_boundaries
+
+_EXECUTOR = None
+_EXECUTOR_WORKERS = None
+_PROCESS_EXECUTOR = None
+_PROCESS_EXECUTOR_WORKERS = None
+_LOCK = threading.Lock()
+
+
+def worker_count(max_workers: int | None = None) -> int:
+    return max_workers or os.cpu_count() or 1
+
+
+def get_executor(max_workers: int | None = None) -> ThreadPoolExecutor:
+    """Shared thread pool; Arrow compute kernels release the GIL, so slices run concurrently."""
+    global _EXECUTOR, _EXECUTOR_WORKERS
+    workers = worker_count(max_workers)
+    with _LOCK:
+        if _EXECUTOR is None or _EXECUTOR_WORKERS != workers:
+            if _EXECUTOR is not None:
+                _EXECUTOR.shutdown(wait=False)
+            _EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="compehndly")
+            _EXECUTOR_WORKERS = workers
+        return _EXECUTOR
+
+
+def get_process_executor(max_workers: int | None = None):
+    """
+    Shared process pool, for work that holds the GIL (e.g. scipy fits). Workers are
+    spawned, not forked, so they are safe to start from a threaded program; each
+    imports compehndly once and is reused for later calls.
+    """
+    global _PROCESS_EXECUTOR, _PROCESS_EXECUTOR_WORKERS
+    # concurrent.futures.process pulls in multiprocessing; only import it when a pool is needed
+    import multiprocessing
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = worker_count(max_workers)
+    with _LOCK:
+        if _PROCESS_EXECUTOR is None or _PROCESS_EXECUTOR_WORKERS != workers:
+            if _PROCESS_EXECUTOR is not None:
+                _PROCESS_EXECUTOR.shutdown(wait=False)
+            _PROCESS_EXECUTOR = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _PROCESS_EXECUTOR_WORKERS = workers
+        return _PROCESS_EXECUTOR
+
+
+def slice_boundaries(args, kwargs, n_workers: int, min_slice_rows: int) -> list[int]:
+    """
+    Row offsets splitting the array arguments into about `n_workers` slices of at
+    least `min_slice_rows` rows. Chunk boundaries of ChunkedArray arguments are kept,
+    so every slice is a zero-copy view of a single chunk.
+    """
+    bounds = chunk_boundaries(args, kwargs)
+    target = max(min_slice_rows, math.ceil(bounds[-1] / max(n_workers, 1)))
+
+    split = [0]
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        pieces = math.ceil((stop - start) / target)
+        step = math.ceil((stop - start) / pieces)
+        split.extend(range(start + step, stop, step))
+        split.append(stop)
+    return split
@@ -0,0 +1,317 @@
+"""
+Table-level execution of registered functions.
+
+A pipeline spec maps output column names to registered function calls:
+
+    spec = {
+        "lipids": {"function": "total_lipid_concentration", "inputs": ["chol", "trigl"]},
+        "pcb153_lip": {"function": "standardize_lipid", "inputs": ["pcb153", "lipids"]},
+        "cd_mb": {"function": "medium_bound_imputation", "inputs": ["cd"], "params": {"loq": 0.1}},
+    }
+
+Inputs name either source columns or the outputs of other steps, so the steps
+form a DAG. Only the steps needed for the requested outputs are run, in
+dependency order, and the data is passed through once: a table is processed
+column-wise (elementwise functions run chunk by chunk), a record batch stream
+batch by batch.
+
+With `backend="expression"` every step must be an expression-capable function
+(`@elementwise(expression=True)`); the steps are then compiled into one Acero
+plan of projections, so intermediate columns only ever exist per batch.
+"""
+
+import graphlib
+import logging
+
+from collections.abc import Iterable, Iterator
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from compehndly.core.conversion import AUTO
+from compehndly.core.models import PipelineStep
+from compehndly.core.registry import FunctionRegistry
+from compehndly.core.traits import get_traits
+
+BACKENDS = ("eager", "expression")
+
+logger = logging.getLogger(__name__)
+
+
+def _as_step(spec) -> PipelineStep:
+    if isinstance(spec, PipelineStep):
+        return spec
+    if isinstance(spec, dict):
+        unknown = set(spec) - {"function", "version", "inputs", "params"}
+        if unknown:
+            raise ValueError(f"Unknown pipeline step keys: {', '.join(sorted(unknown))}")
+        return PipelineStep(
+            function=spec["function"],
+            inputs=spec.get("inputs", []),
+            params=dict(spec.get("params") or {}),
+            version=spec.get("version"),
+        )
+    raise TypeError(f"Pipeline step must be a dict or PipelineStep, got {type(spec).__name__}")
+
+
+def _input_columns(step: PipelineStep) -> list[str]:
+    return list(step.inputs.values()) if isinstance(step.inputs, dict) else list(step.inputs)
+
+
+def _to_reader(batches: Iterator[pa.RecordBatch]) -> pa.RecordBatchReader:
+    try:
+        first = next(batches)
+    except StopIteration:
+        raise ValueError("Cannot execute a pipeline on an empty stream") from None
+
+    def chained():
+        yield first
+        yield from batches
+
+    return pa.RecordBatchReader.from_batches(first.schema, chained())
+
+
+def _kept_columns(names: list[str], outputs: list[str], keep_inputs) -> list[str]:
+    """Source columns passed through: all (`True`), none (`False`) or the listed ones."""
+    if keep_inputs is True:
+        return [name for name in names if name not in outputs]
+    if not keep_inputs:
+        return []
+    return [name for name in keep_inputs if name not in outputs]
+
+
+class Pipeline:
+    def __init__(self, spec: dict, registry: FunctionRegistry | None = None, backend: str = "eager"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Available: {', '.join(BACKENDS)}")
+        self.backend = backend
+        self.steps = {output: _as_step(step) for output, step in spec.items()}
+        self.registry = FunctionRegistry.from_manifest() if registry is None else registry
+        adapter = self.registry.adapter
+        if adapter != AUTO and adapter.name != "base":
+            raise ValueError(f"Pipelines run on Arrow data and need a 'base' or 'auto' registry, got '{adapter.name}'")
+
+        # resolve every function up front so a bad spec fails before any data is read
+        self._functions = {
+            output: self.registry.get(step.function, step.version) for output, step in self.steps.items()
+        }
+        if backend == "expression":
+            self._raw = {
+                output: self.registry.get_raw(step.function, step.version) for output, step in self.steps.items()
+            }
+            for output, func in self._raw.items():
+                if not get_traits(func).expression:
+                    raise ValueError(
+                        f"Step '{output}': function '{self.steps[output].function}' has no expression form, "
+                        "use backend='eager'"
+                    )
+
+    def plan(self, outputs: Iterable[str] | None = None) -> list[str]:
+        """Steps needed for `outputs` (default: all steps), in execution order."""
+        outputs = list(self.steps) if outputs is None else list(outputs)
+        for output in outputs:
+            if output not in self.steps:
+                raise KeyError(f"Pipeline has no output '{output}'")
+
+        needed, stack = set(), list(outputs)
+        while stack:
+            output = stack.pop()
+            if output in needed:
+                continue
+            needed.add(output)
+            stack.extend(c for c in _input_columns(self.steps[output]) if c in self.steps)
+
+        sorter = graphlib.TopologicalSorter(
+            {output: [c for c in _input_columns(self.steps[output]) if c in self.steps] for output in needed}
+        )
+        try:
+            return list(sorter.static_order())
+        except graphlib.CycleError as e:
+            raise ValueError(f"Pipeline steps form a cycle: {' -> '.join(e.args[1])}") from None
+
+    def required_columns(self, outputs: Iterable[str] | None = None) -> list[str]:
+        """Source columns read by the steps needed for `outputs`."""
+        columns = []
+        for output in self.plan(outputs):
+            for column in _input_columns(self.steps[output]):
+                if column not in self.steps and column not in columns:
+                    columns.append(column)
+        return columns
+
+    def _compute(
+        self, columns: dict, order: list[str], outputs: list[str], row_offset: int = 0, row_indexed=()
+    ) -> dict:
+        # last step reading each column, so intermediates can be released as early as possible
+        last_use = {}
+        for i, output in enumerate(order):
+            for column in _input_columns(self.steps[output]):
+                last_use[column] = i
+
+        for i, output in enumerate(order):
+            step = self.steps[output]
+            if isinstance(step.inputs, dict):
+                args, kwargs = [], {name: columns[column] for name, column in step.inputs.items()}
+            else:
+                args, kwargs = [columns[column] for column in step.inputs], {}
+            params = step.params
+            if row_offset and output in row_indexed:
+                params = {**params, "row_offset": params.get("row_offset", 0) + row_offset}
+            columns[output] = self._functions[output](*args, **kwargs, **params)
+
+            for column in _input_columns(step):
+                if last_use[column] == i and column in self.steps and column not in outputs:
+                    columns.pop(column, None)
+        return columns
+
+    def expressions(self, outputs: Iterable[str] | None = None) -> dict[str, pc.Expression]:
+        """
+        Expression of each step needed for `outputs`, in execution order. Inputs that
+        are outputs of other steps are referenced by field name, not inlined, so a
+        shared intermediate is only evaluated once.
+        """
+        if self.backend != "expression":
+            raise ValueError("expressions() needs backend='expression'")
+        from compehndly.core.expressions import to_expression
+
+        compiled = {}
+        for output in self.plan(outputs):
+            step = self.steps[output]
+            if isinstance(step.inputs, dict):
+                kwargs = {name: pc.field(column) for name, column in step.inputs.items()}
+                compiled[output] = to_expression(self._raw[output], **kwargs, **step.params)
+            else:
+                compiled[output] = to_expression(self._raw[output], *step.inputs, **step.params)
+        return compiled
+
+    def declaration(self, source, outputs: Iterable[str] | None = None, keep_inputs: bool | list[str] = False):
+        """
+        Acero plan computing `outputs` from `source` (a table or record batch reader):
+        a source node followed by one projection per step. `keep_inputs` is `True`
+        to pass all source columns through, or a list of source columns to keep.
+        """
+        # pyarrow.acero pulls in pyarrow.dataset (and pandas); only import it when used
+        from compehndly.core.expressions import chain, project, source_declaration
+
+        outputs = list(self.steps) if outputs is None else list(outputs)
+        compiled = self.expressions(outputs)
+        order = list(compiled)
+        required = self.required_columns(outputs)
+        names = source.schema.names
+        kept = _kept_columns(names, outputs, keep_inputs)
+        self._check_columns(names, required + kept)
+
+        available = list(dict.fromkeys(required + kept))
+        # columns still read by a later step
+        read_after = [set() for _ in order]
+        for i in range(len(order) - 2, -1, -1):
+            read_after[i] = read_after[i + 1] | set(_input_columns(self.steps[order[i + 1]]))
+
+        nodes = [source_declaration(source, available)]
+        for i, output in enumerate(order):
+            available = [c for c in available if c in read_after[i] or c in outputs or c in kept]
+            nodes.append(project(available + [output], [pc.field(c) for c in available] + [compiled[output]]))
+            available.append(output)
+        final = kept + outputs
+        nodes.append(project(final, [pc.field(c) for c in final]))
+        return chain(nodes)
+
+    def _check_columns(self, names, required):
+        missing = [c for c in required if c not in names]
+        if missing:
+            raise ValueError(f"Pipeline input columns not found: {', '.join(missing)}")
+
+    def run(
+        self, table: pa.Table, outputs: Iterable[str] | None = None, keep_inputs: bool | list[str] = False
+    ) -> pa.Table:
+        """
+        Compute `outputs` for a whole table. Each function sees complete columns, so
+        functions fitting on the full column (e.g. random imputation) behave as when
+        called directly.
+        """
+        if isinstance(table, pa.RecordBatch):
+            table = pa.Table.from_batches([table])
+        if self.backend == "expression":
+            return self.declaration(table, outputs, keep_inputs).to_table()
+
+        outputs = list(self.steps) if outputs is None else list(outputs)
+        order = self.plan(outputs)
+        required = self.required_columns(outputs)
+        kept = _kept_columns(table.column_names, outputs, keep_inputs)
+        self._check_columns(table.column_names, required + kept)
+
+        columns = self._compute({name: table.column(name) for name in required}, order, outputs)
+        if not kept:
+            return pa.table({output: columns[output] for output in outputs})
+
+        result = table if keep_inputs is True else table.select(kept)
+        for output in outputs:
+            if output in result.column_names:
+                result = result.set_column(result.column_names.index(output), output, columns[output])
+            else:
+                result = result.append_column(output, columns[output])
+        return result
+
+    def iter_batches(
+        self,
+        batches: Iterable[pa.RecordBatch],
+        outputs: Iterable[str] | None = None,
+        keep_inputs: bool | list[str] = False,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Stream record batches through the pipeline, reading only the required columns.
+        Functions are applied per batch, so functions that fit on the whole column
+        (e.g. random imputation) only see one batch at a time. Functions drawing by
+        row index (`@row_indexed`) get the number of rows before the batch as
+        `row_offset`, so their draws are those of a run on the whole table.
+        """
+        if self.backend == "expression":
+            yield from self.execute(batches, outputs, keep_inputs)
+            return
+
+        outputs = list(self.steps) if outputs is None else list(outputs)
+        order = self.plan(outputs)
+        required = self.required_columns(outputs)
+
+        # steps told the index of their first row in the stream
+        row_indexed = {
+            output
+            for output in order
+            if get_traits(self.registry.get_raw(self.steps[output].function, self.steps[output].version)).row_indexed
+        }
+
+        row_offset = 0
+        for batch in batches:
+            names = _kept_columns(batch.schema.names, outputs, keep_inputs)
+            self._check_columns(batch.schema.names, required + names)
+            columns = self._compute(
+                {name: batch.column(name) for name in required}, order, outputs, row_offset, row_indexed
+            )
+            row_offset += batch.num_rows
+            arrays = [batch.column(name) for name in names]
+            for output in outputs:
+                array = columns[output]
+                if isinstance(array, pa.ChunkedArray):
+                    array = array.combine_chunks()
+                arrays.append(array)
+                names.append(output)
+            yield pa.RecordBatch.from_arrays(arrays, names=names)
+
+    def execute(
+        self, source, outputs: Iterable[str] | None = None, keep_inputs: bool | list[str] = False
+    ) -> pa.RecordBatchReader:
+        """
+        Lazily stream `source` (a table, record batch reader or iterable of record
+        batches) through the pipeline as a RecordBatchReader.
+        """
+        if isinstance(source, pa.RecordBatch):
+            source = [source]
+        if self.backend == "expression":
+            if not isinstance(source, (pa.Table, pa.RecordBatchReader)):
+                source = _to_reader(iter(source))
+            return self.declaration(source, outputs, keep_inputs).to_reader()
+        if isinstance(source, pa.Table):
+            source = source.to_reader()
+
+        batches = self.iter_batches(source, outputs=outputs, keep_inputs=keep_inputs)
+        # the output schema is only known once the first batch has gone through
+        return _to_reader(batches)
@@ -0,0 +1,163 @@
+"""
+Opt-in profiling of registered function calls.
+
+When enabled, every call through a registered function records, per (function,
+version, adapter): the number of calls and input rows, the wall time spent in
+`to_arrow`, in the Arrow implementation and in `from_arrow`, and the bytes
+allocated from the default Arrow memory pool while the implementation ran. Disabled,
+the call path only checks one flag.
+
+`allocated_bytes` counts every allocation, temporaries freed before the call
+returns included, not the memory held afterwards. It is read from the pool's
+running total of allocations, so anything allocated concurrently by other threads
+(besides the call's own worker threads) is counted as well. NumPy memory and NumPy
+data wrapped zero-copy by Arrow are not counted.
+
+    from compehndly.core import profiling
+
+    with profiling.profile():
+        run_job()
+    for (name, version, adapter), stats in profiling.snapshot().items():
+        print(name, stats.calls, stats.compute_seconds)
+
+A callback, e.g. a metrics exporter, receives a `CallRecord` after every call.
+"""
+
+import contextlib
+import dataclasses
+import threading
+import time
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import pyarrow as pa
+
+
+@dataclass(frozen=True)
+class CallRecord:
+    """Measurements of one call."""
+
+    name: str
+    version: str
+    adapter: str
+    rows: int
+    to_arrow_seconds: float
+    compute_seconds: float
+    from_arrow_seconds: float
+    allocated_bytes: int
+
+
+@dataclass
+class FunctionStats:
+    """Totals over all calls of one (function, version, adapter)."""
+
+    calls: int = 0
+    rows: int = 0
+    to_arrow_seconds: float = 0.0
+    compute_seconds: float = 0.0
+    from_arrow_seconds: float = 0.0
+    allocated_bytes: int = 0
+
+    @property
+    def seconds(self) -> float:
+        return self.to_arrow_seconds + self.compute_seconds + self.from_arrow_seconds
+
+    def add(self, record: CallRecord):
+        self.calls += 1
+        self.rows += record.rows
+        self.to_arrow_seconds += record.to_arrow_seconds
+        self.compute_seconds += record.compute_seconds
+        self.from_arrow_seconds += record.from_arrow_seconds
+        self.allocated_bytes += record.allocated_bytes
+
+
+class _State:
+    enabled = False
+    callback: Callable[[CallRecord], None] | None = None
+
+
+# read on every call: `if STATE.enabled` is the whole cost of disabled profiling
+STATE = _State()
+_STATS: dict[tuple[str, str, str], FunctionStats] = {}
+_LOCK = threading.Lock()
+
+
+def enable(callback: Callable[[CallRecord], None] | None = None):
+    """Start recording calls; `callback` is called with the `CallRecord` of each call."""
+    STATE.callback = callback
+    STATE.enabled = True
+
+
+def disable():
+    STATE.enabled = False
+    STATE.callback = None
+
+
+def is_enabled() -> bool:
+    return STATE.enabled
+
+
+@contextlib.contextmanager
+def profile(callback: Callable[[CallRecord], None] | None = None):
+    """Record calls within the block, restoring the previous profiling state on exit."""
+    previous = STATE.enabled, STATE.callback
+    enable(callback)
+    try:
+        yield
+    finally:
+        STATE.enabled, STATE.callback = previous
+
+
+def snapshot() -> dict[tuple[str, str, str], FunctionStats]:
+    """Copy of the totals so far, keyed by (function, version, adapter)."""
+    with _LOCK:
+        return {key: dataclasses.replace(stats) for key, stats in _STATS.items()}
+
+
+def reset():
+    """Drop the totals recorded so far."""
+    with _LOCK:
+        _STATS.clear()
+
+
+def _rows(args, kwargs) -> int:
+    for value in (*args, *kwargs.values()):
+        if isinstance(value, (pa.Array, pa.ChunkedArray, pa.Table, pa.RecordBatch)):
+            return len(value)
+    return 0
+
+
+def profiled_call(name: str, version: str, adapter, func, args, kwargs):
+    """Call `func` as the adapter wrapper does (convert, compute, convert back), measuring each step."""
+    start = time.perf_counter()
+    arr_args = [adapter.to_arrow(a) for a in args]
+    arr_kwargs = {k: adapter.to_arrow(v) for k, v in kwargs.items()}
+    converted = time.perf_counter()
+    pool = pa.default_memory_pool()
+    allocated = pool.total_bytes_allocated()
+    result = func(*arr_args, **arr_kwargs)
+    allocated = pool.total_bytes_allocated() - allocated
+    computed = time.perf_counter()
+    out = adapter.from_arrow(result)
+    done = time.perf_counter()
+
+    record = CallRecord(
+        name=name,
+        version=version,
+        adapter=adapter.name,
+        rows=_rows(arr_args, arr_kwargs),
+        to_arrow_seconds=converted - start,
+        compute_seconds=computed - converted,
+        from_arrow_seconds=done - computed,
+        allocated_bytes=allocated,
+    )
+    with _LOCK:
+        stats = _STATS.get((name, version, adapter.name))
+        if stats is None:
+            stats = _STATS[(name, version, adapter.name)] = FunctionStats()
+        stats.add(record)
+    callback = STATE.callback
+    if callback is not None:
+        callback(record)
+    return out
@@ -1,51 +1,159 @@
+import functools
 import importlib
 import logging
 
 from collections import defaultdict
 from packaging.version import Version
 
-from compehndly.core.conversion import arrowize_arguments
-from compehndly.adapters import _ADAPTERS
+from compehndly.core.conversion import AUTO, arrowize_arguments
+from compehndly.adapters import get_adapter
 
 logger = logging.getLogger(__name__)
 
-TO_REGISTER = ["compehndly.utils.example_function"]
+# manifest file stem (registry/<stem>.yaml) -> modules whose __registrations__ it lists
+MANIFEST_MODULES = {
+    "derived_variables": [
+        "compehndly.derived_variables.correction",
+        "compehndly.derived_variables.imputation",
+        "compehndly.derived_variables.summation",
+        "compehndly.utils.bins",
+    ],
+    "secondary_variables": [],
+    "summary_stats": [
+        "compehndly.summary_stats.bootstrap",
+        "compehndly.summary_stats.descriptive",
+    ],
+}
+
+TO_REGISTER = [module for modules in MANIFEST_MODULES.values() for module in modules]
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_version(version: str) -> Version:
+    return Version(version)
+
+
+class _LazyFunction:
+    """
+    Placeholder for a function listed in the manifest whose module has not been imported yet.
+    The module is imported on first call and the placeholder replaces itself in the registry.
+    """
+
+    def __init__(self, registry, name, version, module_path, attr):
+        self._registry = registry
+        self._name = name
+        self._version = version
+        self._module_path = module_path
+        self._attr = attr
+        self._resolved = None
+
+    def resolve(self):
+        if self._resolved is None:
+            logger.debug(f"importing {self._module_path} for {self._name} {self._version}")
+            try:
+                module = importlib.import_module(self._module_path)
+            except ImportError as e:
+                raise ImportError(f"Failed to import module '{self._module_path}': {e}")
+            func = getattr(module, self._attr)
+            self._resolved = arrowize_arguments(
+                func, adapter=self._registry.adapter, name=self._name, version=self._version
+            )
+            self._registry._functions[self._name][self._version] = self._resolved
+            self._registry._revision += 1
+        return self._resolved
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
 
 
 class FunctionRegistry:
     def __init__(self, adapter: str | None = None):
+        # name -> {Version: func}, kept sorted by version on every register
         self._functions = defaultdict(dict)
+        # name -> latest Version
+        self._latest = {}
+        # bumped on every register so bound accessors know when to re-resolve
+        self._revision = 0
+        # (name, Version, parallel) -> function wrapped for that execution mode
+        self._execution_variants = {}
         logging.debug("Running function registry")
-        if adapter is None:
-            self.adapter = _ADAPTERS["base"]
+        if adapter == AUTO:
+            # adapter picked per call from the argument types
+            self.adapter = AUTO
         else:
-            if adapter not in _ADAPTERS:
-                raise ValueError(f"Unknown adapter '{adapter}'. " f"Available: {', '.join(_ADAPTERS)}")
-            self.adapter = _ADAPTERS[adapter]
+            self.adapter = get_adapter("base" if adapter is None else adapter)
 
     def register(self, name, version, func):
-        version = Version(version)
-        if version in self._functions[name]:
+        self._add(name, version, lambda: arrowize_arguments(func, adapter=self.adapter, name=name, version=version))
+
+    def register_lazy(self, name, version, module_path, attr):
+        """Register `module_path.attr` without importing the module until the function is first called."""
+        self._add(name, version, lambda: _LazyFunction(self, name, _parse_version(str(version)), module_path, attr))
+
+    def _add(self, name, version, make_entry):
+        version = _parse_version(str(version))
+        versions = self._functions[name]
+        if version in versions:
             raise ValueError(f"Function {name} version {version} already registered.")
 
-        wrapped_func = arrowize_arguments(func, adapter=self.adapter)
-        self._functions[name][version] = wrapped_func
+        versions[version] = make_entry()
+        latest = self._latest.get(name)
+        if latest is None or version > latest:
+            self._latest[name] = version
+        else:
+            # out-of-order registration: re-sort once here rather than on every get
+            self._functions[name] = dict(sorted(versions.items()))
+        self._revision += 1
 
-    def get(self, name, version=None):
-        """Return the function. If version is None, return latest."""
-        if name not in self._functions:
+    def get(self, name, version=None, parallel=None):
+        """
+        Return the function. If version is None, return latest.
+
+        With `parallel=True` the returned function splits its array arguments into
+        zero-copy slices that run on a thread pool and returns a ChunkedArray; only
+        elementwise functions support this. `parallel=False` forces serial execution,
+        `None` follows `compehndly.config(parallel=...)`.
+        """
+        versions = self._functions.get(name)
+        if versions is None:
             raise KeyError(f"No function registered with name '{name}'")
-        versions = sorted(self._functions[name].keys())
         if version is None:
-            version = versions[-1]
-        else:
-            version = Version(version)
-        return self._functions[name][version]
+            version = self._latest[name]
+        elif not isinstance(version, Version):
+            version = _parse_version(version)
+        fn = versions[version]
+        if parallel is None:
+            return fn
+        return self._get_with_execution(name, version, parallel)
+
+    def _get_with_execution(self, name, version, parallel):
+        key = (name, version, parallel)
+        fn = self._execution_variants.get(key)
+        if fn is None:
+            raw = self.get_raw(name, version)
+            try:
+                fn = arrowize_arguments(raw, adapter=self.adapter, parallel=parallel, name=name, version=version)
+            except ValueError as e:
+                raise ValueError(f"Function '{name}' {version}: {e}") from None
+            self._execution_variants[key] = fn
+        return fn
+
+    def get_raw(self, name, version=None):
+        """Return the registered Arrow implementation itself, without adapter conversion."""
+        fn = self.get(name, version)
+        if isinstance(fn, _LazyFunction):
+            fn = fn.resolve()
+        return fn.__wrapped__
+
+    def latest_version(self, name):
+        if name not in self._functions:
+            raise KeyError(f"No function registered with name '{name}'")
+        return str(self._latest[name])
 
     def list_versions(self, name):
         if name not in self._functions:
             return []
-        return sorted(str(v) for v in self._functions[name].keys())
+        return [str(v) for v in self._functions[name]]
 
     @classmethod
     def build_registry(cls, _to_register=TO_REGISTER, adapter: str | None = None):
@@ -66,3 +174,13 @@ class FunctionRegistry:
                 registry.register(func_name, version, func)
 
         return registry
+
+    @classmethod
+    def from_manifest(cls, paths=None, adapter: str | None = None):
+        """Build the registry from the manifest files without importing any function module."""
+        from compehndly.core.manifest import load_manifest
+
+        registry = cls(adapter=adapter)
+        for entry in load_manifest(paths):
+            registry.register_lazy(entry.name, entry.version, entry.module, entry.function)
+        return registry
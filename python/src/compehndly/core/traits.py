@@ -0,0 +1,58 @@
+from compehndly.core.models import FunctionTraits
+
+_ATTRIBUTE = "__compehndly_traits__"
+
+_DEFAULT = FunctionTraits()
+
+
+def get_traits(func) -> FunctionTraits:
+    return getattr(func, _ATTRIBUTE, _DEFAULT)
+
+
+def _set_traits(func, **traits):
+    current = getattr(func, _ATTRIBUTE, None) or FunctionTraits()
+    for key, value in traits.items():
+        setattr(current, key, value)
+    setattr(func, _ATTRIBUTE, current)
+    return func
+
+
+def elementwise(func=None, *, expression: bool = False):
+    """
+    Mark a registered function as elementwise: every output row only depends on the
+    same row of the array arguments. Such functions may be run slice by slice, e.g.
+    chunk by chunk on a ChunkedArray.
+
+    With `expression=True` the function is also declared to work on pc.Expression
+    inputs, so chains of such functions can be compiled into a single projection.
+    """
+
+    def decorator(func):
+        return _set_traits(func, elementwise=True, expression=expression)
+
+    if func is None:
+        return decorator
+    return decorator(func)
+
+
+def peak_memory(factor: float):
+    """
+    Declare the peak memory of a call, temporaries and result included, as `factor`
+    times the bytes per row of its array arguments. Under a memory budget
+    (`compehndly.config(max_memory=...)`) elementwise functions are sliced by it.
+    """
+
+    def decorator(func):
+        return _set_traits(func, memory_factor=factor)
+
+    return decorator
+
+
+def row_indexed(func):
+    """
+    Mark a registered function whose result depends on the index of each row, such
+    as the counter-based random draws of imputation. It takes a `row_offset`
+    argument, the index of its first row, which pipelines streaming record batches
+    set to the number of rows before the batch.
+    """
+    return _set_traits(func, row_indexed=True)
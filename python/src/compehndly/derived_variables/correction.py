@@ -1,6 +1,8 @@
 import pyarrow as pa
 import pyarrow.compute as pc
 
+from compehndly.core.traits import elementwise, peak_memory
+
 __registrations__ = []
 
 
@@ -24,6 +26,8 @@ def _standardize_v0_0_1_reference(
 
 
 @register(registry_name="default", name="standardize", version="0.0.1")
+@elementwise(expression=True)
+@peak_memory(1.0)
 def _standardize_v0_0_1_arrow(measured: pa.Array, standard: pa.Array) -> pa.Array:
     return pc.divide(pc.multiply(measured, 100), standard)
 
@@ -40,6 +44,8 @@ def _standardize_creatinine_v0_0_1_reference(
 
 
 @register(registry_name="default", name="standardize_creatinine", version="0.0.1")
+@elementwise(expression=True)
+@peak_memory(1.0)
 def _standardize_creatinine_v0_0_1_arrow(measured: pa.Array, crt: pa.Array) -> pa.Array:
     return _standardize_v0_0_1_arrow(measured, crt)
 
@@ -55,6 +61,8 @@ def _normalize_specific_gravity_v0_0_1_reference(
 
 
 @register(registry_name="default", name="normalize_specific_gravity", version="0.0.1")
+@elementwise(expression=True)
+@peak_memory(1.0)
 def _normalize_specific_gravity_v0_0_1_arrow(measured: pa.Array, sg_measured: pa.Array, sg_ref: float) -> pa.Array:
     # Compute (sg_ref - 1) as a scalar
     sg_factor = pa.scalar(sg_ref - 1, type=pa.float64())
@@ -80,6 +88,8 @@ def _total_lipid_concentration_v0_0_1_reference(chol: float, trigl: float) -> fl
 
 
 @register(registry_name="default", name="total_lipid_concentration", version="0.0.1")
+@elementwise(expression=True)
+@peak_memory(1.5)
 def _total_lipid_concentration_v0_0_1_arrow(chol: pa.Array, trigl: pa.Array) -> pa.Array:
     return pc.add(pc.multiply(chol, 2.27), pc.add(trigl, 62.3))
 
@@ -91,6 +101,8 @@ def _standardize_lipid_v0_0_1_reference(
     return _standardize_v0_0_1_reference(measured, lipid_value)
 
 
-@register(registry_name="default", name="normalize_specific_gravity", version="0.0.1")
+@register(registry_name="default", name="standardize_lipid", version="0.0.1")
+@elementwise(expression=True)
+@peak_memory(1.0)
 def _standardize_lipid_v0_0_1_arrow(measured: pa.Array, lipid_value: pa.Array) -> pa.Array:
     return _standardize_v0_0_1_arrow(measured, lipid_value)
@@ -2,10 +2,21 @@ import numpy as np
 import pyarrow as pa
 import pyarrow.compute as pc
 
-from compehndly.derived_variables.statsutils import fit_censored_lognorm
+from scipy.stats import lognorm
+
+from compehndly.core.grouped import group_arrays, group_parameter, map_groups, partition, scatter
+from compehndly.core.memory import budget_rows
+from compehndly.core.rng import new_seed, stream_id, uniforms
+from compehndly.core.traits import elementwise, peak_memory, row_indexed
+from compehndly.derived_variables.statsutils import fit_censored, fit_censored_lognorm_grouped
+from compehndly.utils.conditionals import piecewise
 
 __registrations__ = []
 
+# NumPy temporaries per censored row while imputing: bounds, CDFs, row index, the
+# uniform draw and the ppf evaluation, about 16 float64 arrays
+_IMPUTE_ROW_BYTES = 128
+
 
 # TODO: move decorator for joint use
 def register(registry_name, name, version):
@@ -40,6 +51,8 @@ def _medium_bound_imputation_v0_0_1_reference(
 
 
 @register(registry_name="default", name="medium_bound_imputation", version="0.0.1")
+@elementwise(expression=True)
+@peak_memory(1.25)
 def _medium_bound_imputation_v0_0_1_arrow(
     measurement: pa.Array,
     loq: float,
@@ -59,30 +72,17 @@ def _medium_bound_imputation_v0_0_1_arrow(
         if lod >= loq:
             raise ValueError("lod must be < loq")
 
-    # Start with identity (original measurement)
-    result = measurement
-
+    # one case_when pass; earlier branches win, so each branch is a single comparison
     if lod is None:
         # measurement < loq → loq / 2
-        mask = pc.less(measurement, loq)
-        result = pc.if_else(mask, loq / 2, result)
-
-    else:
-        # measurement < lod → lod / 2
-        mask_below_lod = pc.less(measurement, lod)
-        result = pc.if_else(mask_below_lod, lod / 2, result)
-
-        # lod <= measurement < loq → (lod + loq) / 2
-        mask_between = pc.and_(
-            pc.greater_equal(measurement, lod),
-            pc.less(measurement, loq),
-        )
-        result = pc.if_else(mask_between, (lod + loq) / 2, result)
-
-    return result
+        return piecewise(measurement, [loq], [loq / 2])
+    # measurement < lod → lod / 2, lod <= measurement < loq → (lod + loq) / 2
+    return piecewise(measurement, [lod, loq], [lod / 2, (lod + loq) / 2])
 
 
 @register(registry_name="default", name="medium_bound_imputation_array", version="0.0.1")
+@elementwise
+@peak_memory(1.25)
 def _medium_bound_imputation_v0_0_1_arrow_array(
     measurement: pa.Array,
     loq: pa.Array,
@@ -100,27 +100,40 @@ def _medium_bound_imputation_v0_0_1_arrow_array(
     if lod is not None and len(lod) != length:
         raise ValueError("measurement and lod must have the same length")
 
-    result = measurement
-
     if lod is None:
         # measurement < loq → loq / 2
-        mask = pc.less(measurement, loq)
-        result = pc.if_else(mask, pc.divide(loq, 2.0), result)
+        return piecewise(measurement, [loq], [pc.divide(loq, 2.0)])
+    # measurement < lod → lod / 2, lod <= measurement < loq → (lod + loq) / 2
+    midpoint = pc.divide(pc.add(lod, loq), 2.0)
+    return piecewise(measurement, [lod, loq], [pc.divide(lod, 2.0), midpoint])
 
-    else:
-        # measurement < lod → lod / 2
-        mask_below_lod = pc.less(measurement, lod)
-        result = pc.if_else(mask_below_lod, pc.divide(lod, 2.0), result)
-
-        # lod <= measurement < loq → (lod + loq) / 2
-        mask_between = pc.and_(
-            pc.greater_equal(measurement, lod),
-            pc.less(measurement, loq),
-        )
-        midpoint = pc.divide(pc.add(lod, loq), 2.0)
-        result = pc.if_else(mask_between, midpoint, result)
 
-    return result
+@register(registry_name="default", name="medium_bound_imputation_grouped", version="0.0.1")
+@elementwise
+def _medium_bound_imputation_grouped_v0_0_1_arrow(
+    measurement: pa.Array,
+    groups: pa.Array,
+    loq: float | dict,
+    lod: float | dict | None = None,
+) -> pa.Array:
+    """
+    Medium-bound imputation with the LOQ / LOD of each row's group, given as a
+    mapping from group key to value (or one value for all groups).
+    """
+    if len(groups) != len(measurement):
+        raise ValueError("measurement and groups must have the same length")
+    if not isinstance(loq, dict) and not isinstance(lod, dict):
+        return _medium_bound_imputation_v0_0_1_arrow(measurement, loq, lod)
+    parts = partition(groups)
+    sizes = np.diff(parts.offsets)
+
+    def per_row(value, name):
+        values = group_parameter(parts, value, name)
+        return pa.array(scatter(parts, [np.full(size, v, dtype=np.float64) for v, size in zip(values, sizes)]))
+
+    return _medium_bound_imputation_v0_0_1_arrow_array(
+        measurement, per_row(loq, "loq"), None if lod is None else per_row(lod, "lod")
+    )
 
 
 def _random_single_imputation_reference_v0_0_1(
@@ -132,64 +145,328 @@ def _random_single_imputation_reference_v0_0_1(
     pass
 
 
+def _float_values(biomarker_pa: pa.Array) -> np.ndarray:
+    """Zero-copy float64 view of the data buffer; the slots under nulls are undefined."""
+    if len(biomarker_pa) == 0:
+        return np.empty(0)
+    return np.frombuffer(
+        biomarker_pa.buffers()[1], dtype=np.float64, count=len(biomarker_pa), offset=biomarker_pa.offset * 8
+    )
+
+
+def _censoring(biomarker_pa: pa.Array):
+    """
+    Censored rows of a biomarker column: negative category codes, NaN or null (the
+    latter two count as <LOD, code -1). Returns the zero-copy float64 values, the
+    censored row indices and their codes; only the censored subset is materialised.
+    """
+    if biomarker_pa.type != pa.float64():
+        biomarker_pa = pc.cast(biomarker_pa, pa.float64())
+    values = _float_values(biomarker_pa)
+
+    # null (validity bitmap) or NaN or a negative category code
+    censored = pc.fill_null(pc.or_(pc.less(biomarker_pa, 0.0), pc.is_nan(biomarker_pa)), True)
+    index = pc.indices_nonzero(censored).to_numpy()
+
+    codes = values[index]
+    if biomarker_pa.null_count:
+        codes[pc.is_null(biomarker_pa.take(index)).to_numpy(zero_copy_only=False)] = -1
+    codes[np.isnan(codes)] = -1
+    return values, index, codes
+
+
+def _bounds(codes: np.ndarray, lod: float, loq: float):
+    """Sampling interval of each censored code."""
+    # <LOD -> [0, LOD], between LOD & LOQ -> [LOD, LOQ], <LOQ -> [0, LOQ], other codes -> [0, 0]
+    lower = np.where(codes == -2, lod, 0.0)
+    upper = np.select([codes == -1, codes == -2, codes == -3], [lod, loq, loq], 0.0)
+    return lower, upper
+
+
+def _impute_chunk(censoring, dist, lod: float, loq: float, seed: int, rows, streams=()) -> pa.Array:
+    """
+    Impute the censored rows of one chunk. `rows` is the row index of the chunk's first
+    row in the column, or the row index of every row; each draw only depends on the
+    seed, the streams and the row index, so any chunking gives the same result.
+    """
+    values, index, codes = censoring
+    # every null is censored and imputed, so the result needs no validity bitmap
+    result = values.copy()
+    # the censored rows are drawn in blocks that fit the memory budget, if any
+    block = budget_rows(_IMPUTE_ROW_BYTES) or max(len(index), 1)
+    for start in range(0, len(index), block):
+        block_index, block_codes = index[start : start + block], codes[start : start + block]
+        lower, upper = _bounds(block_codes, lod, loq)
+        cdf_lo, cdf_hi = dist.cdf(lower), dist.cdf(upper)
+
+        # U ~ Uniform(cdf_lo, cdf_hi) for the censored rows only
+        row_index = rows + block_index if np.isscalar(rows) else np.asarray(rows)[block_index]
+        result[block_index] = dist.ppf(cdf_lo + (cdf_hi - cdf_lo) * uniforms(seed, row_index, *streams))
+    return pa.array(result)
+
+
 @register(registry_name="default", name="random_single_imputation", version="0.0.1")
+@row_indexed
 def _random_single_imputation_arrow_v0_0_1(
-    biomarker_pa: pa.Array,
+    biomarker_pa: pa.Array | pa.ChunkedArray,
     lod: float,
     loq: float,
     seed: int | None = None,
-) -> pa.Array:
+    method: str = "mle",
+    lognormal: tuple[float, float] | None = None,
+    row_offset: int = 0,
+) -> pa.Array | pa.ChunkedArray:
     """
     Perform random single imputation for left-censored lognormal data
     using PyArrow arrays for maximum compatibility.
 
-    biomarker_pa : arrow array of floats or censored indicators (-1, -2, -3)
+    biomarker_pa : arrow array of floats or censored indicators (-1, -2, -3);
+                   null and NaN count as -1
     lod       : limit of detection
     loq       : limit of quantification
+    method    : lognormal fit, "mle" (maximum likelihood) or "ros" (regression on
+                order statistics: non-iterative, for very large columns)
+    lognormal : (mu, sigma) of the log values to draw from instead of fitting the
+                column, see `fit_lognormal`
+    row_offset: row index of the first row, when the column is part of a longer one
+
+    Only the censored rows are gathered, bounded and drawn for; the result is
+    one copy of the input data with the imputed values scattered in.
+
+    A ChunkedArray is imputed chunk by chunk and returned with the same chunk layout;
+    only the lognormal fit looks at the whole column. The random draw of a row is a
+    function of `seed` and its row index (see `compehndly.core.rng`), so the result
+    does not depend on the chunking. Imputing a column batch by batch with the
+    running `row_offset` and one `lognormal` fit gives the same result as imputing it whole.
     """
+    chunked = isinstance(biomarker_pa, pa.ChunkedArray)
+    chunks = biomarker_pa.chunks if chunked else [biomarker_pa]
 
-    # Convert Arrow → NumPy
-    # NOTE: suboptimal solution
-    biomarker = biomarker_pa.to_numpy(zero_copy_only=False)
+    censorings = [_censoring(chunk) for chunk in chunks]
+    if lognormal is None:
+        dist = _fit_censored(censorings, lod, method)
+    else:
+        # passed through the registry as a two-element Arrow array
+        mu, sigma = np.asarray(lognormal, dtype=np.float64)
+        dist = lognorm(s=sigma, scale=np.exp(mu))
+    seed = new_seed() if seed is None else seed
+
+    offsets = row_offset + np.cumsum([0] + [len(chunk) for chunk in chunks[:-1]])
+    imputed = [
+        _impute_chunk(censoring, dist, lod, loq, seed, int(offset)) for censoring, offset in zip(censorings, offsets)
+    ]
+    if chunked:
+        return pa.chunked_array(imputed, type=pa.float64())
+    return imputed[0]
 
-    # Fill NA as -1 (your original convention)
-    is_na = np.isnan(biomarker)
-    biomarker_filled = np.where(is_na, -1, biomarker)
 
-    # Censored if negative category code
-    censored = biomarker_filled < 0
-    values_np = np.where(censored, lod, biomarker_filled)
-    dist = fit_censored_lognorm(values_np, censored)
-    rng = np.random.default_rng(seed=seed)
+def fit_lognormal(biomarker_pa: pa.Array | pa.ChunkedArray, lod: float, method: str = "mle") -> tuple[float, float]:
+    """
+    (mu, sigma) of the censored lognormal fit random_single_imputation makes, to fit
+    a whole column once and pass as `lognormal` when it is imputed batch by batch.
+    """
+    chunks = biomarker_pa.chunks if isinstance(biomarker_pa, pa.ChunkedArray) else [biomarker_pa]
+    dist = _fit_censored([_censoring(chunk) for chunk in chunks], lod, method)
+    return float(np.log(dist.kwds["scale"])), float(dist.kwds["s"])
+
 
-    # Compute sampling bounds (vectorized)
-    lower = np.zeros_like(biomarker_filled, dtype=float)
-    upper = np.zeros_like(biomarker_filled, dtype=float)
+def _fit_censored(censorings, lod: float, method: str = "mle"):
+    """Censored lognormal fit over all chunks, censored values taken to lie below `lod`."""
+    uncensored = [np.delete(values, index) for values, index, _ in censorings]
+    n_censored = sum(index.size for _, index, _ in censorings)
+    n_uncensored = sum(u.size for u in uncensored)
 
-    cat_below_lod = biomarker_filled == -1
-    cat_between = biomarker_filled == -2
-    cat_below_loq = biomarker_filled == -3
+    values_np = np.concatenate(uncensored + [np.full(n_censored, lod)])
+    censored = np.zeros(values_np.size, dtype=bool)
+    censored[n_uncensored:] = True
+    return fit_censored(values_np, censored, method)
 
-    # <LOD -> [0, LOD]
-    lower[cat_below_lod] = 0
-    upper[cat_below_lod] = lod
-    # Between LOD & LOQ -> [LOD, LOQ]
-    lower[cat_between] = lod
-    upper[cat_between] = loq
 
-    # <LOQ -> [0, LOQ]
-    lower[cat_below_loq] = 0
-    upper[cat_below_loq] = loq
+def _prepare_multiple(biomarker_pa, lod: float, loq: float, method: str = "mle"):
+    """
+    Everything the imputations have in common: the fitted distribution, the censored
+    rows and their sampling bounds in CDF space. Only the uniform draws differ.
+    """
+    if isinstance(biomarker_pa, pa.ChunkedArray):
+        biomarker_pa = biomarker_pa.combine_chunks()
+    censoring = _censoring(biomarker_pa)
+    dist = _fit_censored([censoring], lod, method)
 
-    # Convert bounds to CDF space
-    cdf_lo = dist.cdf(lower)
-    cdf_hi = dist.cdf(upper)
+    values, index, codes = censoring
+    lower, upper = _bounds(codes, lod, loq)
+    return values, index, dist, dist.cdf(lower), dist.cdf(upper)
 
-    # generate U ~ Uniform(cdf_lo, cdf_hi)
-    u = rng.uniform(cdf_lo, cdf_hi)
-    imputed = dist.ppf(u)
-    # replace censored with imputed
-    result = biomarker.copy()
-    result[censored] = imputed[censored]
 
-    return pa.array(result)
+def _draw_imputations(prepared, seed: int, start: int, count: int, row_offset: int = 0) -> np.ndarray:
+    """(count, n_censored) values of imputations start .. start + count - 1 for the censored rows."""
+    _, index, dist, cdf_lo, cdf_hi = prepared
+    # imputation j draws from stream j, so any block of imputations can be drawn on its own
+    u = np.stack([uniforms(seed, row_offset + index, j) for j in range(start, start + count)])
+    return dist.ppf(cdf_lo + (cdf_hi - cdf_lo) * u)
+
+
+@register(registry_name="default", name="random_multiple_imputation", version="0.0.1")
+@row_indexed
+def _random_multiple_imputation_arrow_v0_0_1(
+    biomarker_pa: pa.Array | pa.ChunkedArray,
+    lod: float,
+    loq: float,
+    m: int,
+    seed: int | None = None,
+    output: str = "list",
+    method: str = "mle",
+    row_offset: int = 0,
+) -> pa.FixedSizeListArray | pa.Table:
+    """
+    Draw `m` random imputations of a left-censored lognormal biomarker column.
+
+    The lognormal is fitted and the sampling bounds are computed once; the m
+    imputations only differ in one (m x n_censored) block of uniform draws.
+
+    output : "list" for a FixedSizeList<double, m> column holding the m imputations
+             of each row, "table" for a table with columns imputation_1 .. imputation_m
+    method : lognormal fit, "mle" or "ros" (see random_single_imputation)
+    row_offset : row index of the first row, when the column is part of a longer one
+
+    Use `iter_multiple_imputations` when m x n values do not fit in memory.
+    """
+    if m < 1:
+        raise ValueError("m must be >= 1")
+    if output not in ("list", "table"):
+        raise ValueError(f"Unknown output '{output}', expected 'list' or 'table'")
+
+    prepared = _prepare_multiple(biomarker_pa, lod, loq, method)
+    biomarker, index = prepared[0], prepared[1]
+    imputed = _draw_imputations(prepared, new_seed() if seed is None else seed, 0, m, row_offset)
+
+    if output == "table":
+        columns = {}
+        for j in range(m):
+            column = biomarker.copy()
+            column[index] = imputed[j]
+            columns[f"imputation_{j + 1}"] = pa.array(column)
+        return pa.table(columns)
+
+    # row-major (n, m) block: the FixedSizeList values buffer
+    values = np.repeat(biomarker[:, None], m, axis=1)
+    values[index] = imputed.T
+    return pa.FixedSizeListArray.from_arrays(pa.array(values.ravel()), m)
+
+
+def iter_multiple_imputations(
+    biomarker_pa: pa.Array | pa.ChunkedArray,
+    lod: float,
+    loq: float,
+    m: int,
+    seed: int | None = None,
+    block_size: int = 8,
+    method: str = "mle",
+    row_offset: int = 0,
+):
+    """
+    Lazily yield the `m` imputations of `random_multiple_imputation` one column at
+    a time, drawing `block_size` imputations at once. The draws are identical to
+    the eager function for the same seed, so only one block has to be in memory.
+    """
+    prepared = _prepare_multiple(biomarker_pa, lod, loq, method)
+    biomarker, index = prepared[0], prepared[1]
+    seed = new_seed() if seed is None else seed
+    for start in range(0, m, block_size):
+        for draws in _draw_imputations(prepared, seed, start, min(block_size, m - start), row_offset):
+            column = biomarker.copy()
+            column[index] = draws
+            yield pa.array(column)
+
+
+def _fit_groups(parts, censoring, lods: list, method: str = "mle") -> list[tuple[float, float]]:
+    """
+    (mu, sigma) of the censored lognormal fit of every group, the censored values taken
+    to lie below their group's LOD. Maximum likelihood fits all groups at once.
+    """
+    values, index, _ = censoring
+    group = np.empty(len(values), dtype=np.int64)
+    group[parts.order] = np.repeat(np.arange(len(parts)), np.diff(parts.offsets))
+    fit_values = values.copy()
+    fit_values[index] = np.asarray(lods, dtype=np.float64)[group[index]]
+    censored = np.zeros(len(values), dtype=bool)
+    censored[index] = True
+
+    if method == "mle":
+        # every group has rows, so the fitted groups are 0 .. len(parts) - 1 in order
+        fit = fit_censored_lognorm_grouped(fit_values, censored, group)
+        if not fit.converged.all():
+            failed = parts.keys.filter(pa.array(~fit.converged)).to_pylist()
+            raise RuntimeError(f"Cannot fit lognormal for group(s): {', '.join(map(str, failed[:10]))}")
+        return list(zip(fit.mu.tolist(), fit.sigma.tolist()))
+
+    # no batched form: one fit per group
+    fits = []
+    for i in range(len(parts)):
+        rows = parts.indices(i)
+        dist = fit_censored(fit_values[rows], censored[rows], method)
+        fits.append((float(np.log(dist.kwds["scale"])), float(dist.kwds["s"])))
+    return fits
+
+
+def _impute_group(
+    values: np.ndarray, rows: np.ndarray, lod: float, loq: float, seed: int, stream: int, lognormal: tuple
+) -> np.ndarray:
+    mu, sigma = lognormal
+    dist = lognorm(s=sigma, scale=np.exp(mu))
+    return _impute_chunk(_censoring(pa.array(values)), dist, lod, loq, seed, rows, (stream,)).to_numpy()
+
+
+@register(registry_name="default", name="random_single_imputation_grouped", version="0.0.1")
+@row_indexed
+def _random_single_imputation_grouped_arrow_v0_0_1(
+    biomarker_pa: pa.Array | pa.ChunkedArray,
+    groups: pa.Array | pa.ChunkedArray,
+    lod: float | dict,
+    loq: float | dict,
+    seed: int | None = None,
+    max_workers: int | None = None,
+    method: str = "mle",
+    row_offset: int = 0,
+) -> pa.Array:
+    """
+    Random single imputation with a separate lognormal fit per group (e.g. laboratory
+    or study). `lod` / `loq` are one value for all groups or a mapping from group key
+    to value; `method` selects the fit and `row_offset` the index of the first row
+    as in random_single_imputation.
+
+    The rows are partitioned by group once and all groups are fitted together (one
+    vectorised maximum likelihood fit, see `fit_censored_lognorm_grouped`). The groups
+    are then imputed (on a process pool when `max_workers` > 1 or parallel execution is
+    switched on through `compehndly.config`) and the results are put back in the original
+    row order. A row's random draw depends only on `seed`, its row index and its group
+    key, so the result does not depend on the number of workers.
+    """
+    if len(groups) != len(biomarker_pa):
+        raise ValueError("biomarker and groups must have the same length")
+    parts = partition(groups)
+    lods = group_parameter(parts, lod, "lod")
+    loqs = group_parameter(parts, loq, "loq")
+    seed = new_seed() if seed is None else seed
+
+    if isinstance(biomarker_pa, pa.ChunkedArray):
+        biomarker_pa = biomarker_pa.combine_chunks()
+    if biomarker_pa.type != pa.float64():
+        biomarker_pa = pc.cast(biomarker_pa, pa.float64())
+    fits = _fit_groups(parts, _censoring(biomarker_pa), lods, method)
+    # NumPy, not Arrow slices, go to the workers: a pickled slice carries its whole parent buffer
+    tasks = [
+        (
+            (
+                values.to_numpy(zero_copy_only=False),
+                row_offset + parts.indices(i),
+                lods[i],
+                loqs[i],
+                seed,
+                stream_id(key),
+                fits[i],
+            ),
+            {},
+        )
+        for i, (key, values) in enumerate(zip(parts.keys.to_pylist(), group_arrays(parts, biomarker_pa)))
+    ]
+    return pa.array(scatter(parts, map_groups(_impute_group, tasks, max_workers, rows=len(biomarker_pa))))
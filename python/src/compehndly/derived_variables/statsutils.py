@@ -1,10 +1,17 @@
+from dataclasses import dataclass
+
 import numpy as np
 
-from scipy.stats import lognorm
 from scipy.optimize import minimize
+from scipy.special import log_ndtr, ndtri
+from scipy.stats import lognorm
 
+_LOG_SQRT_2PI = 0.5 * np.log(2 * np.pi)
+# sigma outside [_SIGMA_LOW, _SIGMA_HIGH] is penalised to avoid pathological fits
+_SIGMA_LOW, _SIGMA_HIGH, _PENALTY = 0.05, 5.0, 1e3
 
-def fit_censored_lognorm(values_np, censored_np):
+
+def _fit_censored_lognorm_reference(values_np, censored_np):
     vals = values_np
     cens = censored_np
 
@@ -48,3 +55,343 @@ def fit_censored_lognorm(values_np, censored_np):
 
     sigma_hat, mu_hat = res.x
     return lognorm(s=sigma_hat, scale=np.exp(mu_hat))
+
+
+def censored_lognorm_statistics(values_np, censored_np):
+    """
+    Sufficient statistics of the censored lognormal likelihood: count, sum of logs,
+    mean and centred sum of squares of the log uncensored values, and the distinct
+    log censoring limits with their counts. Computed once, they make every
+    likelihood evaluation independent of the number of observations.
+    """
+    log_unc = np.log(values_np[~censored_np])
+    n = log_unc.size
+    mean = log_unc.mean() if n else 0.0
+    ss = np.square(log_unc - mean).sum()
+    with np.errstate(divide="ignore"):
+        log_limits, counts = np.unique(np.log(values_np[censored_np]), return_counts=True)
+    return n, log_unc.sum(), mean, ss, log_limits, counts
+
+
+def censored_lognorm_nll(params, stats):
+    """
+    Penalised negative log-likelihood of (sigma, mu) and its gradient, in log space:
+    normal logpdf terms for the uncensored values and log Phi((log limit - mu) / sigma)
+    for the censored ones.
+    """
+    sigma, mu = params
+    n, log_sum, mean, ss, log_limits, counts = stats
+
+    # uncensored: sum of lognormal logpdf, with sum((x - mu)^2) = ss + n (mean - mu)^2
+    q = ss + n * (mean - mu) ** 2
+    ll = -log_sum - n * (np.log(sigma) + _LOG_SQRT_2PI) - q / (2 * sigma**2)
+    d_mu = n * (mean - mu) / sigma**2
+    d_sigma = -n / sigma + q / sigma**3
+
+    # censored: log Phi(z) with d/dz log Phi(z) = phi(z) / Phi(z)
+    if counts.size:
+        z = (log_limits - mu) / sigma
+        log_cdf = log_ndtr(z)
+        ll += np.dot(counts, log_cdf)
+        with np.errstate(invalid="ignore", over="ignore"):
+            ratio = np.exp(-0.5 * z**2 - _LOG_SQRT_2PI - log_cdf)
+        ratio = np.where(np.isfinite(z), ratio, 0.0)
+        d_mu -= np.dot(counts, ratio) / sigma
+        d_sigma -= np.dot(counts, np.where(np.isfinite(z), ratio * z, 0.0)) / sigma
+
+    penalty, d_penalty = 0.0, 0.0
+    if sigma < _SIGMA_LOW:
+        penalty += _PENALTY * (_SIGMA_LOW - sigma) ** 2
+        d_penalty -= 2 * _PENALTY * (_SIGMA_LOW - sigma)
+    if sigma > _SIGMA_HIGH:
+        penalty += _PENALTY * (sigma - _SIGMA_HIGH) ** 2
+        d_penalty += 2 * _PENALTY * (sigma - _SIGMA_HIGH)
+
+    return -(ll - penalty), np.array([-d_sigma + d_penalty, -d_mu])
+
+
+def fit_censored_lognorm(values_np, censored_np):
+    """
+    Maximum likelihood lognormal fit of left-censored data: `censored_np` marks the
+    values that are only known to lie below `values_np`. Same estimator as
+    `_fit_censored_lognorm_reference`, but evaluated on sufficient statistics with an
+    analytic gradient.
+    """
+    cens = np.asarray(censored_np, dtype=bool)
+    vals = np.asarray(values_np)
+
+    # Require at least some uncensored observations
+    if cens.all():
+        raise RuntimeError("Cannot fit lognormal: all observations are censored.")
+
+    stats = censored_lognorm_statistics(vals, cens)
+    n, _, mean, ss, _, _ = stats
+    mu0 = np.log(np.median(vals[~cens]))
+    sigma0 = np.sqrt(ss / n)
+    sigma0 = sigma0 if sigma0 > 0.1 else 0.5  # stability
+
+    res = minimize(
+        censored_lognorm_nll,
+        x0=[sigma0, mu0],
+        args=(stats,),
+        jac=True,
+        method="L-BFGS-B",
+        bounds=[(1e-6, None), (None, None)],
+    )
+
+    if not res.success:
+        raise RuntimeError(f"Censored MLE did not converge: {res.message}")
+
+    sigma_hat, mu_hat = res.x
+    return lognorm(s=sigma_hat, scale=np.exp(mu_hat))
+
+
+@dataclass
+class GroupedLognormFit:
+    """Per-group lognormal parameters; `mu` and `sigma` are NaN where `converged` is False."""
+
+    groups: np.ndarray
+    mu: np.ndarray
+    sigma: np.ndarray
+    converged: np.ndarray
+
+    def dist(self, i: int):
+        return lognorm(s=self.sigma[i], scale=np.exp(self.mu[i]))
+
+
+def _grouped_statistics(values, censored, inverse, n_groups):
+    """Per-group sufficient statistics plus the distinct (group, log limit) pairs of the censored values."""
+    log_unc = np.log(values[~censored])
+    group_unc = inverse[~censored]
+    n = np.bincount(group_unc, minlength=n_groups).astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(group_unc, weights=log_unc, minlength=n_groups) / n
+    mean = np.where(n > 0, mean, 0.0)
+    ss = np.bincount(group_unc, weights=np.square(log_unc - mean[group_unc]), minlength=n_groups)
+
+    group_cens = inverse[censored]
+    with np.errstate(divide="ignore"):
+        log_limits = np.log(values[censored])
+    order = np.lexsort((log_limits, group_cens))
+    group_cens, log_limits = group_cens[order], log_limits[order]
+    starts = np.flatnonzero(
+        np.concatenate([[True], (group_cens[1:] != group_cens[:-1]) | (log_limits[1:] != log_limits[:-1])])
+    )
+    counts = np.diff(np.append(starts, group_cens.size)).astype(float)
+    return n, mean, ss, group_cens[starts], log_limits[starts], counts
+
+
+def _grouped_nll(sigma, mu, stats, hessian=False):
+    """
+    Penalised negative log-likelihood per group, with the gradient with respect to
+    (sigma, mu) and optionally the Hessian entries (sigma-sigma, sigma-mu, mu-mu);
+    the vectorised counterpart of `censored_lognorm_nll`. The constant sum of log
+    values is left out, it does not move the optimum.
+    """
+    n, mean, ss, pair_group, log_limits, counts = stats
+    n_groups = sigma.size
+
+    q = ss + n * (mean - mu) ** 2
+    ll = -n * (np.log(sigma) + _LOG_SQRT_2PI) - q / (2 * sigma**2)
+    d_mu = n * (mean - mu) / sigma**2
+    d_sigma = -n / sigma + q / sigma**3
+    if hessian:
+        h_mm = -n / sigma**2
+        h_sm = -2 * n * (mean - mu) / sigma**3
+        h_ss = n / sigma**2 - 3 * q / sigma**4
+
+    if counts.size:
+        s = sigma[pair_group]
+        z = (log_limits - mu[pair_group]) / s
+        log_cdf = log_ndtr(z)
+        finite = np.isfinite(z)
+        with np.errstate(invalid="ignore", over="ignore"):
+            ratio = np.where(finite, np.exp(-0.5 * z**2 - _LOG_SQRT_2PI - log_cdf), 0.0)
+        z = np.where(finite, z, 0.0)
+
+        def segment_sum(x):
+            return np.bincount(pair_group, weights=counts * x, minlength=n_groups)
+
+        ll = ll + segment_sum(log_cdf)
+        d_mu = d_mu - segment_sum(ratio / s)
+        d_sigma = d_sigma - segment_sum(ratio * z / s)
+        if hessian:
+            # d2/dz2 log Phi(z) = -ratio * (z + ratio)
+            second = -ratio * (z + ratio)
+            h_mm = h_mm + segment_sum(second / s**2)
+            h_sm = h_sm + segment_sum((second * z + ratio) / s**2)
+            h_ss = h_ss + segment_sum((second * z**2 + 2 * ratio * z) / s**2)
+
+    low, high = np.maximum(_SIGMA_LOW - sigma, 0.0), np.maximum(sigma - _SIGMA_HIGH, 0.0)
+    nll = -ll + _PENALTY * (low**2 + high**2)
+    grad = (-d_sigma + 2 * _PENALTY * (high - low), -d_mu)
+    if not hessian:
+        return nll, grad
+    penalised = ((low > 0) | (high > 0)) * 2 * _PENALTY
+    return nll, grad, (-h_ss + penalised, -h_sm, -h_mm)
+
+
+def fit_censored_lognorm_grouped(values_np, censored_np, groups_np, max_iter: int = 100, tol: float = 1e-10):
+    """
+    Fit a censored lognormal per group in one vectorised Newton iteration over
+    segment sums, instead of one `fit_censored_lognorm` call per group. Each
+    Newton step is made positive definite where needed and backtracked until
+    the likelihood of its group improves. Groups without uncensored values,
+    or that do not converge within `max_iter` steps, are reported with
+    `converged` False.
+    """
+    values = np.asarray(values_np, dtype=float)
+    censored = np.asarray(censored_np, dtype=bool)
+    groups, inverse = np.unique(np.asarray(groups_np), return_inverse=True)
+    inverse = inverse.reshape(-1)
+    stats = _grouped_statistics(values, censored, inverse, groups.size)
+    n, mean, ss = stats[:3]
+
+    fittable = n > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sigma = np.sqrt(ss / n)
+    sigma = np.where(fittable & (sigma > 0.1), sigma, 0.5)  # stability
+    mu = mean.copy()
+    converged = np.zeros(groups.size, dtype=bool)
+    active = fittable.copy()
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        nll, (g_s, g_m), (h_ss, h_sm, h_mm) = _grouped_nll(sigma, mu, stats, hessian=True)
+
+        # shift the Hessian by its smallest eigenvalue where it is not positive definite
+        half_trace, half_diff = (h_ss + h_mm) / 2, (h_ss - h_mm) / 2
+        min_eig = half_trace - np.sqrt(half_diff**2 + h_sm**2)
+        floor = 1e-8 * np.maximum(np.abs(half_trace), 1.0)
+        shift = np.where(min_eig < floor, floor - min_eig, 0.0)
+        a, c = h_ss + shift, h_mm + shift
+        det = a * c - h_sm**2
+        step_s = -(c * g_s - h_sm * g_m) / det
+        step_m = -(a * g_m - h_sm * g_s) / det
+
+        size = (np.abs(step_s) + np.abs(step_m)) / (1 + sigma + np.abs(mu))
+        done = active & (size <= tol)
+        converged |= done
+        active &= ~done
+
+        # close to the optimum the full Newton step is taken: the likelihood change is
+        # then at rounding level and a line search would only stall
+        local = active & (size <= 1e-4) & (sigma + step_s > 0)
+        sigma = np.where(local, sigma + step_s, sigma)
+        mu = np.where(local, mu + step_m, mu)
+
+        # otherwise backtrack, never more than halving sigma in one step
+        t = np.where(step_s < 0, np.minimum(1.0, 0.5 * sigma / np.maximum(-step_s, 1e-300)), 1.0)
+        slope = g_s * step_s + g_m * step_m
+        pending = active & ~local
+        for _ in range(60):
+            if not pending.any():
+                break
+            new_sigma = np.where(pending, sigma + t * step_s, sigma)
+            new_mu = np.where(pending, mu + t * step_m, mu)
+            new_nll, _ = _grouped_nll(new_sigma, new_mu, stats)
+            accepted = pending & (new_nll <= nll + 1e-4 * t * slope)
+            sigma = np.where(accepted, new_sigma, sigma)
+            mu = np.where(accepted, new_mu, mu)
+            pending &= ~accepted
+            t = np.where(pending, t / 2, t)
+        # no decrease along a descent direction: give up on these groups
+        active &= ~pending
+
+    return GroupedLognormFit(
+        groups=groups,
+        mu=np.where(converged, mu, np.nan),
+        sigma=np.where(converged, sigma, np.nan),
+        converged=converged,
+    )
+
+
+def _ros_positions_sorted(sorted_detects, sorted_limits):
+    """Helsel plotting positions of sorted uncensored values and sorted detection limits."""
+    dls, n_at_dl = np.unique(sorted_limits, return_counts=True)
+
+    # intervals [0, DL_1), [DL_1, DL_2), ..., [DL_m, inf)
+    edges = np.concatenate([[-np.inf], dls])
+    detect_start = np.searchsorted(sorted_detects, edges, side="left")
+    a = np.diff(np.append(detect_start, sorted_detects.size))
+    # observations below each edge: detects < DL_j plus non-detects with limit <= DL_j
+    b = detect_start + np.searchsorted(sorted_limits, edges, side="right")
+
+    # probability of exceeding each edge, from the top interval down
+    pe = np.zeros(edges.size + 1)
+    for j in range(edges.size - 1, -1, -1):
+        total = a[j] + b[j]
+        pe[j] = pe[j + 1] + (a[j] / total if total else 0.0) * (1 - pe[j + 1])
+
+    # detects: evenly spaced within the exceedance band of their interval
+    interval = np.searchsorted(edges, sorted_detects, side="right") - 1
+    rank = np.arange(sorted_detects.size) - detect_start[interval] + 1
+    pp_detects = (1 - pe[interval]) + (pe[interval] - pe[interval + 1]) * rank / (a[interval] + 1)
+
+    # non-detects: evenly spaced below the exceedance of their limit
+    limit_index = np.searchsorted(dls, sorted_limits)
+    limit_start = np.concatenate([[0], np.cumsum(n_at_dl)[:-1]])
+    rank = np.arange(sorted_limits.size) - limit_start[limit_index] + 1
+    pp_limits = (1 - pe[limit_index + 1]) * rank / (n_at_dl[limit_index] + 1)
+    return pp_detects, pp_limits
+
+
+def ros_plotting_positions(values_np, censored_np):
+    """
+    Helsel's plotting positions for data censored at one or more detection limits
+    (`censored_np` marks values that are only known to lie below `values_np`).
+    Returns the plotting positions of the uncensored values and of the censored
+    ones, each in the order of `values_np`.
+    """
+    vals = np.asarray(values_np, dtype=float)
+    cens = np.asarray(censored_np, dtype=bool)
+    detect_order = np.argsort(vals[~cens], kind="stable")
+    limit_order = np.argsort(vals[cens], kind="stable")
+    sorted_pp = _ros_positions_sorted(vals[~cens][detect_order], vals[cens][limit_order])
+
+    positions = []
+    for order, pp in zip((detect_order, limit_order), sorted_pp):
+        unsorted = np.empty_like(pp)
+        unsorted[order] = pp
+        positions.append(unsorted)
+    return tuple(positions)
+
+
+def fit_censored_lognorm_ros(values_np, censored_np):
+    """
+    Lognormal fit of left-censored data by regression on order statistics: the log
+    uncensored values are regressed on the normal quantiles of their Helsel plotting
+    positions, which account for any number of detection limits. The slope is
+    sigma and the intercept mu. Non-iterative, O(n log n), and never fails to converge.
+    """
+    cens = np.asarray(censored_np, dtype=bool)
+    vals = np.asarray(values_np, dtype=float)
+
+    if (~cens).sum() < 2:
+        raise RuntimeError("Cannot fit lognormal by ROS: fewer than two uncensored observations.")
+
+    # the regression pairs values with positions, so both can stay in sorted order
+    sorted_detects = np.sort(vals[~cens])
+    pp_detects, _ = _ros_positions_sorted(sorted_detects, np.sort(vals[cens]))
+    q = ndtri(pp_detects)
+    y = np.log(sorted_detects)
+    q_mean, y_mean = q.mean(), y.mean()
+    dq = q - q_mean
+    sigma_hat = np.dot(dq, y - y_mean) / np.dot(dq, dq)
+    mu_hat = y_mean - sigma_hat * q_mean
+    if not sigma_hat > 0:
+        raise RuntimeError("Cannot fit lognormal by ROS: non-positive slope.")
+    return lognorm(s=sigma_hat, scale=np.exp(mu_hat))
+
+
+FIT_METHODS = {"mle": fit_censored_lognorm, "ros": fit_censored_lognorm_ros}
+
+
+def fit_censored(values_np, censored_np, method: str = "mle"):
+    """Censored lognormal fit by maximum likelihood (`"mle"`) or regression on order statistics (`"ros"`)."""
+    try:
+        fit = FIT_METHODS[method]
+    except KeyError:
+        raise ValueError(f"Unknown fit method '{method}'. Available: {', '.join(FIT_METHODS)}") from None
+    return fit(values_np, censored_np)
@@ -1,5 +1,7 @@
 import pyarrow as pa
-import pyarrow.compute as pc
+
+from compehndly.core.traits import elementwise
+from compehndly.utils.reductions import reduce_rows
 
 
 __registrations__ = []
@@ -36,10 +38,10 @@ def _summation_v0_0_1_reference(
 @register(registry_name="default", name="summation", version="0.0.1")
 def _summation_v0_0_1_arrow(*arrays: pa.Array, all_required=True) -> pa.Array:
     """
-    Vectorized summation over multiple Arrow arrays.
+    Vectorized summation over multiple Arrow arrays, in one pass into a preallocated output.
 
     Semantics:
-    - If ANY input array is entirely null, return an all-null array.
+    - If ANY input array is entirely null, return an all-null float64 array.
     - Otherwise, nulls are treated as zero during summation.
     """
 
@@ -55,9 +57,57 @@ def _summation_v0_0_1_arrow(*arrays: pa.Array, all_required=True) -> pa.Array:
         if arr.null_count == length and all_required:
             return pa.nulls(length, type=pa.float64())
 
-    result = pc.fill_null(arrays[0], 0)
+    return reduce_rows(arrays, "sum")
+
+
+def _row_values(arrays) -> list:
+    if not arrays:
+        raise ValueError("At least one input array is required")
+    return [val for val in arrays if val is not None]
+
+
+def _row_mean_v0_0_1_reference(*arrays: float) -> float | None:
+    values = _row_values(arrays)
+    return sum(values) / len(values) if values else None
+
+
+@register(registry_name="default", name="row_mean", version="0.0.1")
+@elementwise
+def _row_mean_v0_0_1_arrow(*arrays: pa.Array) -> pa.Array:
+    """Row-wise mean over multiple Arrow arrays, skipping nulls; a row without any value is null."""
+    return reduce_rows(arrays, "mean")
+
+
+def _row_min_v0_0_1_reference(*arrays: float) -> float | None:
+    values = _row_values(arrays)
+    return min(values) if values else None
+
+
+@register(registry_name="default", name="row_min", version="0.0.1")
+@elementwise
+def _row_min_v0_0_1_arrow(*arrays: pa.Array) -> pa.Array:
+    """Row-wise minimum over multiple Arrow arrays, skipping nulls; a row without any value is null."""
+    return reduce_rows(arrays, "min")
+
+
+def _row_max_v0_0_1_reference(*arrays: float) -> float | None:
+    values = _row_values(arrays)
+    return max(values) if values else None
+
+
+@register(registry_name="default", name="row_max", version="0.0.1")
+@elementwise
+def _row_max_v0_0_1_arrow(*arrays: pa.Array) -> pa.Array:
+    """Row-wise maximum over multiple Arrow arrays, skipping nulls; a row without any value is null."""
+    return reduce_rows(arrays, "max")
+
+
+def _row_count_v0_0_1_reference(*arrays: float) -> int:
+    return len(_row_values(arrays))
 
-    for arr in arrays[1:]:
-        result = pc.add(result, pc.fill_null(arr, 0))
 
-    return result
+@register(registry_name="default", name="row_count", version="0.0.1")
+@elementwise
+def _row_count_v0_0_1_arrow(*arrays: pa.Array) -> pa.Array:
+    """Number of non-null values in every row of multiple Arrow arrays."""
+    return reduce_rows(arrays, "count")
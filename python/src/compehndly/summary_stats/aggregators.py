@@ -0,0 +1,239 @@
+"""
+Incremental, mergeable summary-statistics states.
+
+Every aggregator is updated batch by batch and never keeps the data itself, so
+statistics of datasets larger than memory take one pass. Two states built on
+different batches, partitions or worker processes combine with `merge` into the
+state of the whole data, whatever the split; all states are picklable.
+
+Values follow the censoring convention of the imputation functions: negative
+values are category codes (-1 <LOD, -2 between LOD and LOQ, -3 <LOQ), null and
+NaN are missing, and values >= 0 are detected.
+"""
+
+import math
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.95)
+# type of every statistic of `Summary.result()` before the percentiles, which are float64
+RESULT_TYPES = {
+    "n": pa.int64(),
+    "n_missing": pa.int64(),
+    "n_censored": pa.int64(),
+    "n_detected": pa.int64(),
+    "detection_frequency": pa.float64(),
+    "geometric_mean": pa.float64(),
+    "geometric_sd": pa.float64(),
+}
+
+
+def percentile_name(q: float) -> str:
+    """Name of the `q` quantile in results, e.g. p50 or p97.5."""
+    return f"p{q * 100:g}"
+
+
+def _float_chunks(values):
+    """float64 NumPy chunks of an Array or ChunkedArray, nulls as NaN."""
+    chunks = values.chunks if isinstance(values, pa.ChunkedArray) else [values]
+    for chunk in chunks:
+        if chunk.type != pa.float64():
+            chunk = pc.cast(chunk, pa.float64())
+        yield chunk.to_numpy(zero_copy_only=False)
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning & Ertl) with the k1 scale function: a few hundred
+    weighted centroids, small near the tails, from which any quantile is
+    interpolated with a rank error well below 1 / compression.
+    """
+
+    def __init__(self, compression: float = 200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        # k1(q) = compression / (2 pi) * asin(2q - 1); a centroid spans at most one unit of k
+        q = (np.cumsum(weights) - weights) / total
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * q - 1)
+        cluster = np.floor(k + self.compression / 4).astype(np.int64)
+        starts = np.flatnonzero(np.diff(cluster, prepend=-1))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def update(self, values: np.ndarray) -> "TDigest":
+        """Add values; NaN must be removed beforehand."""
+        if len(values):
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+            self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(len(values))]))
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        if len(other.means):
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        return self
+
+    def quantile(self, q) -> np.ndarray:
+        """Quantiles at probabilities `q`; NaN for an empty digest."""
+        q = np.asarray(q, dtype=np.float64)
+        if not len(self.means):
+            return np.full(q.shape, np.nan)
+        total = self.weights.sum()
+        # each centroid sits at the middle of its weight; the extremes at ranks 0 and total
+        centers = np.cumsum(self.weights) - self.weights / 2
+        ranks = np.concatenate([[0.0], centers, [total]])
+        means = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(q * total, ranks, means)
+
+
+class LogMoments:
+    """Count, mean and sum of squared deviations of log(x), merged with Chan's parallel update."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        if count == 0:
+            return self
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+        return self
+
+    def update(self, values: np.ndarray) -> "LogMoments":
+        """Add positive values."""
+        if not len(values):
+            return self
+        logs = np.log(values)
+        mean = logs.mean()
+        return self._combine(len(logs), mean, float(np.square(logs - mean).sum()))
+
+    def merge(self, other: "LogMoments") -> "LogMoments":
+        return self._combine(other.count, other.mean, other.m2)
+
+    @property
+    def geometric_mean(self) -> float:
+        return math.exp(self.mean) if self.count else math.nan
+
+    @property
+    def geometric_sd(self) -> float:
+        return math.exp(math.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else math.nan
+
+
+class CensoredCounts:
+    """Number of missing, censored (per code) and detected values."""
+
+    CODES = (-1, -2, -3)
+
+    def __init__(self):
+        self.n = 0
+        self.missing = 0
+        self.detected = 0
+        # code -> count; other negative codes are only counted in `censored`
+        self.codes = dict.fromkeys(self.CODES, 0)
+        self.censored = 0
+
+    def update(self, values: np.ndarray) -> "CensoredCounts":
+        """Add values, with nulls as NaN."""
+        self.n += len(values)
+        self.missing += int(np.isnan(values).sum())
+        censored = values[values < 0]
+        self.censored += len(censored)
+        self.detected += int((values >= 0).sum())
+        for code in self.CODES:
+            self.codes[code] += int((censored == code).sum())
+        return self
+
+    def merge(self, other: "CensoredCounts") -> "CensoredCounts":
+        self.n += other.n
+        self.missing += other.missing
+        self.detected += other.detected
+        self.censored += other.censored
+        for code in self.CODES:
+            self.codes[code] += other.codes[code]
+        return self
+
+    @property
+    def detection_frequency(self) -> float:
+        """Share of the non-missing values that were detected."""
+        observed = self.detected + self.censored
+        return self.detected / observed if observed else math.nan
+
+
+class Summary:
+    """
+    Counts, geometric mean and SD, and percentiles of one biomarker column, updated
+    batch by batch with one conversion per batch.
+
+    Percentiles are taken over all non-missing values, with the censored ones ranked
+    below every detected value; a percentile that falls among the censored values is
+    reported as None ("<LOD"). The geometric moments use the positive detected values.
+    """
+
+    def __init__(self, quantiles=DEFAULT_QUANTILES, compression: float = 200):
+        self.quantiles = tuple(float(q) for q in quantiles)
+        self.counts = CensoredCounts()
+        self.log_moments = LogMoments()
+        self.digest = TDigest(compression)
+
+    def update(self, values: pa.Array | pa.ChunkedArray) -> "Summary":
+        for x in _float_chunks(values):
+            self.counts.update(x)
+            detected = x[x >= 0]
+            self.log_moments.update(detected[detected > 0])
+            self.digest.update(detected)
+        return self
+
+    def merge(self, other: "Summary") -> "Summary":
+        self.counts.merge(other.counts)
+        self.log_moments.merge(other.log_moments)
+        self.digest.merge(other.digest)
+        return self
+
+    def percentiles(self, quantiles=None) -> list[float | None]:
+        quantiles = np.asarray(self.quantiles if quantiles is None else quantiles, dtype=np.float64)
+        censored, detected = self.counts.censored, self.counts.detected
+        if not censored + detected:
+            return [None] * len(quantiles)
+        ranks = quantiles * (censored + detected)
+        within = np.clip((ranks - censored) / max(detected, 1), 0.0, 1.0)
+        values = self.digest.quantile(within)
+        return [None if rank <= censored else float(v) for rank, v in zip(ranks, values)]
+
+    def result(self) -> dict:
+        result = {
+            "n": self.counts.n,
+            "n_missing": self.counts.missing,
+            "n_censored": self.counts.censored,
+            "n_detected": self.counts.detected,
+            "detection_frequency": self.counts.detection_frequency,
+            "geometric_mean": self.log_moments.geometric_mean,
+            "geometric_sd": self.log_moments.geometric_sd,
+        }
+        for q, value in zip(self.quantiles, self.percentiles()):
+            result[percentile_name(q)] = value
+        return result
+
+    def result_type(self) -> pa.StructType:
+        """Struct type of `result()`, fields in the same order."""
+        return pa.struct([*RESULT_TYPES.items(), *((percentile_name(q), pa.float64()) for q in self.quantiles)])
@@ -0,0 +1,323 @@
+"""
+Bootstrap confidence intervals for the geometric mean and percentiles.
+
+Resamples are never materialised: a replicate is a vector of resampling weights
+over the observed values, either Poisson(1) counts or the multinomial counts of a
+classic n-out-of-n resample. The values are sorted once; a block of replicates is
+then a (replicates x rows) weight matrix: per-chunk weight totals of the whole
+block come from one matrix product, the weighted log-means from one float32 dot
+product per replicate, and the weighted percentiles from the chunk totals plus a
+cumulative sum over the single chunk holding each percentile. Blocks are sized to a memory budget and may run on the thread pool.
+
+The weights of replicate `j` are drawn from a generator keyed by (seed, j), so the
+intervals do not depend on the block size or the number of workers.
+"""
+
+import math
+
+from dataclasses import dataclass
+
+import numpy as np
+import pyarrow as pa
+
+from compehndly.core.config import get_config
+from compehndly.core.parallel import get_executor, worker_count
+from compehndly.core.rng import new_seed, stream_key
+from compehndly.summary_stats.aggregators import _float_chunks
+
+__registrations__ = []
+
+METHODS = ("poisson", "multinomial")
+
+# rows per chunk of the weighted percentile search
+CHUNK_ROWS = 1024
+
+
+# TODO: move decorator for joint use
+def register(registry_name, name, version):
+    def decorator(func):
+        __registrations__.append((registry_name, name, version, func))
+        return func
+
+    return decorator
+
+
+# Poisson(1) CDF; it rounds to 1.0 from k = 18 on, so inverting a float64 uniform never runs past its end
+_POISSON_CDF = np.cumsum(np.exp(-1.0 - np.cumsum(np.log(np.maximum(np.arange(24), 1)))))
+
+
+def _poisson_table(bits: int = 16) -> np.ndarray:
+    """
+    Poisson(1) variate for every `bits`-bit uniform, by inversion of the CDF; -1 for
+    the few cells of [0, 1) that span more than one variate, the upper tail included.
+    """
+    edges = np.arange((1 << bits) + 1) / (1 << bits)
+    variates = np.searchsorted(_POISSON_CDF, edges, side="left")
+    return np.where(variates[:-1] == variates[1:], variates[:-1], -1).astype(np.float32)
+
+
+_POISSON = _poisson_table()
+
+
+def replicate_weights(seed: int, replicate: int, n: int, method: str = "poisson", out=None) -> np.ndarray:
+    """Resampling weights of `n` values in bootstrap replicate `replicate`, as float32."""
+    rng = np.random.Generator(np.random.PCG64(int(stream_key(seed, replicate))))
+    out = np.empty(n, dtype=np.float32) if out is None else out
+    if method == "poisson":
+        cells = rng.integers(0, 1 << 16, size=n, dtype=np.uint16)
+        # every uint16 is a valid index; "clip" skips the bounds check
+        np.take(_POISSON, cells, out=out, mode="clip")
+        # about one draw in 8000 falls in a cell that spans several variates: invert a
+        # full-precision uniform within the cell, so the weights are exactly Poisson(1)
+        spanning = np.flatnonzero(out < 0)
+        if len(spanning):
+            u = (cells[spanning] + rng.random(len(spanning))) / (1 << 16)
+            out[spanning] = np.searchsorted(_POISSON_CDF, u, side="left")
+    elif method == "multinomial":
+        out[:] = np.bincount(rng.integers(0, n, size=n), minlength=n)
+    else:
+        raise ValueError(f"Unknown bootstrap method '{method}'. Available: {', '.join(METHODS)}")
+    return out
+
+
+@dataclass
+class BootstrapInterval:
+    """Point estimate, percentile-bootstrap interval and replicate values of one statistic."""
+
+    estimate: float
+    lower: float
+    upper: float
+    replicates: np.ndarray
+
+
+def _observed(values) -> np.ndarray:
+    """Sorted non-missing values; censored codes are negative, so they come first."""
+    chunks = [x[~np.isnan(x)] for x in _float_chunks(values)]
+    return np.sort(np.concatenate(chunks) if chunks else np.empty(0))
+
+
+def _target(q: float, total: float) -> float:
+    # inverted CDF: the first value whose cumulative weight reaches q * total, at least one
+    return max(q * total, 1.0)
+
+
+def _quantile_index(cumulative: np.ndarray, target: float) -> int:
+    return int(np.searchsorted(cumulative, target, side="left"))
+
+
+class _Sample:
+    """Sorted values and the per-block statistics computed from their weights."""
+
+    def __init__(self, x: np.ndarray, quantiles):
+        self.x = x
+        self.n = len(x)
+        self.quantiles = np.asarray(quantiles, dtype=np.float64)
+        self.positive = int(np.searchsorted(x, 0.0, side="right"))
+        logs = np.log(x[self.positive :])
+        # centred so the float32 product loses no precision on the scale of the values
+        self.center = float(logs.mean()) if len(logs) else 0.0
+        self.logs = (logs - self.center).astype(np.float32)
+        self.padded = -(-self.n // CHUNK_ROWS) * CHUNK_ROWS
+
+    def estimates(self) -> np.ndarray:
+        gm = math.exp(self.center) if self.n > self.positive else math.nan
+        return np.concatenate([[gm], self._percentiles(np.arange(1.0, self.n + 1), self.n)])
+
+    def _percentiles(self, cumulative: np.ndarray, total: float) -> np.ndarray:
+        out = np.full(len(self.quantiles), np.nan)
+        if total <= 0:
+            return out
+        for i, q in enumerate(self.quantiles):
+            value = self.x[min(_quantile_index(cumulative, _target(q, total)), self.n - 1)]
+            # a percentile among the censored values is not a concentration
+            out[i] = value if value >= 0 else np.nan
+        return out
+
+    def block(self, seed: int, replicates: range, method: str) -> np.ndarray:
+        """Statistics of `replicates`, one row each: geometric mean, then percentiles."""
+        weights = np.zeros((len(replicates), self.padded), dtype=np.float32)
+        for row, replicate in enumerate(replicates):
+            replicate_weights(seed, replicate, self.n, method, out=weights[row, : self.n])
+
+        # weight totals per chunk; exact, as float32 holds integers up to 2**24
+        chunks = weights.reshape(len(replicates), -1, CHUNK_ROWS) @ np.ones(CHUNK_ROWS, dtype=np.float32)
+        ends = np.cumsum(chunks, axis=1, dtype=np.float64)
+
+        out = np.empty((len(replicates), 1 + len(self.quantiles)))
+        for row in range(len(replicates)):
+            # one dot product per replicate: a block-wide product would sum in an
+            # order that depends on the block size
+            positive = weights[row, self.positive : self.n]
+            count = ends[row, -1] - self._weight_before(weights[row], ends[row], self.positive)
+            out[row, 0] = math.exp(self.center + float(np.dot(positive, self.logs)) / count) if count else math.nan
+            if len(self.quantiles):
+                out[row, 1:] = self._chunked_percentiles(weights[row], ends[row])
+        return out
+
+    @staticmethod
+    def _weight_before(weights: np.ndarray, ends: np.ndarray, index: int) -> float:
+        chunk = index // CHUNK_ROWS
+        before = ends[chunk - 1] if chunk else 0.0
+        return before + float(weights[chunk * CHUNK_ROWS : index].sum(dtype=np.float64))
+
+    def _chunked_percentiles(self, weights: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        out = np.full(len(self.quantiles), np.nan)
+        total = ends[-1]
+        if total <= 0:
+            return out
+        for i, q in enumerate(self.quantiles):
+            target = _target(q, total)
+            chunk = min(_quantile_index(ends, target), len(ends) - 1)
+            start = chunk * CHUNK_ROWS
+            before = ends[chunk - 1] if chunk else 0.0
+            cumulative = before + np.cumsum(weights[start : start + CHUNK_ROWS], dtype=np.float64)
+            value = self.x[min(start + _quantile_index(cumulative, target), self.n - 1)]
+            out[i] = value if value >= 0 else np.nan
+        return out
+
+
+def _interval(replicates: np.ndarray, confidence: float) -> tuple[float, float]:
+    # undefined replicates (no positive value, percentile below LOD) rank lowest
+    ranked = np.where(np.isnan(replicates), -np.inf, replicates)
+    alpha = (1 - confidence) / 2
+    lower, upper = np.quantile(ranked, [alpha, 1 - alpha], method="inverted_cdf")
+    return tuple(float(v) if np.isfinite(v) else math.nan for v in (lower, upper))
+
+
+def bootstrap(
+    values,
+    quantiles=(),
+    n_replicates: int = 1000,
+    confidence: float = 0.95,
+    method: str = "poisson",
+    seed: int | None = None,
+    max_workers: int | None = None,
+    max_block_bytes: int = 64 << 20,
+) -> dict[str, BootstrapInterval]:
+    """
+    Percentile-bootstrap intervals of the geometric mean (of the positive detected
+    values) and of the percentiles `quantiles` of an Array or ChunkedArray, keyed
+    "geometric_mean", "p50", ... as in `Summary`. All statistics share the same
+    replicates.
+
+    Percentiles use the inverted CDF over all non-missing values, with the censored
+    codes ranked below the detected values; one that falls among the censored values
+    is NaN, and NaN replicates rank lowest when taking the interval. `method` is
+    "poisson" (Poisson(1) weights) or "multinomial" (n-out-of-n resampling counts).
+    Blocks of replicates take at most about `max_block_bytes` of weights and run on
+    `max_workers` threads.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown bootstrap method '{method}'. Available: {', '.join(METHODS)}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be in (0, 1), got {confidence}")
+    seed = new_seed() if seed is None else seed
+    sample = _Sample(_observed(values), quantiles)
+    names = ["geometric_mean", *(f"p{q * 100:g}" for q in sample.quantiles)]
+
+    if sample.n:
+        size = max(1, max_block_bytes // (4 * sample.padded))
+        blocks = [range(start, min(start + size, n_replicates)) for start in range(0, n_replicates, size)]
+        workers = worker_count(max_workers or get_config().max_workers)
+        if workers > 1 and len(blocks) > 1:
+            results = list(get_executor(workers).map(lambda b: sample.block(seed, b, method), blocks))
+        else:
+            results = [sample.block(seed, b, method) for b in blocks]
+        replicates = np.concatenate(results) if results else np.empty((0, len(names)))
+        estimates = sample.estimates()
+    else:
+        replicates = np.full((n_replicates, len(names)), np.nan)
+        estimates = np.full(len(names), np.nan)
+
+    out = {}
+    for i, name in enumerate(names):
+        column = replicates[:, i]
+        lower, upper = _interval(column, confidence) if len(column) else (math.nan, math.nan)
+        out[name] = BootstrapInterval(float(estimates[i]), lower, upper, column)
+    return out
+
+
+def _ci_struct(interval: BootstrapInterval) -> pa.StructScalar:
+    fields = [("estimate", pa.float64()), ("lower", pa.float64()), ("upper", pa.float64())]
+    values = {"estimate": interval.estimate, "lower": interval.lower, "upper": interval.upper}
+    return pa.scalar({k: None if math.isnan(v) else v for k, v in values.items()}, type=pa.struct(fields))
+
+
+def _replicate_statistics(x: list[float], q, seed, n_replicates, method):
+    """Naive bootstrap: materialise every resample and compute the statistic on it."""
+    x = sorted(x)
+    out = []
+    for replicate in range(n_replicates):
+        weights = replicate_weights(seed, replicate, len(x), method)
+        resample = np.repeat(x, weights.astype(np.int64))
+        if q is None:
+            positive = resample[resample > 0]
+            out.append(math.exp(np.log(positive).mean()) if len(positive) else math.nan)
+        elif len(resample):
+            value = resample[max(math.ceil(q * len(resample)) - 1, 0)]
+            out.append(value if value >= 0 else math.nan)
+        else:
+            out.append(math.nan)
+    return np.asarray(out, dtype=np.float64)
+
+
+def _observed_reference(values: list[float | None]) -> list[float]:
+    return [v for v in values if v is not None and not math.isnan(v)]
+
+
+def _geometric_mean_ci_v0_0_1_reference(
+    values: list[float | None],
+    n_replicates: int = 1000,
+    confidence: float = 0.95,
+    method: str = "poisson",
+    seed: int = 0,
+) -> dict:
+    x = _observed_reference(values)
+    positive = [v for v in x if v > 0]
+    estimate = math.exp(sum(math.log(v) for v in positive) / len(positive)) if positive else math.nan
+    lower, upper = _interval(_replicate_statistics(x, None, seed, n_replicates, method), confidence)
+    return {"estimate": estimate, "lower": lower, "upper": upper}
+
+
+@register(registry_name="default", name="geometric_mean_ci", version="0.0.1")
+def _geometric_mean_ci_v0_0_1_arrow(
+    values: pa.Array,
+    n_replicates: int = 1000,
+    confidence: float = 0.95,
+    method: str = "poisson",
+    seed: int | None = None,
+) -> pa.Scalar:
+    """Geometric mean of the positive detected values with a percentile-bootstrap interval."""
+    result = bootstrap(values, (), n_replicates, confidence, method, seed)
+    return _ci_struct(result["geometric_mean"])
+
+
+def _percentile_ci_v0_0_1_reference(
+    values: list[float | None],
+    q: float = 0.95,
+    n_replicates: int = 1000,
+    confidence: float = 0.95,
+    method: str = "poisson",
+    seed: int = 0,
+) -> dict:
+    x = sorted(_observed_reference(values))
+    estimate = x[max(math.ceil(q * len(x)) - 1, 0)] if x else math.nan
+    lower, upper = _interval(_replicate_statistics(x, q, seed, n_replicates, method), confidence)
+    return {"estimate": estimate if estimate >= 0 else math.nan, "lower": lower, "upper": upper}
+
+
+@register(registry_name="default", name="percentile_ci", version="0.0.1")
+def _percentile_ci_v0_0_1_arrow(
+    values: pa.Array,
+    q: float = 0.95,
+    n_replicates: int = 1000,
+    confidence: float = 0.95,
+    method: str = "poisson",
+    seed: int | None = None,
+) -> pa.Scalar:
+    """
+    Percentile `q` (inverted CDF, censored values ranked lowest) with a percentile-bootstrap
+    interval; null where it falls among the censored values.
+    """
+    result = bootstrap(values, (q,), n_replicates, confidence, method, seed)
+    return _ci_struct(result[f"p{q * 100:g}"])
@@ -0,0 +1,112 @@
+import math
+
+from collections.abc import Iterable
+
+import pyarrow as pa
+
+from compehndly.summary_stats.aggregators import DEFAULT_QUANTILES, Summary, percentile_name
+
+__registrations__ = []
+
+
+# TODO: move decorator for joint use
+def register(registry_name, name, version):
+    def decorator(func):
+        __registrations__.append((registry_name, name, version, func))
+        return func
+
+    return decorator
+
+
+def summarize_batches(batches: Iterable[pa.RecordBatch], columns: list[str], **options) -> dict[str, Summary]:
+    """
+    Summary state of every column in `columns` over a stream of record batches, e.g.
+    `open_dataset(...).to_batches(columns=columns)`, in one pass. States of several
+    streams (partitions, workers) combine with `Summary.merge`.
+    """
+    summaries = {column: Summary(**options) for column in columns}
+    for batch in batches:
+        for column, summary in summaries.items():
+            summary.update(batch.column(column))
+    return summaries
+
+
+def _percentile_struct(summary: Summary) -> pa.StructScalar:
+    values = {percentile_name(q): value for q, value in zip(summary.quantiles, summary.percentiles())}
+    return pa.scalar(values, type=pa.struct([(name, pa.float64()) for name in values]))
+
+
+def _quantiles(q) -> list[float]:
+    # a list parameter arrives as an Arrow array through the adapters
+    return q.to_pylist() if isinstance(q, pa.Array) else list(q)
+
+
+def _detected(values: list[float | None]) -> list[float]:
+    return [v for v in values if v is not None and not math.isnan(v) and v >= 0]
+
+
+def _geometric_mean_v0_0_1_reference(values: list[float | None]) -> float:
+    positive = [v for v in _detected(values) if v > 0]
+    return math.exp(sum(math.log(v) for v in positive) / len(positive)) if positive else math.nan
+
+
+@register(registry_name="default", name="geometric_mean", version="0.0.1")
+def _geometric_mean_v0_0_1_arrow(values: pa.Array) -> pa.Scalar:
+    """Geometric mean of the positive detected values."""
+    return pa.scalar(Summary(quantiles=()).update(values).log_moments.geometric_mean)
+
+
+def _detection_frequency_v0_0_1_reference(values: list[float | None]) -> float:
+    observed = [v for v in values if v is not None and not math.isnan(v)]
+    return len(_detected(observed)) / len(observed) if observed else math.nan
+
+
+@register(registry_name="default", name="detection_frequency", version="0.0.1")
+def _detection_frequency_v0_0_1_arrow(values: pa.Array) -> pa.Scalar:
+    """Share of the non-missing values that are detected (not a negative censoring code)."""
+    return pa.scalar(Summary(quantiles=()).update(values).counts.detection_frequency)
+
+
+def _percentiles_v0_0_1_reference(values: list[float | None], q=DEFAULT_QUANTILES) -> dict:
+    observed = [v for v in values if v is not None and not math.isnan(v)]
+    detected = sorted(_detected(observed))
+    censored = len(observed) - len(detected)
+    result = {}
+    for p in q:
+        rank = p * len(observed)
+        if not observed or rank <= censored:
+            result[percentile_name(p)] = None
+            continue
+        # same interpolation as the digest: values at the middle of their rank
+        result[percentile_name(p)] = _interpolate(detected, rank - censored)
+    return result
+
+
+def _interpolate(ordered: list[float], rank: float) -> float:
+    ranks = [0.0] + [i + 0.5 for i in range(len(ordered))] + [float(len(ordered))]
+    points = [ordered[0]] + ordered + [ordered[-1]]
+    for i in range(1, len(ranks)):
+        if rank <= ranks[i]:
+            fraction = (rank - ranks[i - 1]) / (ranks[i] - ranks[i - 1])
+            return points[i - 1] + (points[i] - points[i - 1]) * fraction
+    return points[-1]
+
+
+@register(registry_name="default", name="percentiles", version="0.0.1")
+def _percentiles_v0_0_1_arrow(values: pa.Array, q=DEFAULT_QUANTILES, compression: float = 200) -> pa.Scalar:
+    """
+    Percentiles of the non-missing values from a t-digest, with the censored values
+    ranked below the detected ones; a percentile among the censored values is null.
+    """
+    summary = Summary(quantiles=_quantiles(q), compression=compression).update(values)
+    return _percentile_struct(summary)
+
+
+@register(registry_name="default", name="summary", version="0.0.1")
+def _summary_v0_0_1_arrow(values: pa.Array, q=DEFAULT_QUANTILES, compression: float = 200) -> pa.Scalar:
+    """
+    HBM summary of one biomarker: counts, detection frequency, geometric mean and SD
+    and percentiles, as a struct scalar.
+    """
+    summary = Summary(quantiles=_quantiles(q), compression=compression).update(values)
+    return pa.scalar(summary.result(), type=summary.result_type())
@@ -0,0 +1,217 @@
+"""
+Summary statistics per group (e.g. country x age band x sex) over large tables,
+without leaving Arrow.
+
+The censoring-aware statistics (counts, detection frequency, geometric mean and SD,
+optionally with the censored values substituted) reduce to per-group sums. Each
+row slice is turned into these sums with Arrow's hash aggregation on the shared
+thread pool, and the partial sums of all slices are merged by one more hash
+aggregation. Percentiles use Arrow's built-in hash t-digest over the whole table.
+
+Group keys are replaced by integer codes first, a null key getting a code of its
+own: Arrow's hash aggregation keeps null keys as a group but its join never matches
+them, so without codes the percentiles of such a group would be lost.
+"""
+
+import math
+
+from collections.abc import Mapping
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from compehndly.core.config import get_config
+from compehndly.core.parallel import get_executor, slice_boundaries, worker_count
+from compehndly.summary_stats.aggregators import DEFAULT_QUANTILES
+
+# per-group sums of every value column, merged across slices by summing
+_PARTIALS = ("missing", "detected", "censored", "log_count", "log_sum", "log_sq")
+
+
+def _column_parameter(value, column: str, name: str):
+    if not isinstance(value, Mapping):
+        return value
+    if column not in value:
+        raise ValueError(f"No {name} given for column '{column}'")
+    return value[column]
+
+
+def _substitutes(codes: np.ndarray, lod: float | None, loq: float | None) -> np.ndarray:
+    """Middle of the censoring interval of each code, as in the imputation bounds; NaN if unknown."""
+    lod = math.nan if lod is None else lod
+    loq = math.nan if loq is None else loq
+    return np.select([codes == -1, codes == -2, codes == -3], [lod / 2, (lod + loq) / 2, loq / 2], math.nan)
+
+
+def _partial_columns(x: np.ndarray, lod: float | None, loq: float | None) -> dict:
+    """Per-row terms of the partial sums of one value column; nulls are NaN in `x`."""
+    detected = x >= 0
+    censored = x < 0
+    values = x
+    if lod is not None or loq is not None:
+        values = np.where(censored, _substitutes(x, lod, loq), x)
+    positive = values > 0
+    logs = np.log(values, out=np.zeros_like(values), where=positive)
+    return {
+        "missing": pa.array(np.isnan(x)),
+        "detected": pa.array(detected),
+        "censored": pa.array(censored),
+        "log_count": pa.array(positive),
+        "log_sum": pa.array(logs),
+        "log_sq": pa.array(np.square(logs)),
+    }
+
+
+def _partial_sums(table: pa.Table, by: list[str], columns: list[str], lod, loq) -> pa.Table:
+    arrays = {key: table.column(key) for key in by}
+    for column in columns:
+        x = table.column(column)
+        if x.type != pa.float64():
+            x = pc.cast(x, pa.float64())
+        terms = _partial_columns(
+            x.to_numpy(), _column_parameter(lod, column, "lod"), _column_parameter(loq, column, "loq")
+        )
+        arrays.update({f"{column}__{name}": array for name, array in terms.items()})
+    partial = pa.table(arrays)
+    names = [name for name in partial.column_names if name not in by]
+    return partial.group_by(by, use_threads=False).aggregate([(name, "sum") for name in names])
+
+
+def _merge(partials: list[pa.Table], by: list[str]) -> pa.Table:
+    merged = pa.concat_tables(partials)
+    names = [name for name in merged.column_names if name not in by]
+    merged = merged.group_by(by).aggregate([(name, "sum") for name in names])
+    # "a__observed_sum_sum" -> "a__observed"
+    return merged.rename_columns([name.removesuffix("_sum_sum") for name in merged.column_names])
+
+
+def _percentiles(table: pa.Table, by: list[str], columns: list[str], quantiles, delta: int) -> pa.Table:
+    arrays = {key: table.column(key) for key in by}
+    for column in columns:
+        x = table.column(column)
+        # NaN is missing; censored codes are negative, so they rank below every detected value
+        arrays[column] = pc.if_else(pc.is_nan(x), None, x) if pa.types.is_floating(x.type) else x
+    options = pc.TDigestOptions(q=list(quantiles), delta=delta)
+    digests = pa.table(arrays).group_by(by).aggregate([(column, "tdigest", options) for column in columns])
+    out = {key: digests.column(key) for key in by}
+    for column in columns:
+        digest = digests.column(f"{column}_tdigest")
+        for i, q in enumerate(quantiles):
+            out[f"{column}_p{q * 100:g}"] = pc.list_element(digest, i)
+    return pa.table(out)
+
+
+def _encode_keys(table: pa.Table, by: list[str]) -> tuple[pa.Table, dict]:
+    """`table` with every key column as non-null int32 codes, and the arrays that decode them."""
+    dictionaries = {}
+    for key in by:
+        column = table.column(key)
+        if pa.types.is_dictionary(column.type):
+            column = column.unify_dictionaries()
+            dictionary = column.chunk(0).dictionary if column.num_chunks else pa.array([], column.type.value_type)
+            indices = pa.chunked_array([c.indices for c in column.chunks], type=column.type.index_type)
+            codes = pc.fill_null(pc.cast(indices, pa.int32()), len(dictionary))
+            dictionaries[key] = (dictionary, column.type)
+        else:
+            encoded = pc.dictionary_encode(column, null_encoding="encode")
+            dictionary = encoded.chunk(0).dictionary if encoded.num_chunks else pa.array([], column.type)
+            codes = pa.chunked_array([c.indices for c in encoded.chunks], type=pa.int32())
+            dictionaries[key] = (dictionary, None)
+        table = table.set_column(table.schema.get_field_index(key), key, codes)
+    return table, dictionaries
+
+
+def _decode_keys(table: pa.Table, by: list[str], dictionaries: dict) -> pa.Table:
+    for key in by:
+        codes = table.column(key).combine_chunks()
+        dictionary, dictionary_type = dictionaries[key]
+        if dictionary_type is None:
+            values = dictionary.take(codes)
+        else:
+            # the code after the last dictionary entry is a null key
+            indices = pc.if_else(pc.equal(codes, len(dictionary)), None, codes)
+            values = pa.DictionaryArray.from_arrays(pc.cast(indices, dictionary_type.index_type), dictionary)
+        table = table.set_column(table.schema.get_field_index(key), key, values)
+    return table
+
+
+def _group_order(table: pa.Table, by: list[str]) -> pa.Array:
+    keys = {}
+    for key in by:
+        column = table.column(key)
+        if pa.types.is_dictionary(column.type):
+            # dictionary keys such as bins sort in dictionary order, not by label
+            column = column.unify_dictionaries().combine_chunks().indices
+        keys[key] = column
+    return pc.sort_indices(pa.table(keys), sort_keys=[(key, "ascending") for key in by])
+
+
+def grouped_summary(
+    table: pa.Table,
+    by: list[str],
+    columns: list[str],
+    quantiles=DEFAULT_QUANTILES,
+    lod: float | Mapping | None = None,
+    loq: float | Mapping | None = None,
+    max_workers: int | None = None,
+    delta: int = 100,
+) -> pa.Table:
+    """
+    Summary statistics of every column in `columns` per group of the `by` columns,
+    one row per group, sorted by the group keys.
+
+    For each column, as in `Summary`: `n`, `n_missing`, `n_censored`, `n_detected`,
+    `detection_frequency`, `geometric_mean`, `geometric_sd` and the percentiles
+    `p50`, ..., prefixed with the column name. Values follow the censoring convention
+    of the imputation functions (negative codes are censored, null and NaN missing).
+    The geometric moments use the positive detected values or, with `lod` / `loq`
+    (per column through a mapping), also the censored ones, substituted by the middle
+    of their censoring interval. Percentiles rank censored values below the detected
+    ones and are null where they fall among the censored values.
+    """
+    missing = [name for name in [*by, *columns] if name not in table.column_names]
+    if missing:
+        raise KeyError(f"Column(s) not found: {', '.join(missing)}")
+    table, dictionaries = _encode_keys(table.select([*by, *columns]), by)
+
+    workers = worker_count(max_workers or get_config().max_workers)
+    bounds = slice_boundaries(table.columns, {}, workers, get_config().min_slice_rows)
+    slices = [table.slice(start, stop - start) for start, stop in zip(bounds[:-1], bounds[1:])]
+    if len(slices) > 1:
+        partials = list(get_executor(workers).map(lambda s: _partial_sums(s, by, columns, lod, loq), slices))
+    else:
+        partials = [_partial_sums(table, by, columns, lod, loq)]
+    sums = _merge(partials, by)
+
+    out = {key: sums.column(key) for key in by}
+    for column in columns:
+        s = {name: sums.column(f"{column}__{name}").to_numpy().astype(np.float64) for name in _PARTIALS}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = s["log_sum"] / s["log_count"]
+            variance = (s["log_sq"] - s["log_count"] * mean**2) / (s["log_count"] - 1)
+            observed = s["detected"] + s["censored"]
+            out[f"{column}_n"] = pa.array((observed + s["missing"]).astype(np.int64))
+            out[f"{column}_n_missing"] = pa.array(s["missing"].astype(np.int64))
+            out[f"{column}_n_censored"] = pa.array(s["censored"].astype(np.int64))
+            out[f"{column}_n_detected"] = pa.array(s["detected"].astype(np.int64))
+            out[f"{column}_detection_frequency"] = pa.array(s["detected"] / observed)
+            out[f"{column}_geometric_mean"] = pa.array(np.exp(mean))
+            out[f"{column}_geometric_sd"] = pa.array(np.exp(np.sqrt(np.maximum(variance, 0.0))))
+    summary = pa.table(out)
+
+    if quantiles:
+        percentiles = _percentiles(table, by, columns, quantiles, delta)
+        summary = summary.join(percentiles, keys=by)
+        for column in columns:
+            censored = summary.column(f"{column}_n_censored")
+            observed = pc.cast(pc.add(censored, summary.column(f"{column}_n_detected")), pa.float64())
+            for q in quantiles:
+                name = f"{column}_p{q * 100:g}"
+                value = summary.column(name)
+                among_censored = pc.or_(pc.less_equal(pc.multiply(q, observed), censored), pc.less(value, 0))
+                summary = summary.set_column(
+                    summary.schema.get_field_index(name), name, pc.if_else(among_censored, None, value)
+                )
+    summary = _decode_keys(summary, by, dictionaries)
+    return summary.take(_group_order(summary, by))
@@ -1,6 +1,27 @@
+"""
+Binning of continuous values, e.g. age bands or exposure quantiles.
+
+Bins are given by their edges `[e0, e1, ..., ek]`: k bins `[e0, e1), ..., [ek-1, ek)`,
+or `(e0, e1], ...` with `right=True`. Values outside the edges, null or NaN get a
+null bin. Bin indices are found with one vectorised `searchsorted` and returned as
+a dictionary-encoded array of labels, so every batch or chunk binned with the same
+edges shares one dictionary.
+
+Quantile edges are plain lists (per group: a mapping from group key to list). They
+can be computed once, e.g. on the full dataset or a first batch, stored with the
+rest of a spec, and passed back as `edges=` to bin later batches consistently
+without another pass over the data.
+"""
+
+import math
+
+from collections.abc import Mapping
+
+import numpy as np
 import pyarrow as pa
 import pyarrow.compute as pc
 
+
 __registrations__ = []
 
 
@@ -13,14 +34,261 @@ def register(registry_name, name, version):
     return decorator
 
 
-def _simple_bin_v0_0_1_reference(
-    *arrays: float,
-) -> float:
-    pass
+def _edges(edges) -> np.ndarray:
+    edges = np.asarray(edges, dtype=np.float64)
+    if edges.ndim != 1 or len(edges) < 2:
+        raise ValueError("Bin edges need at least two values")
+    if np.any(np.diff(edges) < 0):
+        raise ValueError("Bin edges must be increasing")
+    return edges
+
+
+def _probabilities(q) -> np.ndarray:
+    """Interior probabilities of `q` bins of equal size, or of the given cut probabilities."""
+    if isinstance(q, (int, np.integer)):
+        if q < 1:
+            raise ValueError("q must be >= 1")
+        return np.arange(1, q) / q
+    probabilities = np.asarray(q, dtype=np.float64)
+    if np.any((probabilities <= 0) | (probabilities >= 1)) or np.any(np.diff(probabilities) <= 0):
+        raise ValueError("Quantile probabilities must be increasing and within (0, 1)")
+    return probabilities
+
+
+def _float_numpy(values: pa.Array | pa.ChunkedArray) -> np.ndarray:
+    """float64 values with nulls as NaN."""
+    if values.type != pa.float64():
+        values = pc.cast(values, pa.float64())
+    return values.to_numpy(zero_copy_only=False)
+
+
+def _group_values(groups: pa.Array | pa.ChunkedArray) -> pa.Array | pa.ChunkedArray:
+    """Group keys by value: dictionary-encoded keys, e.g. `fixed_bins` output, are decoded."""
+    if pa.types.is_dictionary(groups.type):
+        return pc.cast(groups, groups.type.value_type)
+    return groups
+
+
+def interval_labels(edges, right: bool = False) -> list[str]:
+    """Labels such as "[18, 65)" for the bins between consecutive `edges`."""
+    edges = _edges(edges)
+    left, close = ("(", "]") if right else ("[", ")")
+    return [f"{left}{a:g}, {b:g}{close}" for a, b in zip(edges[:-1], edges[1:])]
+
+
+def quantile_labels(q) -> list[str]:
+    """Labels "Q1", ..., "Qk" for `q` quantile bins."""
+    return [f"Q{i}" for i in range(1, len(_probabilities(q)) + 2)]
+
+
+def _dictionary(labels, n_bins: int) -> pa.Array:
+    dictionary = labels if isinstance(labels, pa.Array) else pa.array(labels, type=pa.string())
+    if len(dictionary) != n_bins:
+        raise ValueError(f"Expected {n_bins} labels, got {len(dictionary)}")
+    return dictionary
+
+
+def _encode(index: np.ndarray, n_bins: int, dictionary: pa.Array) -> pa.DictionaryArray:
+    valid = (index >= 0) & (index < n_bins)
+    indices = pa.array(index.astype(np.int32), mask=~valid)
+    return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+
+def _map_chunks(func, values, *args):
+    if isinstance(values, pa.ChunkedArray):
+        chunks = [func(chunk, *args) for chunk in values.chunks]
+        if not chunks:
+            return pa.chunked_array([], type=func(pa.array([], type=values.type), *args).type)
+        return pa.chunked_array(chunks)
+    return func(values, *args)
+
+
+def _bin_index(x: np.ndarray, edges: np.ndarray, right: bool) -> np.ndarray:
+    if np.isnan(edges).any():
+        # quantile edges of a column without values
+        return np.full(len(x), -1)
+    # NaN sorts after every edge and so lands outside the bins
+    return np.searchsorted(edges, x, side="left" if right else "right") - 1
+
+
+def _assign(values: pa.Array, edges: np.ndarray, dictionary: pa.Array, right: bool) -> pa.DictionaryArray:
+    return _encode(_bin_index(_float_numpy(values), edges, right), len(edges) - 1, dictionary)
+
+
+def assign_bins(values: pa.Array | pa.ChunkedArray, edges, labels=None, right: bool = False):
+    """Bin `values` by `edges`; labels default to the bin intervals."""
+    edges = _edges(edges)
+    dictionary = _dictionary(interval_labels(edges, right) if labels is None else labels, len(edges) - 1)
+    return _map_chunks(_assign, values, edges, dictionary, right)
+
+
+def quantile_edges(values: pa.Array | pa.ChunkedArray, q=4) -> list[float]:
+    """
+    Edges of `q` quantile bins of `values` (an int for equal-sized bins, or the cut
+    probabilities), ignoring nulls and NaN. The outer edges are -inf and inf, so the
+    edges also bin later batches with values beyond the ones seen here.
+    """
+    probabilities = _probabilities(q)
+    x = _float_numpy(values)
+    x = x[~np.isnan(x)]
+    cuts = np.quantile(x, probabilities) if len(x) else np.full(len(probabilities), np.nan)
+    return [-math.inf, *cuts.tolist(), math.inf]
+
+
+def group_quantile_edges(values: pa.Array | pa.ChunkedArray, groups: pa.Array | pa.ChunkedArray, q=4) -> dict:
+    """
+    Quantile edges of `values` within every group, as a mapping from group key to
+    edges, in one sort of all rows by (group, value). A group without values gets NaN
+    cut points, so all its rows get a null bin.
+    """
+    if len(values) != len(groups):
+        raise ValueError("values and groups must have the same length")
+    probabilities = _probabilities(q)
+    groups = _group_values(groups)
+    keys = pc.unique(pc.drop_null(groups))
+    codes = pc.index_in(groups, value_set=keys).to_numpy(zero_copy_only=False)
+    x = _float_numpy(values)
+
+    # nulls in groups come out of index_in as NaN codes
+    keep = ~(np.isnan(x) | np.isnan(codes))
+    x, codes = x[keep], codes[keep].astype(np.int64)
+    # sort by value, then stably by group code: two argsorts, cheaper than a lexsort on both
+    order = np.argsort(x)
+    x = x[order][np.argsort(codes[order], kind="stable")]
+    counts = np.bincount(codes, minlength=len(keys))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    # linear interpolation between order statistics, as np.quantile does
+    position = starts[:, None] + probabilities[None, :] * np.maximum(counts - 1, 0)[:, None]
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, (starts + counts - 1)[:, None])
+    fraction = position - lower
+    cuts = np.full(position.shape, np.nan)
+    has_values = counts > 0
+    if len(x):
+        lo, hi = x[lower[has_values]], x[upper[has_values]]
+        cuts[has_values] = lo + (hi - lo) * fraction[has_values]
+    return {key: [-math.inf, *row, math.inf] for key, row in zip(keys.to_pylist(), cuts.tolist())}
+
+
+def _assign_grouped(values, groups, keys, edges, dictionary, right) -> pa.DictionaryArray:
+    codes = pc.index_in(groups, value_set=keys)
+    missing = pc.and_(pc.is_null(codes), pc.is_valid(groups))
+    if pc.any(missing).as_py():
+        unknown = pc.unique(pc.filter(groups, missing)).to_pylist()
+        raise ValueError(f"No bin edges given for group(s): {', '.join(map(str, unknown[:10]))}")
+
+    x = _float_numpy(values)
+    codes = pc.fill_null(codes, 0).to_numpy(zero_copy_only=False)
+    compare = np.greater if right else np.greater_equal
+    # one comparison per edge against the row's group edges; NaN never compares true
+    index = np.full(len(x), -1, dtype=np.int64)
+    for j in range(edges.shape[1]):
+        index += compare(x, edges[codes, j])
+    # groups without values have NaN edges
+    undefined = np.isnan(edges).any(axis=1)
+    if undefined.any():
+        index[undefined[codes]] = -1
+    if groups.null_count:
+        index[pc.is_null(groups).to_numpy(zero_copy_only=False)] = -1
+    return _encode(index, edges.shape[1] - 1, dictionary)
+
+
+def assign_group_bins(
+    values: pa.Array | pa.ChunkedArray,
+    groups: pa.Array | pa.ChunkedArray,
+    edges: Mapping,
+    labels=None,
+    right: bool = False,
+):
+    """
+    Bin `values` by the edges of their group, given as a mapping from group key to
+    edges; every group needs the same number of bins. Rows with a null group get a
+    null bin, a group without edges raises. Labels default to "Q1", ..., "Qk".
+    """
+    if len(values) != len(groups):
+        raise ValueError("values and groups must have the same length")
+    groups = _group_values(groups)
+    keys = pa.array(list(edges), type=groups.type)
+    matrix = [np.asarray(e, dtype=np.float64) for e in edges.values()]
+    if len({len(e) for e in matrix}) > 1:
+        raise ValueError("All groups need the same number of bin edges")
+    matrix = np.array([_edges(e) if not np.isnan(e).any() else e for e in matrix]).reshape(len(keys), -1)
+    n_bins = matrix.shape[1] - 1
+    dictionary = _dictionary([f"Q{i}" for i in range(1, n_bins + 1)] if labels is None else labels, n_bins)
+
+    if isinstance(values, pa.ChunkedArray) or isinstance(groups, pa.ChunkedArray):
+        values, groups = pa.chunked_array(values), pa.chunked_array(groups)
+        if [len(c) for c in values.chunks] != [len(c) for c in groups.chunks]:
+            values, groups = values.combine_chunks(), groups.combine_chunks()
+        else:
+            chunks = [
+                _assign_grouped(v, g, keys, matrix, dictionary, right) for v, g in zip(values.chunks, groups.chunks)
+            ]
+            return pa.chunked_array(chunks, type=pa.dictionary(pa.int32(), dictionary.type))
+    return _assign_grouped(values, groups, keys, matrix, dictionary, right)
+
+
+def _fixed_bins_v0_0_1_reference(value: float | None, edges: list[float], labels=None, right=False) -> str | None:
+    if value is None or math.isnan(value):
+        return None
+    labels = interval_labels(edges, right) if labels is None else labels
+    for i, (a, b) in enumerate(zip(edges[:-1], edges[1:])):
+        if (a < value <= b) if right else (a <= value < b):
+            return labels[i]
+    return None
+
+
+# not marked elementwise: the edges are an array argument that must not be sliced;
+# ChunkedArray values are still binned chunk by chunk
+@register(registry_name="default", name="fixed_bins", version="0.0.1")
+def _fixed_bins_v0_0_1_arrow(values: pa.Array, edges: pa.Array, labels: pa.Array | None = None, right=False):
+    """
+    Bin values by fixed edges, e.g. age bands [0, 18, 65, inf], into a
+    dictionary-encoded array of labels.
+    """
+    return assign_bins(values, edges, labels=labels, right=right)
+
+
+def _quantile_bins_v0_0_1_reference(values: list[float | None], q: int = 4) -> list[str | None]:
+    present = sorted(v for v in values if v is not None and not math.isnan(v))
+    edges = [-math.inf]
+    for i in range(1, q):
+        position = i / q * (len(present) - 1)
+        lower = math.floor(position)
+        upper = min(lower + 1, len(present) - 1)
+        edges.append(present[lower] + (present[upper] - present[lower]) * (position - lower))
+    edges.append(math.inf)
+    return [_fixed_bins_v0_0_1_reference(v, edges, labels=quantile_labels(q)) for v in values]
+
+
+@register(registry_name="default", name="quantile_bins", version="0.0.1")
+def _quantile_bins_v0_0_1_arrow(values: pa.Array, q=4, edges: pa.Array | None = None, labels: pa.Array | None = None):
+    """
+    Bin values into `q` quantile bins, labelled "Q1", ..., "Qk". The edges are
+    computed from `values` unless given, e.g. from `quantile_edges` on a full
+    dataset, so later batches are binned consistently.
+    """
+    if edges is None:
+        edges = quantile_edges(values, q)
+    if labels is None:
+        labels = [f"Q{i}" for i in range(1, len(edges))]
+    return assign_bins(values, edges, labels=labels)
 
 
-@register(registry_name="default", name="summation", version="0.0.1")
-def _simple_bin_v0_0_1_arrow(
-    array: pa.Array,
-) -> pa.Array:
-    pass
+@register(registry_name="default", name="group_quantile_bins", version="0.0.1")
+def _group_quantile_bins_v0_0_1_arrow(
+    values: pa.Array,
+    groups: pa.Array,
+    q=4,
+    edges: Mapping | None = None,
+    labels: pa.Array | None = None,
+):
+    """
+    Bin values into `q` quantile bins within each group. The edges are computed per
+    group unless given as a mapping from group key to edges, e.g. from
+    `group_quantile_edges` on a full dataset.
+    """
+    if edges is None:
+        edges = group_quantile_edges(values, groups, q)
+    return assign_group_bins(values, groups, edges, labels=labels)
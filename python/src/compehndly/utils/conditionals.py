@@ -13,4 +13,41 @@ def register(registry_name, name, version):
     return decorator
 
 
-# TODO: add conditional helper functions
+def case_when(conditions: list, choices: list, default):
+    """
+    Row-wise choice of the first branch whose condition holds, else `default`, in a
+    single `pc.case_when` pass. Choices and default may be arrays or scalars; scalars
+    are broadcast by the kernel, never materialised as constant arrays. A null
+    condition counts as false. Works on arrays and on pc.Expression alike.
+    """
+    if len(conditions) != len(choices):
+        raise ValueError("case_when needs one choice per condition")
+    if not conditions:
+        return default
+    return pc.case_when(pc.make_struct(*conditions), *choices, default)
+
+
+def piecewise(x, thresholds: list, choices: list, default=None):
+    """
+    Piecewise rule over increasing thresholds (scalars or arrays, row-wise):
+
+        x < thresholds[0]                   -> choices[0]
+        thresholds[0] <= x < thresholds[1]  -> choices[1]
+        ...
+        otherwise                           -> default (x itself if None)
+
+    Each condition is a single comparison, as earlier branches take precedence. A
+    row where `x` is null keeps `default`; a row with a null threshold array entry
+    is null, as no branch can be decided for it.
+    """
+    if len(thresholds) != len(choices):
+        raise ValueError("piecewise needs one choice per threshold")
+    default = x if default is None else default
+
+    conditions, values = [], []
+    for threshold in thresholds:
+        if isinstance(threshold, (pa.Array, pa.ChunkedArray)) and threshold.null_count:
+            conditions.append(pc.is_null(threshold))
+            values.append(pa.scalar(None, type=getattr(default, "type", pa.float64())))
+    conditions += [pc.less(x, threshold) for threshold in thresholds]
+    return case_when(conditions, values + list(choices), default)
@@ -1,8 +1,16 @@
 import numpy as np
 import pyarrow as pa
+import pytest
 
+from compehndly.core.rng import stream_id
 from compehndly.derived_variables.imputation import (
+    _impute_group,
+    _medium_bound_imputation_grouped_v0_0_1_arrow,
+    _random_multiple_imputation_arrow_v0_0_1,
     _random_single_imputation_arrow_v0_0_1,
+    _random_single_imputation_grouped_arrow_v0_0_1,
+    fit_lognormal,
+    iter_multiple_imputations,
 )
 
 
@@ -47,3 +55,224 @@ def test_imputation_bounds_respected():
     assert 0 <= imputed[2] <= 4.0
     # Ensure uncensored is unchanged
     assert np.all(out_np[3:] >= loq)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 120, 499])
+def test_imputation_chunked_matches_contiguous(chunk_size):
+    lod = 2.0
+    loq = 4.0
+
+    rng = np.random.default_rng(7)
+    biomarker = rng.lognormal(size=500) + loq
+    biomarker[::9] = -1.0
+    biomarker[::13] = -2.0
+    biomarker_pa = pa.array(biomarker)
+    chunked = pa.chunked_array(
+        [biomarker_pa.slice(start, chunk_size) for start in range(0, len(biomarker_pa), chunk_size)]
+    )
+
+    out = _random_single_imputation_arrow_v0_0_1(biomarker_pa, lod, loq, seed=5)
+    out_chunked = _random_single_imputation_arrow_v0_0_1(chunked, lod, loq, seed=5)
+
+    assert isinstance(out_chunked, pa.ChunkedArray)
+    assert [len(c) for c in out_chunked.chunks] == [len(c) for c in chunked.chunks]
+    assert out_chunked.combine_chunks().equals(out)
+
+
+def test_imputation_in_batches_matches_whole_column():
+    biomarker_pa = _censored_biomarker()
+    lognormal = fit_lognormal(biomarker_pa, 2.0)
+    whole = _random_single_imputation_arrow_v0_0_1(biomarker_pa, 2.0, 4.0, seed=5)
+    batches = [
+        _random_single_imputation_arrow_v0_0_1(
+            biomarker_pa.slice(start, 150), 2.0, 4.0, seed=5, lognormal=lognormal, row_offset=start
+        )
+        for start in range(0, len(biomarker_pa), 150)
+    ]
+    assert pa.concat_arrays(batches).equals(whole)
+
+
+def test_imputation_seed_is_reproducible():
+    biomarker_pa = _censored_biomarker()
+    first = _random_single_imputation_arrow_v0_0_1(biomarker_pa, 2.0, 4.0, seed=5)
+    assert _random_single_imputation_arrow_v0_0_1(biomarker_pa, 2.0, 4.0, seed=5).equals(first)
+    assert not _random_single_imputation_arrow_v0_0_1(biomarker_pa, 2.0, 4.0, seed=6).equals(first)
+
+
+def test_imputation_ros_method():
+    biomarker_pa = _censored_biomarker()
+    biomarker = biomarker_pa.to_numpy()
+    out = _random_single_imputation_arrow_v0_0_1(biomarker_pa, 2.0, 4.0, seed=5, method="ros").to_numpy()
+    for code, low, high in [(-1.0, 0.0, 2.0), (-2.0, 2.0, 4.0), (-3.0, 0.0, 4.0)]:
+        assert np.all((out[biomarker == code] >= low) & (out[biomarker == code] <= high))
+    np.testing.assert_array_equal(out[biomarker >= 0], biomarker[biomarker >= 0])
+
+
+def test_imputation_nulls_and_nan_are_below_lod():
+    lod = 2.0
+    loq = 4.0
+
+    rng = np.random.default_rng(11)
+    values = list(rng.lognormal(size=200) + loq)
+    values[3] = None
+    values[10] = float("nan")
+    values[20] = -2.0
+    biomarker_pa = pa.array(values)
+    assert biomarker_pa.null_count == 1
+
+    out = _random_single_imputation_arrow_v0_0_1(biomarker_pa, lod, loq, seed=4)
+
+    assert out.null_count == 0
+    out_np = out.to_numpy()
+    assert 0 <= out_np[3] <= lod
+    assert 0 <= out_np[10] <= lod
+    assert lod <= out_np[20] <= loq
+    uncensored = np.ones(200, dtype=bool)
+    uncensored[[3, 10, 20]] = False
+    np.testing.assert_array_equal(out_np[uncensored], np.asarray(values, dtype=float)[uncensored])
+
+
+def test_imputation_leaves_input_untouched_and_accepts_slices():
+    biomarker = np.random.default_rng(12).lognormal(size=300) + 4.0
+    biomarker[::10] = -1.0
+    biomarker_pa = pa.array(biomarker)
+    sliced = biomarker_pa.slice(50, 200)
+
+    out = _random_single_imputation_arrow_v0_0_1(sliced, 2.0, 4.0, seed=1)
+
+    np.testing.assert_array_equal(biomarker_pa.to_numpy(), biomarker)
+    assert len(out) == 200
+    kept = biomarker[50:250] >= 0
+    np.testing.assert_array_equal(out.to_numpy()[kept], biomarker[50:250][kept])
+    assert np.all(out.to_numpy()[~kept] >= 0)
+
+
+def test_imputation_integer_codes():
+    biomarker_pa = pa.array([5, -1, -2, 10, -3, 8, 7, 6, 9, 12])
+    out = _random_single_imputation_arrow_v0_0_1(biomarker_pa, 2.0, 4.0, seed=3)
+    assert out.type == pa.float64()
+    assert out.to_numpy()[[0, 3, 5]].tolist() == [5.0, 10.0, 8.0]
+
+
+def _censored_biomarker(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    biomarker = rng.lognormal(size=n) + 4.0
+    biomarker[::7] = -1.0
+    biomarker[::11] = -2.0
+    biomarker[::17] = -3.0
+    return pa.array(biomarker)
+
+
+def test_multiple_imputation_list():
+    biomarker_pa = _censored_biomarker()
+    biomarker = biomarker_pa.to_numpy()
+    censored = biomarker < 0
+
+    out = _random_multiple_imputation_arrow_v0_0_1(biomarker_pa, 2.0, 4.0, m=20, seed=1)
+
+    assert out.type == pa.list_(pa.float64(), 20)
+    assert len(out) == len(biomarker_pa)
+    values = out.flatten().to_numpy().reshape(-1, 20)
+    np.testing.assert_array_equal(values[~censored], np.repeat(biomarker[~censored, None], 20, axis=1))
+    # -1 -> [0, LOD], -2 -> [LOD, LOQ], -3 -> [0, LOQ]
+    for code, low, high in [(-1.0, 0.0, 2.0), (-2.0, 2.0, 4.0), (-3.0, 0.0, 4.0)]:
+        imputed = values[biomarker == code]
+        assert np.all((imputed >= low) & (imputed <= high))
+    # the imputations differ from each other
+    assert np.all(values[censored].std(axis=1) > 0)
+
+
+def test_multiple_imputation_table_and_lazy_match_list():
+    biomarker_pa = _censored_biomarker()
+    as_list = _random_multiple_imputation_arrow_v0_0_1(biomarker_pa, 2.0, 4.0, m=10, seed=9)
+    values = as_list.flatten().to_numpy().reshape(-1, 10)
+
+    table = _random_multiple_imputation_arrow_v0_0_1(biomarker_pa, 2.0, 4.0, m=10, seed=9, output="table")
+    assert table.column_names == [f"imputation_{j}" for j in range(1, 11)]
+
+    lazy = list(iter_multiple_imputations(biomarker_pa, 2.0, 4.0, m=10, seed=9, block_size=3))
+    assert len(lazy) == 10
+    for j in range(10):
+        np.testing.assert_array_equal(table.column(j).to_numpy(), values[:, j])
+        np.testing.assert_array_equal(lazy[j].to_numpy(), values[:, j])
+
+
+def test_multiple_imputation_chunked_input():
+    biomarker_pa = _censored_biomarker()
+    chunked = pa.chunked_array([biomarker_pa.slice(0, 150), biomarker_pa.slice(150)])
+    out = _random_multiple_imputation_arrow_v0_0_1(biomarker_pa, 2.0, 4.0, m=3, seed=2)
+    assert _random_multiple_imputation_arrow_v0_0_1(chunked, 2.0, 4.0, m=3, seed=2).equals(out)
+
+
+def _grouped_biomarker(n=3000, seed=5):
+    rng = np.random.default_rng(seed)
+    labs = np.array(["lab-a", "lab-b", "lab-c"])[rng.integers(0, 3, size=n)]
+    biomarker = rng.lognormal(size=n) + 1.0
+    biomarker[rng.random(n) < 0.2] = -1.0
+    return pa.array(biomarker), pa.array(labs)
+
+
+def test_grouped_imputation_matches_per_group_imputation():
+    biomarker_pa, labs = _grouped_biomarker()
+    lod = {"lab-a": 0.5, "lab-b": 0.8, "lab-c": 1.0}
+
+    out = _random_single_imputation_grouped_arrow_v0_0_1(biomarker_pa, labs, lod, 2.0, seed=7, max_workers=1)
+
+    # each group is fitted on its own and draws from the stream of its key, at its original row indices;
+    # the batched fit agrees with the scalar one to the optimiser's tolerance
+    out_np = out.to_numpy()
+    labs_np = np.asarray(labs.to_pylist())
+    for key in lod:
+        mask = labs_np == key
+        values = biomarker_pa.to_numpy()[mask]
+        lognormal = fit_lognormal(pa.array(values), lod[key])
+        expected = _impute_group(values, np.flatnonzero(mask), lod[key], 2.0, 7, stream_id(key), lognormal)
+        np.testing.assert_allclose(out_np[mask], expected, rtol=1e-5)
+        censored = biomarker_pa.to_numpy()[mask] < 0
+        assert np.all(out_np[mask][censored] <= lod[key])
+
+
+def test_grouped_imputation_independent_of_workers():
+    biomarker_pa, labs = _grouped_biomarker()
+    lod = {"lab-a": 0.5, "lab-b": 0.8, "lab-c": 1.0}
+    serial = _random_single_imputation_grouped_arrow_v0_0_1(biomarker_pa, labs, lod, 2.0, seed=7, max_workers=1)
+    pooled = _random_single_imputation_grouped_arrow_v0_0_1(biomarker_pa, labs, lod, 2.0, seed=7, max_workers=2)
+    assert pooled.equals(serial)
+
+
+def test_grouped_imputation_ros_and_chunked_input():
+    biomarker_pa, labs = _grouped_biomarker()
+    chunked = pa.chunked_array([biomarker_pa.slice(0, 1000), biomarker_pa.slice(1000)])
+    out = _random_single_imputation_grouped_arrow_v0_0_1(chunked, labs, 0.5, 2.0, seed=7, method="ros")
+    mask = np.asarray(labs.to_pylist()) == "lab-b"
+    values = biomarker_pa.to_numpy()[mask]
+    lognormal = fit_lognormal(pa.array(values), 0.5, method="ros")
+    expected = _impute_group(values, np.flatnonzero(mask), 0.5, 2.0, 7, stream_id("lab-b"), lognormal)
+    np.testing.assert_array_equal(out.to_numpy()[mask], expected)
+
+
+def test_grouped_imputation_unfittable_group():
+    biomarker_pa, labs = _grouped_biomarker(n=100)
+    biomarker = np.where(np.asarray(labs.to_pylist()) == "lab-c", -1.0, biomarker_pa.to_numpy())
+    with pytest.raises(RuntimeError, match="lab-c"):
+        _random_single_imputation_grouped_arrow_v0_0_1(pa.array(biomarker), labs, 0.5, 2.0, seed=7)
+
+
+def test_grouped_imputation_missing_group():
+    biomarker_pa, labs = _grouped_biomarker(n=100)
+    with pytest.raises(ValueError, match="No lod given for group"):
+        _random_single_imputation_grouped_arrow_v0_0_1(biomarker_pa, labs, {"lab-a": 0.5}, 2.0)
+
+
+def test_grouped_medium_bound_imputation():
+    measurement = pa.array([0.1, 2.0, 0.3, 0.7, 5.0])
+    groups = pa.array(["a", "b", "a", "b", "a"])
+
+    out = _medium_bound_imputation_grouped_v0_0_1_arrow(measurement, groups, loq={"a": 1.0, "b": 3.0})
+    assert out.to_pylist() == [0.5, 1.5, 0.5, 1.5, 5.0]
+
+    out = _medium_bound_imputation_grouped_v0_0_1_arrow(measurement, groups, loq={"a": 1.0, "b": 3.0}, lod=0.2)
+    assert out.to_pylist() == [0.1, 1.6, 0.6, 1.6, 5.0]
+
+    with pytest.raises(ValueError, match="No loq given for group"):
+        _medium_bound_imputation_grouped_v0_0_1_arrow(measurement, groups, loq={"a": 1.0})
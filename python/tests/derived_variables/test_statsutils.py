@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+
+from scipy.optimize import approx_fprime
+from scipy.stats import lognorm
+
+from compehndly.derived_variables.statsutils import (
+    _fit_censored_lognorm_reference,
+    censored_lognorm_nll,
+    censored_lognorm_statistics,
+    fit_censored,
+    fit_censored_lognorm,
+    fit_censored_lognorm_grouped,
+    fit_censored_lognorm_ros,
+    ros_plotting_positions,
+)
+
+
+def _censored_sample(n, mu=0.3, sigma=1.2, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.lognormal(mu, sigma, size=n)
+    # two detection limits, as when batches from different labs are pooled
+    lod = np.where(np.arange(n) % 2 == 0, 0.5, 0.8)
+    censored = x < lod
+    return np.where(censored, lod, x), censored
+
+
+@pytest.mark.parametrize("n", [50, 1000, 100_000])
+def test_fit_matches_reference(n):
+    values, censored = _censored_sample(n)
+    expected = _fit_censored_lognorm_reference(values, censored)
+    fitted = fit_censored_lognorm(values, censored)
+    assert fitted.kwds["s"] == pytest.approx(expected.kwds["s"], rel=1e-5)
+    assert fitted.kwds["scale"] == pytest.approx(expected.kwds["scale"], rel=1e-5)
+
+
+def test_nll_matches_scipy():
+    values, censored = _censored_sample(500)
+    stats = censored_lognorm_statistics(values, censored)
+    # (sigma = 0.03 is left out: scipy's cdf underflows to 0 there, log_ndtr does not)
+    for sigma, mu in [(1.0, 0.1), (0.3, 0.5), (6.0, -1.0)]:
+        nll, _ = censored_lognorm_nll([sigma, mu], stats)
+        dist = lognorm(s=sigma, scale=np.exp(mu))
+        ll = dist.logpdf(values[~censored]).sum() + np.log(dist.cdf(values[censored])).sum()
+        penalty = 1e3 * max(0.05 - sigma, 0) ** 2 + 1e3 * max(sigma - 5.0, 0) ** 2
+        assert nll == pytest.approx(-(ll - penalty), rel=1e-10)
+
+
+@pytest.mark.parametrize("params", [(1.0, 0.1), (0.03, 0.5), (6.0, -1.0), (0.5, 3.0)])
+def test_gradient_matches_finite_differences(params):
+    values, censored = _censored_sample(500)
+    stats = censored_lognorm_statistics(values, censored)
+    _, grad = censored_lognorm_nll(params, stats)
+    numeric = approx_fprime(params, lambda p: censored_lognorm_nll(p, stats)[0], 1e-7 * np.abs(params))
+    np.testing.assert_allclose(grad, numeric, rtol=1e-4)
+
+
+def test_all_censored():
+    with pytest.raises(RuntimeError, match="all observations are censored"):
+        fit_censored_lognorm(np.full(5, 0.5), np.ones(5, dtype=bool))
+
+
+def _grouped_sample(n_groups=40, n=20_000, seed=1):
+    rng = np.random.default_rng(seed)
+    groups = rng.integers(0, n_groups, size=n)
+    mu = rng.normal(0.0, 1.0, size=n_groups)[groups]
+    sigma = rng.uniform(0.3, 2.0, size=n_groups)[groups]
+    x = np.exp(mu + sigma * rng.normal(size=n))
+    lod = np.where(groups % 3 == 0, 0.3, 0.6)
+    censored = x < lod
+    return np.where(censored, lod, x), censored, groups
+
+
+def test_grouped_fit_matches_scalar_fits():
+    values, censored, groups = _grouped_sample()
+    fit = fit_censored_lognorm_grouped(values, censored, groups)
+    assert fit.converged.all()
+    np.testing.assert_array_equal(fit.groups, np.arange(40))
+    for i, group in enumerate(fit.groups):
+        mask = groups == group
+        expected = fit_censored_lognorm(values[mask], censored[mask])
+        assert fit.sigma[i] == pytest.approx(expected.kwds["s"], abs=1e-4)
+        assert fit.mu[i] == pytest.approx(np.log(expected.kwds["scale"]), abs=1e-4)
+        assert fit.dist(i).kwds["s"] == fit.sigma[i]
+
+
+def test_grouped_fit_is_a_stationary_point():
+    values, censored, groups = _grouped_sample(n_groups=5)
+    fit = fit_censored_lognorm_grouped(values, censored, groups)
+    for i, group in enumerate(fit.groups):
+        mask = groups == group
+        stats = censored_lognorm_statistics(values[mask], censored[mask])
+        _, grad = censored_lognorm_nll([fit.sigma[i], fit.mu[i]], stats)
+        assert np.abs(grad).max() < 1e-8 * mask.sum()
+
+
+def test_grouped_fit_labels_and_unfittable_groups():
+    values, censored, groups = _grouped_sample(n_groups=3, n=3000)
+    labels = np.array(["lab-a", "lab-b", "lab-c"])[groups]
+    # every observation of lab-c censored
+    censored = censored | (labels == "lab-c")
+    fit = fit_censored_lognorm_grouped(values, censored, labels)
+    assert fit.groups.tolist() == ["lab-a", "lab-b", "lab-c"]
+    assert fit.converged.tolist() == [True, True, False]
+    assert np.isnan(fit.mu[2]) and np.isnan(fit.sigma[2])
+
+
+def test_ros_plotting_positions():
+    # two non-detects below 1, detects 2, 3, 5: P(exceed 1) = 3 / 5
+    values = np.array([2.0, 1.0, 5.0, 1.0, 3.0])
+    censored = np.array([False, True, False, True, False])
+    pp_detects, pp_limits = ros_plotting_positions(values, censored)
+    np.testing.assert_allclose(pp_detects, [0.4 + 0.6 * 1 / 4, 0.4 + 0.6 * 3 / 4, 0.4 + 0.6 * 2 / 4])
+    np.testing.assert_allclose(pp_limits, [0.4 * 1 / 3, 0.4 * 2 / 3])
+
+    # without censoring these are the Weibull positions r / (n + 1)
+    pp_detects, pp_limits = ros_plotting_positions(np.array([3.0, 1.0, 2.0]), np.zeros(3, dtype=bool))
+    np.testing.assert_allclose(pp_detects, [0.75, 0.25, 0.5])
+    assert pp_limits.size == 0
+
+
+def test_ros_plotting_positions_multiple_limits():
+    # detects below the lowest limit and between limits
+    values = np.array([0.2, 0.5, 0.7, 1.0, 1.2, 1.0, 3.0, 4.0])
+    censored = np.array([False, True, False, True, False, True, False, False])
+    pp_detects, pp_limits = ros_plotting_positions(values, censored)
+    assert np.all((pp_detects > 0) & (pp_detects < 1))
+    # plotting positions follow the order of the detected values
+    order = np.argsort(values[~censored])
+    assert np.all(np.diff(pp_detects[order]) > 0)
+    assert np.all(pp_limits < pp_detects.max())
+
+
+def test_ros_recovers_parameters():
+    values, censored = _censored_sample(200_000)
+    fitted = fit_censored_lognorm_ros(values, censored)
+    assert fitted.kwds["s"] == pytest.approx(1.2, abs=0.02)
+    assert np.log(fitted.kwds["scale"]) == pytest.approx(0.3, abs=0.02)
+
+
+def test_ros_needs_two_detects():
+    with pytest.raises(RuntimeError, match="fewer than two uncensored"):
+        fit_censored_lognorm_ros(np.array([0.5, 0.5, 3.0]), np.array([True, True, False]))
+
+
+def test_fit_censored_method():
+    values, censored = _censored_sample(1000)
+    assert fit_censored(values, censored, "ros").kwds == fit_censored_lognorm_ros(values, censored).kwds
+    assert fit_censored(values, censored).kwds == fit_censored_lognorm(values, censored).kwds
+    with pytest.raises(ValueError, match="Unknown fit method"):
+        fit_censored(values, censored, "bayes")
@@ -4,6 +4,14 @@ import pyarrow as pa
 
 # Import the functions to test
 from compehndly.derived_variables.summation import (
+    _row_count_v0_0_1_arrow,
+    _row_count_v0_0_1_reference,
+    _row_max_v0_0_1_arrow,
+    _row_max_v0_0_1_reference,
+    _row_mean_v0_0_1_arrow,
+    _row_mean_v0_0_1_reference,
+    _row_min_v0_0_1_arrow,
+    _row_min_v0_0_1_reference,
     _summation_v0_0_1_reference,
     _summation_v0_0_1_arrow,
 )
@@ -53,6 +61,8 @@ class TestSummation:
         # Should be completely null
         assert out.null_count == len(out)
         assert not all(out.is_valid())
+        assert out.type == pa.float64()
+        assert _summation_v0_0_1_arrow(pa.array([1, 2]), pa.nulls(2, pa.int64())).type == pa.float64()
 
     def test_nulls_treated_as_zero_when_not_all_required(self):
         a = pa.array([1.0, None, 3.0])
@@ -69,6 +79,20 @@ class TestSummation:
 
         assert np.allclose(out_np, expected, equal_nan=False)
 
+    @pytest.mark.parametrize(
+        "types, expected",
+        [
+            ((pa.int64(), pa.float32()), pa.float32()),
+            ((pa.uint64(), pa.int64()), pa.int64()),
+            ((pa.decimal128(10, 2), pa.decimal128(5, 3)), pa.decimal128(12, 3)),
+        ],
+    )
+    def test_result_type_follows_arrow(self, types, expected):
+        a, b = (pa.array([1.0, None]).cast(t) for t in types)
+        out = _summation_v0_0_1_arrow(a, b)
+        assert out.type == expected
+        assert out.to_pylist() == [2, 0]
+
     def test_length_mismatch_raises(self):
         a = pa.array([1.0, 2.0])
         b = pa.array([1.0])
@@ -79,3 +103,45 @@ class TestSummation:
     def test_no_input_raises(self):
         with pytest.raises(ValueError):
             _summation_v0_0_1_arrow()
+
+
+class TestRowReductions:
+    @pytest.mark.parametrize(
+        "arrow_fn, reference_fn",
+        [
+            (_row_mean_v0_0_1_arrow, _row_mean_v0_0_1_reference),
+            (_row_min_v0_0_1_arrow, _row_min_v0_0_1_reference),
+            (_row_max_v0_0_1_arrow, _row_max_v0_0_1_reference),
+            (_row_count_v0_0_1_arrow, _row_count_v0_0_1_reference),
+        ],
+    )
+    def test_matches_reference(self, arrow_fn, reference_fn):
+        a = pa.array([1.0, None, 3.0, None])
+        b = pa.array([None, 5.0, 1.0, None])
+        c = pa.array([2.0, 2.0, None, None])
+
+        out = arrow_fn(a, b, c).to_pylist()
+        expected = [reference_fn(*row) for row in zip(a.to_pylist(), b.to_pylist(), c.to_pylist())]
+
+        assert out == pytest.approx(expected)
+
+    @pytest.mark.parametrize(
+        "arrow_fn, expected",
+        [
+            (_row_mean_v0_0_1_arrow, [1.0, 2.0]),
+            (_row_min_v0_0_1_arrow, [1.0, 2.0]),
+            (_row_max_v0_0_1_arrow, [1.0, 2.0]),
+            (_row_count_v0_0_1_arrow, [1, 1]),
+        ],
+    )
+    def test_entire_null_array_is_skipped(self, arrow_fn, expected):
+        # the same null policy for all row reductions: an all-null column is skipped like any null
+        a = pa.array([1.0, 2.0])
+        b = pa.array([None, None], type=pa.float64())
+
+        assert arrow_fn(a, b).to_pylist() == expected
+
+    def test_no_input_raises(self):
+        for fn in [_row_mean_v0_0_1_arrow, _row_min_v0_0_1_arrow, _row_max_v0_0_1_arrow, _row_count_v0_0_1_arrow]:
+            with pytest.raises(ValueError):
+                fn()
@@ -0,0 +1,104 @@
+import pickle
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from compehndly.summary_stats.aggregators import CensoredCounts, LogMoments, Summary, TDigest
+
+
+@pytest.fixture
+def exposure():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(0.5, 1.0, size=200_000)
+    values[rng.random(len(values)) < 0.2] = -1.0
+    values[rng.random(len(values)) < 0.05] = -3.0
+    return values
+
+
+@pytest.mark.base
+class TestTDigest:
+    def test_rank_error(self):
+        x = np.random.default_rng(1).lognormal(size=500_000)
+        digest = TDigest()
+        for chunk in np.array_split(x, 17):
+            digest.update(chunk)
+        q = np.array([0.001, 0.01, 0.1, 0.5, 0.9, 0.95, 0.99, 0.999])
+        ranks = np.searchsorted(np.sort(x), digest.quantile(q)) / len(x)
+        np.testing.assert_allclose(ranks, q, atol=1e-3)
+        assert len(digest.means) <= digest.compression
+        assert digest.count == len(x)
+
+    def test_merge_matches_single_pass(self):
+        x = np.random.default_rng(2).normal(size=100_000)
+        single = TDigest().update(x)
+        parts = [TDigest().update(chunk) for chunk in np.array_split(x, 5)]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        q = [0.05, 0.5, 0.95]
+        np.testing.assert_allclose(merged.quantile(q), single.quantile(q), atol=0.01)
+        assert (merged.min, merged.max) == (x.min(), x.max())
+
+    def test_small_and_empty(self):
+        digest = TDigest().update(np.array([3.0, 1.0, 2.0]))
+        assert digest.quantile([0.0, 0.5, 1.0]).tolist() == [1.0, 2.0, 3.0]
+        assert np.isnan(TDigest().quantile([0.5])).all()
+
+
+@pytest.mark.base
+class TestLogMoments:
+    def test_merge_matches_numpy(self):
+        x = np.random.default_rng(3).lognormal(1.0, 0.5, size=10_000)
+        parts = [LogMoments().update(chunk) for chunk in np.array_split(x, 7)]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        assert merged.count == len(x)
+        assert merged.geometric_mean == pytest.approx(np.exp(np.log(x).mean()))
+        assert merged.geometric_sd == pytest.approx(np.exp(np.log(x).std(ddof=1)))
+
+    def test_empty(self):
+        assert np.isnan(LogMoments().geometric_mean)
+        assert np.isnan(LogMoments().update(np.array([2.0])).geometric_sd)
+
+
+@pytest.mark.base
+class TestCensoredCounts:
+    def test_counts(self):
+        counts = CensoredCounts().update(np.array([1.0, -1.0, -2.0, -3.0, -3.0, np.nan, 0.0, -7.0]))
+        assert (counts.n, counts.missing, counts.detected, counts.censored) == (8, 1, 2, 5)
+        assert counts.codes == {-1: 1, -2: 1, -3: 2}
+        assert counts.detection_frequency == pytest.approx(2 / 7)
+
+
+@pytest.mark.base
+class TestSummary:
+    def test_split_and_merge_is_independent_of_partitioning(self, exposure):
+        whole = Summary().update(pa.array(exposure)).result()
+        parts = [Summary().update(pa.array(chunk)) for chunk in np.array_split(exposure, 9)]
+        # states travel between worker processes
+        parts = [pickle.loads(pickle.dumps(part)) for part in parts]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        merged = merged.result()
+        for key in ["n", "n_missing", "n_censored", "n_detected", "detection_frequency"]:
+            assert merged[key] == whole[key]
+        for key in ["geometric_mean", "geometric_sd", "p50", "p90", "p95"]:
+            assert merged[key] == pytest.approx(whole[key], rel=1e-3)
+
+    def test_censored_values_rank_below_detected(self, exposure):
+        result = Summary(quantiles=[0.1, 0.5, 0.95]).update(pa.array(exposure)).result()
+        detected = np.sort(exposure[exposure >= 0])
+        censored = np.sum(exposure < 0)
+        assert result["p10"] is None
+        for q in [0.5, 0.95]:
+            expected = detected[int(q * len(exposure)) - censored]
+            assert result[f"p{q * 100:g}"] == pytest.approx(expected, rel=0.01)
+        assert result["geometric_mean"] == pytest.approx(np.exp(np.log(detected).mean()))
+
+    def test_nulls_are_missing(self):
+        result = Summary().update(pa.chunked_array([[1.0, None], [np.nan, -1.0, 4.0]])).result()
+        assert (result["n"], result["n_missing"], result["n_detected"]) == (5, 2, 2)
+        assert result["detection_frequency"] == pytest.approx(2 / 3)
@@ -0,0 +1,109 @@
+import math
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+import compehndly
+
+from compehndly.summary_stats.bootstrap import (
+    _POISSON,
+    _geometric_mean_ci_v0_0_1_arrow,
+    _geometric_mean_ci_v0_0_1_reference,
+    _percentile_ci_v0_0_1_arrow,
+    _percentile_ci_v0_0_1_reference,
+    bootstrap,
+    replicate_weights,
+)
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    x = rng.lognormal(size=3000)
+    x[rng.random(3000) < 0.3] = -1.0
+    x = x.tolist()
+    x[3] = None
+    x[5] = math.nan
+    return x
+
+
+def _as_reference(out: dict) -> dict:
+    return {key: math.nan if value is None else value for key, value in out.items()}
+
+
+@pytest.mark.base
+class TestBootstrap:
+    @pytest.mark.parametrize("method", ["poisson", "multinomial"])
+    def test_geometric_mean_ci_matches_reference(self, values, method):
+        out = _geometric_mean_ci_v0_0_1_arrow(pa.array(values), n_replicates=200, method=method, seed=1).as_py()
+        expected = _geometric_mean_ci_v0_0_1_reference(values, n_replicates=200, method=method, seed=1)
+        assert out == pytest.approx(expected, rel=1e-6)
+        assert out["lower"] < out["estimate"] < out["upper"]
+
+    @pytest.mark.parametrize("method", ["poisson", "multinomial"])
+    @pytest.mark.parametrize("q", [0.0, 0.31, 0.5, 0.95, 1.0])
+    def test_percentile_ci_matches_reference(self, values, method, q):
+        out = _percentile_ci_v0_0_1_arrow(pa.array(values), q=q, n_replicates=100, method=method, seed=2).as_py()
+        expected = _percentile_ci_v0_0_1_reference(values, q=q, n_replicates=100, method=method, seed=2)
+        assert _as_reference(out) == pytest.approx(expected, nan_ok=True)
+
+    def test_percentile_among_censored_is_null(self, values):
+        out = _percentile_ci_v0_0_1_arrow(pa.array(values), q=0.2, n_replicates=50, seed=0).as_py()
+        assert out == {"estimate": None, "lower": None, "upper": None}
+
+    def test_independent_of_blocks_and_workers(self, values):
+        serial = bootstrap(pa.array(values), (0.5, 0.9), n_replicates=64, seed=3, max_workers=1)
+        # one replicate per block, spread over the thread pool
+        blocked = bootstrap(pa.array(values), (0.5, 0.9), n_replicates=64, seed=3, max_workers=4, max_block_bytes=1)
+        assert serial.keys() == blocked.keys() == {"geometric_mean", "p50", "p90"}
+        for key in serial:
+            np.testing.assert_array_equal(serial[key].replicates, blocked[key].replicates)
+
+    def test_chunked_array_matches_array(self, values):
+        chunked = pa.chunked_array([values[:1000], values[1000:]])
+        a = bootstrap(chunked, (0.5,), n_replicates=20, seed=4)
+        b = bootstrap(pa.array(values), (0.5,), n_replicates=20, seed=4)
+        np.testing.assert_array_equal(a["p50"].replicates, b["p50"].replicates)
+
+    def test_interval_width_matches_standard_error(self):
+        rng = np.random.default_rng(5)
+        x = rng.lognormal(mean=1.0, sigma=0.5, size=20_000)
+        ci = bootstrap(pa.array(x), n_replicates=400, seed=5)["geometric_mean"]
+        # standard error of the log-mean is 0.5 / sqrt(n)
+        assert math.log(ci.upper) - math.log(ci.lower) == pytest.approx(2 * 1.96 * 0.5 / math.sqrt(len(x)), rel=0.2)
+        assert ci.lower < ci.estimate < ci.upper
+
+    def test_poisson_weights(self):
+        # only the cells spanning several variates are refined
+        assert np.count_nonzero(_POISSON < 0) < 16
+        weights = replicate_weights(0, 0, 10_000_000)
+        assert weights.mean() == pytest.approx(1.0, abs=1e-3)
+        assert weights.var() == pytest.approx(1.0, abs=2e-3)
+        counts = np.bincount(weights.astype(np.int64))
+        expected = len(weights) * np.array([math.exp(-1) / math.factorial(k) for k in range(len(counts))])
+        # the upper tail beyond the table's resolution (P(X >= 9) = 1.1e-6) is drawn too
+        assert len(counts) > 9
+        # within 5 standard deviations of the Poisson(1) frequencies
+        assert np.all(np.abs(counts[:8] - expected[:8]) < 5 * np.sqrt(expected[:8]))
+        weights = replicate_weights(0, 1, 100_000)
+        np.testing.assert_array_equal(weights, replicate_weights(0, 1, 100_000))
+        assert not np.array_equal(weights, replicate_weights(0, 2, 100_000))
+
+    def test_multinomial_weights_resample_n(self):
+        assert replicate_weights(0, 1, 1000, method="multinomial").sum() == 1000
+
+    def test_empty_and_invalid(self):
+        out = bootstrap(pa.array([None, math.nan], type=pa.float64()), (0.5,), n_replicates=10, seed=0)
+        assert math.isnan(out["geometric_mean"].estimate) and math.isnan(out["p50"].upper)
+        with pytest.raises(ValueError, match="Unknown bootstrap method"):
+            bootstrap(pa.array([1.0]), method="jackknife")
+        with pytest.raises(ValueError, match="confidence"):
+            bootstrap(pa.array([1.0]), confidence=1.0)
+
+
+@pytest.mark.base
+def test_registered():
+    registry = compehndly.FunctionRegistry.build_registry()
+    out = registry.get("percentile_ci")(pa.array([1.0, 2.0, 3.0, 4.0]), q=0.5, n_replicates=50, seed=0)
+    assert out["estimate"].as_py() == 2.0
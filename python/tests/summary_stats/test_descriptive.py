@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from compehndly.core.dataset import open_dataset
+from compehndly.summary_stats.aggregators import Summary
+from compehndly.summary_stats.descriptive import (
+    _detection_frequency_v0_0_1_arrow,
+    _detection_frequency_v0_0_1_reference,
+    _geometric_mean_v0_0_1_arrow,
+    _geometric_mean_v0_0_1_reference,
+    _percentiles_v0_0_1_arrow,
+    _percentiles_v0_0_1_reference,
+    _summary_v0_0_1_arrow,
+    summarize_batches,
+)
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    x = rng.lognormal(size=40).tolist()
+    for i in rng.choice(40, size=8, replace=False):
+        x[i] = -1.0
+    x[3] = None
+    x[5] = math.nan
+    return x
+
+
+class TestDescriptive:
+    def test_geometric_mean_matches_reference(self, values):
+        out = _geometric_mean_v0_0_1_arrow(pa.array(values)).as_py()
+        assert out == pytest.approx(_geometric_mean_v0_0_1_reference(values))
+
+    def test_detection_frequency_matches_reference(self, values):
+        out = _detection_frequency_v0_0_1_arrow(pa.array(values)).as_py()
+        assert out == pytest.approx(_detection_frequency_v0_0_1_reference(values))
+
+    def test_percentiles_match_reference(self, values):
+        # few values: every value is its own centroid, so the digest is exact
+        q = [0.1, 0.25, 0.5, 0.9, 0.95]
+        out = _percentiles_v0_0_1_arrow(pa.array(values), q=q).as_py()
+        expected = _percentiles_v0_0_1_reference(values, q=q)
+        assert out.keys() == expected.keys()
+        for key in expected:
+            assert out[key] == pytest.approx(expected[key])
+
+    def test_summary_fields(self, values):
+        out = _summary_v0_0_1_arrow(pa.array(values), q=[0.5])
+        assert [field.name for field in out.type] == [
+            "n",
+            "n_missing",
+            "n_censored",
+            "n_detected",
+            "detection_frequency",
+            "geometric_mean",
+            "geometric_sd",
+            "p50",
+        ]
+        assert out["n"].as_py() == 40
+        assert out["n_missing"].as_py() == 2
+        # types are declared per field, not guessed from the name
+        assert out.type == Summary(quantiles=[0.5]).result_type()
+        assert [field.type for field in out.type] == [pa.int64()] * 4 + [pa.float64()] * 4
+
+    def test_summarize_batches_over_dataset(self, tmp_path):
+        import pyarrow.parquet as pq
+
+        rng = np.random.default_rng(1)
+        table = pa.table({"a": rng.lognormal(size=10_000), "b": rng.normal(size=10_000)})
+        for i in range(4):
+            pq.write_table(table.slice(i * 2500, 2500), tmp_path / f"part-{i}.parquet")
+        batches = open_dataset(str(tmp_path)).to_batches(columns=["a", "b"], batch_size=1000)
+        summaries = summarize_batches(batches, ["a", "b"])
+        assert summaries["a"].result()["n"] == 10_000
+        assert summaries["a"].result()["geometric_mean"] == pytest.approx(
+            _geometric_mean_v0_0_1_arrow(table["a"]).as_py()
+        )
+        assert summaries["b"].result()["detection_frequency"] == pytest.approx(np.mean(table["b"].to_numpy() >= 0))
+
+
+@pytest.mark.pandas
+def test_pandas_returns_python_values():
+    import pandas as pd
+
+    import compehndly
+
+    registry = compehndly.FunctionRegistry.build_registry(adapter="pandas")
+    assert registry.get("geometric_mean")(pd.Series([1.0, 4.0])) == pytest.approx(2.0)
+    assert registry.get("summary")(pd.Series([1.0, 4.0]))["n_detected"] == 2
@@ -0,0 +1,90 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+import compehndly
+
+from compehndly.summary_stats.aggregators import Summary
+from compehndly.summary_stats.grouped import grouped_summary
+from compehndly.utils.bins import assign_bins
+
+
+@pytest.fixture(scope="module")
+def table():
+    rng = np.random.default_rng(0)
+    n = 60_000
+    country = rng.choice(["BE", "DE", "NL"], size=n)
+    x = rng.lognormal(size=n) * np.where(country == "DE", 2.0, 1.0)
+    x[rng.random(n) < 0.3] = -1.0
+    x[rng.random(n) < 0.05] = -2.0
+    x[rng.random(n) < 0.02] = np.nan
+    y = rng.lognormal(size=n)
+    return pa.table({"country": country, "sex": rng.choice(["F", "M"], size=n), "x": x, "y": y})
+
+
+def _rows(table, country, sex):
+    mask = (np.array(table["country"].to_pylist()) == country) & (np.array(table["sex"].to_pylist()) == sex)
+    return np.flatnonzero(mask)
+
+
+@pytest.mark.base
+class TestGroupedSummary:
+    def test_matches_summary_per_group(self, table):
+        out = grouped_summary(table, ["country", "sex"], ["x", "y"])
+        assert out.num_rows == 6
+        assert out.column("country").to_pylist() == ["BE", "BE", "DE", "DE", "NL", "NL"]
+        for row in out.to_pylist():
+            index = _rows(table, row["country"], row["sex"])
+            for column in ["x", "y"]:
+                expected = Summary().update(table[column].take(index)).result()
+                for key in ["n", "n_missing", "n_censored", "n_detected"]:
+                    assert row[f"{column}_{key}"] == expected[key]
+                for key in ["detection_frequency", "geometric_mean", "geometric_sd"]:
+                    assert row[f"{column}_{key}"] == pytest.approx(expected[key], rel=1e-9)
+                for key in ["p50", "p90", "p95"]:
+                    assert row[f"{column}_{key}"] == pytest.approx(expected[key], rel=0.02)
+
+    def test_parallel_partials_match_serial(self, table):
+        serial = grouped_summary(table, ["country"], ["x"], max_workers=1)
+        with compehndly.option_context(min_slice_rows=5_000):
+            parallel = grouped_summary(table, ["country"], ["x"], max_workers=4)
+        assert parallel["country"].equals(serial["country"])
+        for name in serial.column_names[1:]:
+            np.testing.assert_allclose(parallel[name].to_numpy(), serial[name].to_numpy(), rtol=1e-12)
+
+    def test_percentiles_among_censored_are_null(self, table):
+        out = grouped_summary(table, ["country"], ["x"], quantiles=[0.1, 0.5])
+        assert out["x_p10"].null_count == 3
+        assert out["x_p50"].null_count == 0
+
+    def test_substituted_geometric_mean(self, table):
+        out = grouped_summary(table, ["country"], ["x"], quantiles=(), lod={"x": 0.2}, loq=0.6)
+        index = np.flatnonzero(np.array(table["country"].to_pylist()) == "BE")
+        x = table["x"].to_numpy()[index]
+        x = np.select([x == -1, x == -2], [0.1, 0.4], x)
+        x = x[~np.isnan(x)]
+        assert out["x_geometric_mean"][0].as_py() == pytest.approx(np.exp(np.log(x).mean()))
+        assert "x_p50" not in out.column_names
+
+    def test_dictionary_keys_keep_bin_order(self, table):
+        rng = np.random.default_rng(1)
+        binned = table.append_column("age", assign_bins(pa.array(rng.uniform(0, 90, table.num_rows)), [0, 18, 65, 100]))
+        out = grouped_summary(binned, ["age"], ["y"])
+        assert out["age"].to_pylist() == ["[0, 18)", "[18, 65)", "[65, 100)"]
+
+    @pytest.mark.parametrize("dictionary", [False, True])
+    def test_null_keys_are_a_group(self, dictionary):
+        groups = pa.array(["a", None, "a", None, "b"])
+        keyed = pa.table({"g": groups.dictionary_encode() if dictionary else groups, "x": [1.0, 2.0, 3.0, 4.0, 5.0]})
+        out = grouped_summary(keyed, ["g"], ["x"], quantiles=(0.5,))
+        assert out["g"].type == keyed["g"].type
+        assert out["g"].to_pylist() == ["a", "b", None]
+        assert out["x_n"].to_pylist() == [2, 1, 2]
+        assert out["x_p50"].null_count == 0
+        assert grouped_summary(keyed.slice(0, 0), ["g"], ["x"]).num_rows == 0
+
+    def test_missing_columns_and_parameters(self, table):
+        with pytest.raises(KeyError, match="z"):
+            grouped_summary(table, ["country"], ["z"])
+        with pytest.raises(ValueError, match="No lod given for column 'y'"):
+            grouped_summary(table, ["country"], ["x", "y"], lod={"x": 0.2})
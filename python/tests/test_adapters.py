@@ -1,3 +1,104 @@
+import os
+import subprocess
+import sys
+
+from pathlib import Path
+
+import pytest
+
+import compehndly
+
+from compehndly.adapters import available_adapters, get_adapter
+
+# `import compehndly` may cost at most this multiple of the pyarrow import it includes;
+# relative, so the bound holds on slow and loaded machines alike
+IMPORT_TIME_FACTOR = 1.0
+# Modules `import compehndly` must leave to first use
+HEAVY_MODULES = ["pyarrow.compute", "numpy", "pandas", "polars", "scipy", "yaml", "importlib.metadata"]
+
+
+def _env():
+    return {**os.environ, "PYTHONPATH": str(Path(compehndly.__file__).parents[1])}
+
+
+def _importtime(code):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True, env=_env()
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, module = line.split("|")
+        try:
+            cumulative[module.strip()] = int(cum) * 1e-6
+        except ValueError:
+            continue  # header line
+    return cumulative
+
+
 class TestAdapters:
     def test_basic(self):
         pass
+
+    def test_unknown_adapter(self):
+        with pytest.raises(ValueError, match="Unknown adapter"):
+            get_adapter("does-not-exist")
+
+    def test_entry_points_are_listed(self):
+        assert {"base", "numpy", "pandas", "polars"} <= set(available_adapters())
+
+    @pytest.mark.pandas
+    def test_loaded_on_first_use(self):
+        registry = compehndly.FunctionRegistry(adapter="pandas")
+        assert registry.adapter.name == "pandas"
+        assert get_adapter("pandas") is registry.adapter
+
+    @pytest.mark.numpy
+    def test_numpy_results_with_nulls(self):
+        import numpy as np
+        import pyarrow as pa
+
+        out = get_adapter("numpy").from_arrow(pa.array([1.0, None, 3.0]))
+        np.testing.assert_array_equal(out, [1.0, np.nan, 3.0])
+
+
+class TestImportTime:
+    def test_import_does_not_load_heavy_modules(self):
+        # only what pyarrow itself does not already import
+        code = (
+            "import sys, pyarrow\n"
+            "before = set(sys.modules)\n"
+            "import compehndly\n"
+            f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules and m not in before]\n"
+            "assert not heavy, f'import compehndly imports {heavy}'\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, env=_env())
+
+    def test_import_time_relative_to_pyarrow(self):
+        imported = _importtime("import compehndly")
+        pyarrow = imported["pyarrow"]
+        own = imported["compehndly"] - pyarrow
+        assert own < IMPORT_TIME_FACTOR * pyarrow, (
+            f"'import compehndly' took {own:.3f}s on top of pyarrow, which took {pyarrow:.3f}s"
+        )
+
+    def test_pipeline_is_imported_on_first_use(self):
+        code = (
+            "import sys, compehndly\n"
+            "assert 'compehndly.core.pipeline' not in sys.modules\n"
+            "from compehndly import Pipeline\n"
+            "from compehndly.core import Pipeline as CorePipeline\n"
+            "assert Pipeline is CorePipeline is sys.modules['compehndly.core.pipeline'].Pipeline\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, env=_env())
+
+    @pytest.mark.polars
+    def test_adapter_imports_only_its_library(self):
+        code = (
+            "import sys, compehndly, polars\n"
+            "compehndly.FunctionRegistry(adapter='polars')\n"
+            "assert 'compehndly.adapters.polars_adapter' in sys.modules\n"
+            "assert 'pandas' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, env=_env())
@@ -0,0 +1,36 @@
+import importlib
+import inspect
+import pkgutil
+
+import pytest
+
+import benchmarks
+
+# names asv collects as benchmarks
+PREFIXES = ("time_", "timeraw_", "peakmem_", "mem_", "track_")
+MODULES = [info.name for info in pkgutil.iter_modules(benchmarks.__path__)]
+
+
+def _benchmarks(module):
+    for name, obj in vars(module).items():
+        if getattr(obj, "__module__", None) != module.__name__:
+            continue
+        if inspect.isfunction(obj) and name.startswith(PREFIXES):
+            yield obj, 0, []
+        elif inspect.isclass(obj):
+            params = getattr(obj, "params", [])
+            n_params = len(params) if params and isinstance(params[0], list) else int(bool(params))
+            for attr, method in vars(obj).items():
+                if attr.startswith(PREFIXES):
+                    yield method, n_params, ["self"]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_asv_can_call_every_benchmark(module):
+    # asv calls a benchmark with one argument per parameter list, and nothing else
+    module = importlib.import_module(f"benchmarks.{module}")
+    found = list(_benchmarks(module))
+    assert found
+    for func, n_params, bound in found:
+        parameters = list(inspect.signature(func).parameters)[len(bound) :]
+        assert len(parameters) == n_params, f"{func.__qualname__} takes {parameters}"
@@ -0,0 +1,164 @@
+import math
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from compehndly.utils.bins import (
+    _fixed_bins_v0_0_1_arrow,
+    _fixed_bins_v0_0_1_reference,
+    _group_quantile_bins_v0_0_1_arrow,
+    _quantile_bins_v0_0_1_arrow,
+    _quantile_bins_v0_0_1_reference,
+    assign_bins,
+    assign_group_bins,
+    group_quantile_edges,
+    quantile_edges,
+)
+
+
+@pytest.fixture
+def ages():
+    return pa.array([5.0, 17.9, 18.0, 64.0, 65.0, 120.0, None, float("nan"), -1.0])
+
+
+@pytest.mark.base
+class TestFixedBins:
+    @pytest.mark.parametrize("right", [False, True])
+    def test_matches_reference(self, ages, right):
+        edges = [0.0, 18.0, 65.0, 100.0]
+        out = _fixed_bins_v0_0_1_arrow(ages, edges, right=right)
+        expected = [_fixed_bins_v0_0_1_reference(v, edges, right=right) for v in ages.to_pylist()]
+        assert out.to_pylist() == expected
+
+    def test_dictionary_output(self, ages):
+        out = assign_bins(ages, [0, 18, 65, math.inf], labels=["child", "adult", "senior"])
+        assert pa.types.is_dictionary(out.type)
+        assert out.dictionary.to_pylist() == ["child", "adult", "senior"]
+        assert out.to_pylist() == ["child", "child", "adult", "adult", "senior", "senior", None, None, None]
+
+    def test_chunked_shares_dictionary(self, ages):
+        chunked = pa.chunked_array([ages[:4], ages[4:]])
+        out = assign_bins(chunked, [0, 18, 65, math.inf])
+        assert out.num_chunks == 2
+        assert out.to_pylist() == assign_bins(ages, [0, 18, 65, math.inf]).to_pylist()
+        assert out.chunk(0).dictionary.equals(out.chunk(1).dictionary)
+
+    def test_integer_values(self):
+        assert assign_bins(pa.array([1, 20]), [0, 18, 65]).to_pylist() == ["[0, 18)", "[18, 65)"]
+
+    def test_invalid_edges_and_labels(self, ages):
+        with pytest.raises(ValueError, match="increasing"):
+            assign_bins(ages, [0, 65, 18])
+        with pytest.raises(ValueError, match="at least two"):
+            assign_bins(ages, [0])
+        with pytest.raises(ValueError, match="Expected 2 labels"):
+            assign_bins(ages, [0, 18, 65], labels=["a"])
+
+
+@pytest.mark.base
+class TestQuantileBins:
+    def test_matches_reference(self):
+        values = pa.array(np.random.default_rng(0).lognormal(size=101).tolist() + [None])
+        assert _quantile_bins_v0_0_1_arrow(values).to_pylist() == _quantile_bins_v0_0_1_reference(values.to_pylist())
+
+    def test_edges_match_numpy(self):
+        x = np.random.default_rng(1).normal(size=1000)
+        edges = quantile_edges(pa.array(x), [0.1, 0.5, 0.9])
+        assert edges[0] == -math.inf and edges[-1] == math.inf
+        np.testing.assert_allclose(edges[1:-1], np.quantile(x, [0.1, 0.5, 0.9]))
+
+    def test_cached_edges_bin_later_batches(self):
+        rng = np.random.default_rng(2)
+        full = pa.array(rng.normal(size=10_000))
+        edges = quantile_edges(full, 4)
+        batches = [full.slice(i, 1000) for i in range(0, 10_000, 1000)]
+        binned = [_quantile_bins_v0_0_1_arrow(batch, edges=edges) for batch in batches]
+        assert pa.chunked_array(binned).to_pylist() == _quantile_bins_v0_0_1_arrow(full).to_pylist()
+        # values beyond those seen still fall in the outer bins
+        assert _quantile_bins_v0_0_1_arrow(pa.array([-1e9, 1e9]), edges=edges).to_pylist() == ["Q1", "Q4"]
+
+    def test_column_without_values(self):
+        values = pa.array([None, None], type=pa.float64())
+        assert _quantile_bins_v0_0_1_arrow(values).to_pylist() == [None, None]
+
+    def test_invalid_q(self):
+        with pytest.raises(ValueError, match="q must be"):
+            quantile_edges(pa.array([1.0]), 0)
+        with pytest.raises(ValueError, match="within"):
+            quantile_edges(pa.array([1.0]), [0.5, 1.5])
+
+
+@pytest.mark.base
+class TestGroupQuantileBins:
+    @pytest.fixture
+    def data(self):
+        rng = np.random.default_rng(3)
+        groups = rng.choice(["a", "b", "c"], size=3000)
+        values = rng.normal(size=3000) + (groups == "b") * 10
+        values[rng.random(3000) < 0.05] = np.nan
+        return pa.array(values), pa.array(groups)
+
+    def test_edges_match_per_group_quantiles(self, data):
+        values, groups = data
+        edges = group_quantile_edges(values, groups, 4)
+        x, g = values.to_numpy(), np.array(groups.to_pylist())
+        for key in ["a", "b", "c"]:
+            sub = x[(g == key) & ~np.isnan(x)]
+            np.testing.assert_allclose(edges[key][1:-1], np.quantile(sub, [0.25, 0.5, 0.75]))
+
+    def test_matches_per_group_binning(self, data):
+        values, groups = data
+        out = _group_quantile_bins_v0_0_1_arrow(values, groups).to_pylist()
+        g = np.array(groups.to_pylist())
+        for key in ["a", "b", "c"]:
+            index = np.flatnonzero(g == key)
+            expected = _quantile_bins_v0_0_1_arrow(values.take(index)).to_pylist()
+            assert [out[i] for i in index] == expected
+
+    def test_chunked_and_cached_edges(self, data):
+        values, groups = data
+        edges = group_quantile_edges(values, groups)
+        chunked = assign_group_bins(
+            pa.chunked_array([values[:1000], values[1000:]]), pa.chunked_array([groups[:1000], groups[1000:]]), edges
+        )
+        assert chunked.num_chunks == 2
+        assert chunked.to_pylist() == assign_group_bins(values, groups, edges).to_pylist()
+
+    def test_null_and_unknown_groups(self):
+        edges = {"a": [-math.inf, 0.0, math.inf]}
+        out = assign_group_bins(pa.array([-1.0, 1.0, 1.0]), pa.array(["a", "a", None]), edges)
+        assert out.to_pylist() == ["Q1", "Q2", None]
+        with pytest.raises(ValueError, match="No bin edges given for group"):
+            assign_group_bins(pa.array([1.0]), pa.array(["z"]), edges)
+
+    def test_group_without_values(self):
+        edges = group_quantile_edges(pa.array([1.0, 2.0, None]), pa.array(["a", "a", "b"]), 2)
+        assert np.isnan(edges["b"][1])
+        out = assign_group_bins(pa.array([1.0, 2.0, 5.0]), pa.array(["a", "a", "b"]), edges)
+        assert out.to_pylist() == ["Q1", "Q2", None]
+
+    def test_dictionary_groups(self, data):
+        values, groups = data
+        ages = pa.array(np.random.default_rng(4).uniform(0, 90, size=len(values)))
+        # age bands binned here, then used as groups: dictionary-encoded keys
+        bands = assign_bins(ages, [0, 18, 65, math.inf])
+        expected = _group_quantile_bins_v0_0_1_arrow(values, bands.dictionary_decode())
+        assert _group_quantile_bins_v0_0_1_arrow(values, bands).equals(expected)
+        edges = group_quantile_edges(values, pa.chunked_array([bands[:1000], bands[1000:]]))
+        assert set(edges) == {"[0, 18)", "[18, 65)", "[65, inf)"}
+        chunked = assign_group_bins(values, pa.chunked_array([bands[:1000], bands[1000:]]), edges)
+        assert chunked.to_pylist() == expected.to_pylist()
+
+
+@pytest.mark.pandas
+def test_pandas_output_is_categorical():
+    import pandas as pd
+
+    import compehndly
+
+    registry = compehndly.FunctionRegistry.build_registry(adapter="pandas")
+    out = registry.get("fixed_bins")(pd.Series([1.0, 30.0, None]), [0, 18, 65])
+    assert isinstance(out.dtype, pd.CategoricalDtype)
+    assert list(out.cat.categories) == ["[0, 18)", "[18, 65)"]
+    assert out.isna().tolist() == [False, False, True]
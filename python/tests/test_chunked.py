@@ -0,0 +1,83 @@
+import pyarrow as pa
+import pytest
+
+import compehndly
+
+from compehndly.core.chunked import chunk_boundaries, map_chunks
+
+
+def _layout(arr):
+    return [len(chunk) for chunk in arr.chunks]
+
+
+class TestChunkBoundaries:
+    def test_union_of_layouts(self):
+        a = pa.chunked_array([[1.0, 2.0], [3.0, 4.0, 5.0]])
+        b = pa.chunked_array([[1.0], [2.0, 3.0, 4.0, 5.0]])
+        assert chunk_boundaries([a, b], {}) == [0, 1, 2, 5]
+
+    def test_plain_arrays_do_not_split(self):
+        a = pa.chunked_array([[1.0, 2.0], [3.0]])
+        b = pa.array([1.0, 2.0, 3.0])
+        assert chunk_boundaries([a], {"other": b, "scalar": 2.0}) == [0, 2, 3]
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            chunk_boundaries([pa.chunked_array([[1.0]]), pa.array([1.0, 2.0])], {})
+
+
+class TestMapChunks:
+    def test_preserves_layout(self):
+        a = pa.chunked_array([[1.0, 2.0], [3.0, 4.0, 5.0]])
+        b = pa.array([1.0, 1.0, 1.0, 1.0, 1.0])
+        calls = []
+
+        def add(x, y):
+            calls.append(type(x))
+            return pa.compute.add(x, y)
+
+        result = map_chunks(add, [a, b], {})
+        assert _layout(result) == [2, 3]
+        assert result.to_pylist() == [2.0, 3.0, 4.0, 5.0, 6.0]
+        assert calls == [pa.DoubleArray, pa.DoubleArray]
+
+    def test_empty_input(self):
+        a = pa.chunked_array([], type=pa.float64())
+        result = map_chunks(lambda x: pa.compute.multiply(x, 2), [a], {})
+        assert isinstance(result, pa.ChunkedArray)
+        assert len(result) == 0
+        assert result.type == pa.float64()
+
+
+@pytest.mark.base
+class TestRegistryChunked:
+    @pytest.fixture(scope="class")
+    def registry(self):
+        return compehndly.FunctionRegistry.build_registry()
+
+    def test_elementwise_function_keeps_layout(self, registry):
+        measured = pa.chunked_array([[50.0, 100.0], [75.0], [0.0, 10.0]])
+        crt = pa.chunked_array([[100.0], [80.0, 120.0, 90.0, 10.0]])
+        result = registry.get("standardize_creatinine")(measured, crt)
+        assert isinstance(result, pa.ChunkedArray)
+        assert _layout(result) == [1, 1, 1, 2]
+        expected = registry.get("standardize_creatinine")(measured.combine_chunks(), crt.combine_chunks())
+        assert result.combine_chunks().equals(expected)
+
+    def test_scalar_parameters(self, registry):
+        measured = pa.chunked_array([[1.0, 2.0], [3.0]])
+        result = registry.get("medium_bound_imputation")(measured, loq=2.5, lod=1.5)
+        assert _layout(result) == [2, 1]
+        assert result.to_pylist() == [0.75, 2.0, 3.0]
+
+
+@pytest.mark.polars
+def test_polars_chunks_round_trip():
+    import polars as pl
+
+    registry = compehndly.FunctionRegistry.build_registry(adapter="polars")
+    measured = pl.concat([pl.Series([50.0, 100.0]), pl.Series([75.0])], rechunk=False)
+    crt = pl.concat([pl.Series([100.0, 80.0]), pl.Series([120.0])], rechunk=False)
+    result = registry.get("standardize_creatinine")(measured, crt)
+    assert isinstance(result, pl.Series)
+    assert result.n_chunks() == 2
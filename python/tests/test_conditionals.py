@@ -0,0 +1,46 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
+from compehndly.utils.conditionals import case_when, piecewise
+
+
+@pytest.mark.base
+class TestConditionals:
+    def test_case_when_first_true_branch_wins(self):
+        x = pa.array([1.0, 5.0, 10.0, None])
+        out = case_when([pc.less(x, 2.0), pc.less(x, 8.0)], [0.0, pa.array([1.0, 2.0, 3.0, 4.0])], -1.0)
+        assert out.to_pylist() == [0.0, 2.0, -1.0, -1.0]
+
+    def test_case_when_checks_lengths(self):
+        with pytest.raises(ValueError, match="one choice per condition"):
+            case_when([pc.less(pa.array([1.0]), 2.0)], [], 0.0)
+
+    def test_case_when_without_conditions_is_default(self):
+        x = pa.array([1.0, 2.0])
+        assert case_when([], [], x) is x
+
+    def test_piecewise_matches_chained_if_else(self):
+        rng = np.random.default_rng(0)
+        x = pa.array(np.concatenate([rng.uniform(-1.0, 3.0, size=1000), [np.nan]]))
+        lod, loq = 0.5, 1.5
+        expected = pc.if_else(pc.less(x, loq), (lod + loq) / 2, x)
+        expected = pc.if_else(pc.less(x, lod), lod / 2, expected)
+        out = piecewise(x, [lod, loq], [lod / 2, (lod + loq) / 2])
+        np.testing.assert_array_equal(out.to_numpy(), expected.to_numpy())
+
+    def test_piecewise_array_thresholds_and_nulls(self):
+        x = pa.array([0.05, 0.15, 0.5, None, float("nan")])
+        lod = pa.array([0.1, None, 0.1, 0.1, 0.1])
+        out = piecewise(x, [lod, 0.2], [0.05, 0.15])
+        assert out.to_pylist()[:4] == [0.05, None, 0.5, None]
+        assert np.isnan(out.to_pylist()[4])
+
+    def test_piecewise_expression(self):
+        import pyarrow.dataset as ds
+
+        expr = piecewise(pc.field("x"), [0.5, 2.0], [0.25, 1.25])
+        assert isinstance(expr, pc.Expression)
+        out = ds.dataset(pa.table({"x": [0.1, 1.0, 3.0]})).to_table(columns={"y": expr})
+        assert out.column("y").to_pylist() == [0.25, 1.25, 3.0]
@@ -100,3 +100,67 @@ class TestPandasIntegration:
             dtype=float,
         )
         assert result.equals(expected)
+
+
+class TestAutoAdapterIntegration:
+    @pytest.fixture(scope="module")
+    def normalize(self):
+        to_register = ["tests.utils"]
+        registry = compehndly.FunctionRegistry.build_registry(to_register, adapter="auto")
+        return registry.get("normalize")
+
+    @pytest.mark.base
+    def test_arrow_in_arrow_out(self, normalize):
+        result = normalize(pa.array([1.0, 2.0]), pa.array([1.01, 1.02]), sg_ref=1.024)
+        assert isinstance(result, pa.Array)
+
+    @pytest.mark.numpy
+    def test_numpy_in_numpy_out(self, normalize):
+        import numpy as np
+
+        result = normalize(np.array([1.0, 2.0]), np.array([1.01, 1.02]), sg_ref=1.024)
+        assert isinstance(result, np.ndarray)
+        np.testing.assert_allclose(result, [0.024 / 0.01, 0.048 / 0.02])
+
+    @pytest.mark.pandas
+    def test_pandas_in_pandas_out(self, normalize):
+        import pandas as pd
+
+        result = normalize(pd.Series([1.0, 2.0]), pd.Series([1.01, 1.02]), sg_ref=1.024)
+        assert isinstance(result, pd.Series)
+
+    @pytest.mark.polars
+    def test_polars_in_polars_out(self, normalize):
+        import polars as pl
+
+        result = normalize(pl.Series([1.0, 2.0]), pl.Series([1.01, 1.02]), sg_ref=1.024)
+        assert isinstance(result, pl.Series)
+
+    @pytest.mark.polars
+    def test_first_array_argument_decides(self, normalize):
+        import polars as pl
+
+        result = normalize(pl.Series([1.0, 2.0]), pa.array([1.01, 1.02]), sg_ref=1.024)
+        assert isinstance(result, pl.Series)
+
+    @pytest.mark.pandas
+    def test_dispatch_is_cached_per_type(self, normalize):
+        import pandas as pd
+
+        from compehndly.core.conversion import _DISPATCH_CACHE
+
+        normalize(pd.Series([1.0]), pd.Series([1.01]), sg_ref=1.024)
+        assert _DISPATCH_CACHE[pd.Series].name == "pandas"
+
+    @pytest.mark.numpy
+    def test_dispatch_by_value_is_not_cached(self, normalize):
+        import numpy as np
+
+        from compehndly.core.conversion import _DISPATCH_CACHE, dispatch_adapter
+
+        # the numpy adapter only takes 1-D arrays: a 2-D array first must not decide for the type
+        assert dispatch_adapter((np.ones((2, 2)),), {}).name == "base"
+        assert np.ndarray not in _DISPATCH_CACHE
+        assert dispatch_adapter((np.ones(2),), {}).name == "numpy"
+        result = normalize(np.array([1.0, 2.0]), np.array([1.01, 1.02]), sg_ref=1.024)
+        assert isinstance(result, np.ndarray)
@@ -0,0 +1,121 @@
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+import yaml
+
+import compehndly
+
+from compehndly.cli import main
+from compehndly.core.dataset import transform_dataset
+
+
+@pytest.fixture
+def table():
+    n = 1000
+    return pa.table(
+        {
+            "id": pa.array(range(n)),
+            "country": pa.array(["BE", "NL", "FR", "DE"] * (n // 4)),
+            "chol": pa.array([150.0 + i % 100 for i in range(n)]),
+            "trigl": pa.array([100.0 + i % 70 for i in range(n)]),
+            "pcb153": pa.array([float(i % 50) for i in range(n)]),
+            "unused": pa.array(["x"] * n),
+        }
+    )
+
+
+@pytest.fixture
+def source(table, tmp_path):
+    path = tmp_path / "source"
+    ds.write_dataset(table, path, format="parquet", max_rows_per_file=300, max_rows_per_group=300)
+    return path
+
+
+@pytest.fixture
+def spec():
+    return {
+        "lipids": {"function": "total_lipid_concentration", "inputs": ["chol", "trigl"]},
+        "pcb153_lip": {"function": "standardize_lipid", "inputs": ["pcb153", "lipids"]},
+    }
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return compehndly.FunctionRegistry.build_registry()
+
+
+def _expected(table, spec, registry):
+    return compehndly.Pipeline(spec, registry=registry).run(table, keep_inputs=["id"])
+
+
+@pytest.mark.base
+class TestTransformDataset:
+    @pytest.mark.parametrize("backend", ["eager", "expression"])
+    def test_matches_in_memory_pipeline(self, table, source, spec, registry, tmp_path, backend):
+        written = transform_dataset(
+            source, spec, tmp_path / "out", keep=["id"], registry=registry, backend=backend, batch_size=128
+        )
+        assert written
+        result = ds.dataset(tmp_path / "out").to_table().sort_by("id")
+        assert result.column_names == ["id", "lipids", "pcb153_lip"]
+        expected = _expected(table, spec, registry)
+        assert result["id"].equals(expected["id"])
+        for name in ["lipids", "pcb153_lip"]:
+            assert result[name].to_pylist() == pytest.approx(expected[name].to_pylist(), rel=1e-14)
+
+    def test_reads_only_required_columns(self, table, source, spec, registry, tmp_path):
+        # "unused" cannot be read as int64, so the transform only succeeds if it is never scanned
+        schema = table.schema.set(table.schema.get_field_index("unused"), pa.field("unused", pa.int64()))
+        dataset = ds.dataset(source, schema=schema)
+        with pytest.raises(pa.ArrowInvalid):
+            dataset.to_table()
+
+        transform_dataset(dataset, spec, tmp_path / "out", keep=["id"], registry=registry)
+        assert ds.dataset(tmp_path / "out").count_rows() == table.num_rows
+
+    def test_partitioned_ipc_output(self, table, source, spec, registry, tmp_path):
+        transform_dataset(source, spec, tmp_path / "out", partition_by=["country"], format="ipc", registry=registry)
+        assert sorted(p.name for p in (tmp_path / "out").iterdir()) == [
+            f"country={c}" for c in ["BE", "DE", "FR", "NL"]
+        ]
+
+        result = ds.dataset(tmp_path / "out", format="ipc", partitioning="hive").to_table()
+        assert result.num_rows == table.num_rows
+        assert set(result["country"].to_pylist()) == {"BE", "NL", "FR", "DE"}
+
+    def test_existing_output_needs_overwrite(self, source, spec, registry, tmp_path):
+        transform_dataset(source, spec, tmp_path / "out", registry=registry)
+        with pytest.raises(pa.ArrowInvalid):
+            transform_dataset(source, spec, tmp_path / "out", registry=registry)
+        transform_dataset(source, spec, tmp_path / "out", registry=registry, overwrite=True)
+
+    def test_missing_column(self, source, registry, tmp_path):
+        spec = {"lipids": {"function": "total_lipid_concentration", "inputs": ["chol", "nope"]}}
+        with pytest.raises(ValueError, match="nope"):
+            transform_dataset(source, spec, tmp_path / "out", registry=registry)
+
+    def test_unknown_format(self, source, spec, registry, tmp_path):
+        with pytest.raises(ValueError, match="Unknown output format"):
+            transform_dataset(source, spec, tmp_path / "out", format="csv", registry=registry)
+
+
+@pytest.mark.base
+class TestCli:
+    def test_transform(self, table, source, spec, registry, tmp_path, capsys):
+        spec_path = tmp_path / "spec.yaml"
+        spec_path.write_text(yaml.safe_dump(spec))
+        out = tmp_path / "out"
+
+        assert main(["transform", str(source), str(out), "--spec", str(spec_path), "--keep", "id"]) == 0
+        printed = capsys.readouterr().out.split()
+        assert printed and all(p.startswith(str(out)) for p in printed)
+
+        result = ds.dataset(out).to_table().sort_by("id")
+        expected = _expected(table, spec, registry)
+        assert result["pcb153_lip"].to_pylist() == pytest.approx(expected["pcb153_lip"].to_pylist(), rel=1e-14)
+
+    def test_bad_spec(self, source, tmp_path):
+        spec_path = tmp_path / "spec.yaml"
+        spec_path.write_text("- not a mapping\n")
+        with pytest.raises(ValueError, match="expected a mapping"):
+            main(["transform", str(source), str(tmp_path / "out"), "--spec", str(spec_path)])
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+import compehndly
+
+from compehndly.core import grouped
+from compehndly.core.grouped import group_arrays, group_parameter, map_groups, partition, scatter
+
+
+def _negate(values):
+    return -values
+
+
+@pytest.mark.base
+class TestGrouped:
+    def test_partition_and_scatter_round_trip(self):
+        groups = pa.chunked_array([["b", "a", "b"], ["c", "a", "b"]])
+        values = pa.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        parts = partition(groups)
+
+        assert parts.keys.to_pylist() == ["b", "a", "c"]
+        assert [parts.indices(i).tolist() for i in range(len(parts))] == [[0, 2, 5], [1, 4], [3]]
+        per_group = [a.to_numpy() for a in group_arrays(parts, values)]
+        assert [g.tolist() for g in per_group] == [[1.0, 3.0, 6.0], [2.0, 5.0], [4.0]]
+        np.testing.assert_array_equal(scatter(parts, per_group), values.to_numpy())
+
+    def test_dictionary_keys(self):
+        groups = pa.array(["b", "a", "b"]).dictionary_encode()
+        parts = partition(pa.chunked_array([groups[:1], groups[1:]]))
+        assert parts.keys.to_pylist() == ["b", "a"]
+        assert [parts.indices(i).tolist() for i in range(len(parts))] == [[0, 2], [1]]
+
+    def test_null_keys_are_rejected(self):
+        with pytest.raises(ValueError, match="null"):
+            partition(pa.array(["a", None]))
+
+    def test_group_parameter(self):
+        parts = partition(pa.array([2, 1, 2]))
+        assert group_parameter(parts, 0.5, "lod") == [0.5, 0.5]
+        assert group_parameter(parts, {1: 0.1, 2: 0.2, 3: 0.3}, "lod") == [0.2, 0.1]
+        with pytest.raises(ValueError, match="No lod given for group"):
+            group_parameter(parts, {1: 0.1}, "lod")
+
+    def test_process_pool_matches_serial(self):
+        tasks = [((np.arange(i, dtype=float),), {}) for i in range(12)]
+        serial = map_groups(_negate, tasks, max_workers=1)
+        pooled = map_groups(_negate, tasks, max_workers=2)
+        assert len(pooled) == 12
+        for a, b in zip(serial, pooled):
+            np.testing.assert_array_equal(a, b)
+
+    def test_serial_unless_configured(self, monkeypatch):
+        started = []
+
+        def executor(workers):
+            started.append(workers)
+            return ThreadPoolExecutor(workers)
+
+        monkeypatch.setattr(grouped, "get_process_executor", executor)
+        tasks = [((np.arange(3.0),), {}) for _ in range(4)]
+        # serial by default, whatever the number of CPUs
+        map_groups(_negate, tasks)
+        with compehndly.option_context(parallel=True, max_workers=2, min_slice_rows=1000):
+            # too few rows to be worth the process start-up
+            map_groups(_negate, tasks, rows=12)
+            assert started == []
+            map_groups(_negate, tasks, rows=1000)
+        assert started == [2]
@@ -0,0 +1,155 @@
+import json
+import subprocess
+import sys
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
+import compehndly
+
+from compehndly.core.config import parse_bytes
+from compehndly.core.memory import MIN_SLICE_ROWS, budget_rows, map_budgeted, split_boundaries
+
+# the Arrow pool's peak is per process, so peak-memory checks run in a fresh interpreter
+PEAK_SCRIPT = """
+import json, sys
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import compehndly
+from compehndly.core.traits import elementwise, peak_memory
+
+rows, budget, factor = int(sys.argv[1]), sys.argv[2], float(sys.argv[3])
+# computed, so the inputs live in the Arrow pool (pa.array would wrap the NumPy memory)
+chol = pc.add(np.random.default_rng(0).uniform(100, 300, rows), 0.0)
+trigl = pc.add(np.random.default_rng(1).uniform(50, 200, rows), 0.0)
+
+
+@elementwise
+@peak_memory(factor)
+def lipids(chol, trigl):
+    # three full-length temporaries: 1.5 times the inputs
+    return pc.add(pc.multiply(chol, 2.27), pc.add(trigl, 62.3))
+
+
+registry = compehndly.FunctionRegistry()
+registry.register("lipids", "0.1.0", lipids)
+pool = pa.default_memory_pool()
+start = pa.total_allocated_bytes()
+if budget != "none":
+    compehndly.config(max_memory=budget)
+out = registry.get("lipids")(chol, trigl)
+chunks = [len(c) for c in out.chunks] if isinstance(out, pa.ChunkedArray) else [len(out)]
+print(json.dumps({"inputs": start, "peak": pool.max_memory(), "chunks": chunks}))
+"""
+
+
+def _peak(rows, budget, factor=1.5):
+    result = subprocess.run(
+        [sys.executable, "-c", PEAK_SCRIPT, str(rows), str(budget), str(factor)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.fixture
+def budget():
+    with compehndly.option_context(max_memory=None) as config:
+        yield config
+
+
+class TestParseBytes:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("2GB", 2 * 10**9), ("512 MiB", 512 * 2**20), ("1.5kb", 1500), ("100", 100), (4096, 4096), (None, None)],
+    )
+    def test_parse(self, value, expected):
+        assert parse_bytes(value) == expected
+
+    @pytest.mark.parametrize("value", ["2 parsecs", "GB", -1, 0])
+    def test_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_bytes(value)
+
+    def test_config(self, budget):
+        assert compehndly.config(max_memory="1GiB").max_memory == 2**30
+
+
+class TestBudgetedSlices:
+    def test_budget_rows(self, budget):
+        assert budget_rows(8.0) is None
+        allocated = pa.total_allocated_bytes()
+        assert budget_rows(8.0, budget=allocated + 8 * 10**6) == 10**6
+        assert budget_rows(8.0, budget=1) == MIN_SLICE_ROWS
+
+    def test_split_boundaries(self):
+        assert split_boundaries([0, 10, 25], 5) == [0, 5, 10, 15, 20, 25]
+        assert split_boundaries([0, 10], 100) == [0, 10]
+        assert split_boundaries([0, 0], 5) == [0, 0]
+
+    def test_results_match_unbudgeted(self, budget):
+        rng = np.random.default_rng(0)
+        x = pa.chunked_array([rng.lognormal(size=30_000), rng.lognormal(size=50_000)])
+        sg = pa.array(rng.uniform(1.0, 1.04, size=80_000))
+        expected = compehndly.FunctionRegistry.from_manifest().get("normalize_specific_gravity")(x, sg, sg_ref=1.024)
+        budget.max_memory = pa.total_allocated_bytes() + 200_000
+        out = compehndly.FunctionRegistry.from_manifest().get("normalize_specific_gravity")(x, sg, sg_ref=1.024)
+        assert out.num_chunks > 2
+        # slices never cross the input's chunk boundary
+        assert 30_000 in np.cumsum([len(c) for c in out.chunks])
+        assert out.equals(expected)
+
+    def test_fits_in_budget_is_one_call(self, budget):
+        budget.max_memory = 2**40
+        out = map_budgeted(lambda x: pc.multiply(x, 2), [pa.array([1, 2, 3])], {})
+        assert isinstance(out, pa.Array)
+
+    def test_parallel_slices_share_budget(self, budget):
+        x = pa.array(np.arange(100_000, dtype=np.float64))
+        registry = compehndly.FunctionRegistry.from_manifest()
+        with compehndly.option_context(max_workers=2, min_slice_rows=1):
+            budget.max_memory = pa.total_allocated_bytes() + 8 * 2 * 40_000
+            out = registry.get("standardize", parallel=True)(x, x)
+        assert out.num_chunks > 2
+        assert max(len(c) for c in out.chunks) <= 40_000
+
+    def test_random_imputation_is_unchanged(self, budget):
+        rng = np.random.default_rng(0)
+        x = rng.lognormal(size=20_000)
+        x[rng.random(20_000) < 0.3] = -1.0
+        f = compehndly.FunctionRegistry.from_manifest().get("random_single_imputation")
+        expected = f(pa.array(x), lod=0.2, loq=0.5, seed=1)
+        # censored rows drawn in blocks of MIN_SLICE_ROWS
+        budget.max_memory = 1
+        assert f(pa.array(x), lod=0.2, loq=0.5, seed=1).equals(expected)
+
+
+class TestPeakMemory:
+    ROWS = 4_000_000
+
+    def test_budget_is_respected(self):
+        unbudgeted = _peak(self.ROWS, "none")
+        inputs = unbudgeted["inputs"]
+        # room for the inputs, the result and a quarter of the temporaries
+        budget = inputs + inputs // 2 + inputs // 4
+        assert unbudgeted["peak"] > budget
+        budgeted = _peak(self.ROWS, budget)
+        assert len(budgeted["chunks"]) > 1
+        # allowing for buffer padding
+        assert budgeted["peak"] <= budget + 4096
+
+    def test_underestimate_is_corrected(self):
+        unbudgeted = _peak(self.ROWS, "none")
+        inputs = unbudgeted["inputs"]
+        budget = inputs + inputs // 2 + inputs // 16
+        # declared at two thirds of the real cost: the first slice overshoots, the rest adapt
+        underestimated = _peak(self.ROWS, budget, factor=1.0)
+        first, second = underestimated["chunks"][:2]
+        bytes_per_row = inputs / self.ROWS
+        left = budget - inputs - first * bytes_per_row / 2
+        assert second < left / bytes_per_row
+        assert underestimated["peak"] < unbudgeted["peak"]
@@ -0,0 +1,104 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+import compehndly
+
+from compehndly.core.parallel import slice_boundaries
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return compehndly.FunctionRegistry.build_registry()
+
+
+@pytest.fixture
+def arrays():
+    rng = np.random.default_rng(0)
+    return pa.array(rng.lognormal(size=10_000)), pa.array(rng.uniform(50, 150, size=10_000))
+
+
+class TestSliceBoundaries:
+    def test_even_split(self):
+        arr = pa.array(np.zeros(100))
+        assert slice_boundaries([arr], {}, n_workers=4, min_slice_rows=10) == [0, 25, 50, 75, 100]
+
+    def test_min_slice_rows(self):
+        arr = pa.array(np.zeros(100))
+        assert slice_boundaries([arr], {}, n_workers=8, min_slice_rows=50) == [0, 50, 100]
+
+    def test_keeps_chunk_boundaries(self):
+        arr = pa.chunked_array([np.zeros(30), np.zeros(70)])
+        bounds = slice_boundaries([arr], {}, n_workers=4, min_slice_rows=10)
+        assert 30 in bounds
+        assert bounds[0] == 0 and bounds[-1] == 100
+        assert max(b - a for a, b in zip(bounds[:-1], bounds[1:])) <= 25
+
+
+@pytest.mark.base
+class TestParallelExecution:
+    def test_matches_serial(self, registry, arrays):
+        serial = registry.get("standardize_creatinine")(*arrays)
+        with compehndly.option_context(max_workers=4, min_slice_rows=1000):
+            parallel = registry.get("standardize_creatinine", parallel=True)(*arrays)
+        assert isinstance(parallel, pa.ChunkedArray)
+        assert parallel.num_chunks == 4
+        assert parallel.combine_chunks().equals(serial)
+
+    def test_scalar_parameters(self, registry, arrays):
+        measured, _ = arrays
+        serial = registry.get("medium_bound_imputation")(measured, loq=1.0, lod=0.5)
+        with compehndly.option_context(max_workers=3, min_slice_rows=100):
+            parallel = registry.get("medium_bound_imputation", parallel=True)(measured, loq=1.0, lod=0.5)
+        assert parallel.combine_chunks().equals(serial)
+
+    def test_small_input_is_not_split(self, registry):
+        result = registry.get("standardize", parallel=True)(pa.array([1.0, 2.0]), pa.array([2.0, 4.0]))
+        assert isinstance(result, pa.Array)
+
+    def test_global_config(self, registry, arrays):
+        with compehndly.option_context(parallel=True, max_workers=2, min_slice_rows=1000):
+            result = registry.get("standardize_creatinine")(*arrays)
+        assert isinstance(result, pa.ChunkedArray)
+        assert result.num_chunks == 2
+
+    def test_global_config_leaves_other_functions_serial(self, registry, arrays):
+        measured, _ = arrays
+        with compehndly.option_context(parallel=True, max_workers=2, min_slice_rows=1000):
+            result = registry.get("summation")(measured, measured)
+        assert isinstance(result, pa.Array)
+
+    def test_serial_override(self, registry, arrays):
+        with compehndly.option_context(parallel=True, max_workers=2, min_slice_rows=1000):
+            result = registry.get("standardize_creatinine", parallel=False)(*arrays)
+        assert isinstance(result, pa.Array)
+
+    def test_rejects_non_elementwise(self, registry):
+        with pytest.raises(ValueError, match="not elementwise"):
+            registry.get("random_single_imputation", parallel=True)
+
+
+@pytest.mark.pandas
+@pytest.mark.parametrize("options", [{"parallel": True, "max_workers": 4}, {"max_memory": 1}])
+def test_pandas_result_matches_serial(arrays, options):
+    import pandas as pd
+
+    registry = compehndly.FunctionRegistry.build_registry(adapter="pandas")
+    measured, crt = (pd.Series(a.to_numpy()) for a in arrays)
+    serial = registry.get("standardize_creatinine")(measured, crt)
+    with compehndly.option_context(min_slice_rows=1000, **options):
+        chunked = registry.get("standardize_creatinine")(measured, crt)
+    assert serial.dtype == np.float64
+    pd.testing.assert_series_equal(chunked, serial)
+
+
+class TestConfig:
+    def test_unknown_option(self):
+        with pytest.raises(TypeError):
+            compehndly.config(not_an_option=True)
+
+    def test_option_context_restores(self):
+        before = compehndly.config().parallel
+        with compehndly.option_context(parallel=not before):
+            assert compehndly.config().parallel is (not before)
+        assert compehndly.config().parallel is before
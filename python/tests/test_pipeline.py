@@ -0,0 +1,166 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
+import compehndly
+
+from compehndly.core.models import PipelineStep
+from compehndly.derived_variables.imputation import fit_lognormal
+
+
+@pytest.fixture
+def table():
+    return pa.table(
+        {
+            "chol": pa.array([200.0, 180.0, 220.0, 190.0]),
+            "trigl": pa.array([150.0, 120.0, 180.0, 140.0]),
+            "pcb153": pa.array([50.0, 100.0, 75.0, 0.0]),
+            "cd": pa.array([0.05, 0.2, 0.12, 0.5]),
+            "unused": pa.array(["a", "b", "c", "d"]),
+        }
+    )
+
+
+@pytest.fixture
+def spec():
+    return {
+        "pcb153_lip": {"function": "standardize_lipid", "inputs": ["pcb153", "lipids"]},
+        "lipids": {"function": "total_lipid_concentration", "inputs": ["chol", "trigl"]},
+        "cd_mb": {"function": "medium_bound_imputation", "inputs": ["cd"], "params": {"loq": 0.1}},
+    }
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return compehndly.FunctionRegistry.build_registry()
+
+
+@pytest.mark.base
+class TestPipeline:
+    def test_plan_orders_dependencies(self, spec, registry):
+        pipeline = compehndly.Pipeline(spec, registry=registry)
+        order = pipeline.plan(["pcb153_lip"])
+        assert order == ["lipids", "pcb153_lip"]
+        assert sorted(pipeline.required_columns(["pcb153_lip"])) == ["chol", "pcb153", "trigl"]
+
+    def test_run_matches_direct_calls(self, table, spec, registry):
+        result = compehndly.Pipeline(spec, registry=registry).run(table)
+        assert result.column_names == ["pcb153_lip", "lipids", "cd_mb"]
+
+        lipids = registry.get("total_lipid_concentration")(table["chol"], table["trigl"])
+        expected = registry.get("standardize_lipid")(table["pcb153"], lipids)
+        assert result["pcb153_lip"].equals(expected)
+        assert result["cd_mb"].to_pylist() == [0.05, 0.2, 0.12, 0.5]
+
+    def test_only_needed_steps_run(self, table, spec):
+        calls = []
+        registry = compehndly.FunctionRegistry()
+        for output, step in spec.items():
+            registry.register(step["function"], "0.0.1", lambda *a, _name=output, **k: calls.append(_name) or a[0])
+
+        compehndly.Pipeline(spec, registry=registry).run(table, outputs=["cd_mb"])
+        assert calls == ["cd_mb"]
+
+    def test_keep_inputs(self, table, spec, registry):
+        result = compehndly.Pipeline(spec, registry=registry).run(table, outputs=["lipids"], keep_inputs=True)
+        assert result.column_names == table.column_names + ["lipids"]
+
+    @pytest.mark.parametrize("backend", ["eager", "expression"])
+    def test_keep_listed_inputs(self, table, spec, registry, backend):
+        pipeline = compehndly.Pipeline(spec, registry=registry, backend=backend)
+        result = pipeline.run(table, outputs=["lipids"], keep_inputs=["unused"])
+        assert result.column_names == ["unused", "lipids"]
+        streamed = pipeline.execute(table.to_reader(max_chunksize=3), ["lipids"], keep_inputs=["unused"]).read_all()
+        assert streamed.column_names == ["unused", "lipids"]
+        with pytest.raises(ValueError, match="nope"):
+            pipeline.run(table, outputs=["lipids"], keep_inputs=["nope"])
+
+    def test_streaming_matches_table(self, table, spec, registry):
+        pipeline = compehndly.Pipeline(spec, registry=registry)
+        reader = pipeline.execute(table.to_reader(max_chunksize=3))
+        streamed = reader.read_all()
+        assert [b.num_rows for b in streamed.to_batches()] == [3, 1]
+        assert streamed.combine_chunks().equals(pipeline.run(table).combine_chunks())
+
+    def test_streamed_draws_match_table(self, registry):
+        # each batch draws by the row index in the stream, not from row 0 again
+        rng = np.random.default_rng(0)
+        x = rng.lognormal(size=1000) + 4.0
+        x[rng.random(1000) < 0.3] = -1.0
+        table = pa.table({"x": x})
+        params = {"lod": 2.0, "loq": 4.0, "seed": 5, "lognormal": fit_lognormal(table["x"], 2.0)}
+        spec = {"x_imp": {"function": "random_single_imputation", "inputs": ["x"], "params": params}}
+        pipeline = compehndly.Pipeline(spec, registry=registry)
+        streamed = pipeline.execute(table.to_reader(max_chunksize=300)).read_all()
+        assert [b.num_rows for b in streamed.to_batches()] == [300, 300, 300, 100]
+        assert streamed.combine_chunks().equals(pipeline.run(table).combine_chunks())
+
+    def test_keyword_inputs(self, table, registry):
+        spec = {"lipids": PipelineStep("total_lipid_concentration", inputs={"chol": "chol", "trigl": "trigl"})}
+        result = compehndly.Pipeline(spec, registry=registry).run(table)
+        expected = pc.add(pc.multiply(table["chol"], 2.27), pc.add(table["trigl"], 62.3))
+        assert result["lipids"].equals(expected)
+
+    def test_cycle(self, registry):
+        spec = {
+            "a": {"function": "standardize", "inputs": ["b", "x"]},
+            "b": {"function": "standardize", "inputs": ["a", "x"]},
+        }
+        with pytest.raises(ValueError, match="cycle"):
+            compehndly.Pipeline(spec, registry=registry).plan()
+
+    def test_missing_column(self, table, registry):
+        spec = {"out": {"function": "standardize", "inputs": ["pcb153", "missing"]}}
+        with pytest.raises(ValueError, match="missing"):
+            compehndly.Pipeline(spec, registry=registry).run(table)
+
+    def test_unknown_function(self, registry):
+        with pytest.raises(KeyError):
+            compehndly.Pipeline({"out": {"function": "nope", "inputs": ["x"]}}, registry=registry)
+
+    def test_rejects_dataframe_adapter(self):
+        registry = compehndly.FunctionRegistry(adapter="numpy")
+        with pytest.raises(ValueError):
+            compehndly.Pipeline({}, registry=registry)
+
+
+@pytest.mark.base
+class TestExpressionBackend:
+    def test_compiles_to_expressions(self, spec, registry):
+        pipeline = compehndly.Pipeline(spec, registry=registry, backend="expression")
+        compiled = pipeline.expressions(["pcb153_lip"])
+        assert list(compiled) == ["lipids", "pcb153_lip"]
+        assert all(isinstance(e, pc.Expression) for e in compiled.values())
+        # step outputs are referenced, not inlined
+        assert "lipids" in str(compiled["pcb153_lip"])
+
+    def test_matches_eager(self, table, spec, registry):
+        eager = compehndly.Pipeline(spec, registry=registry).run(table)
+        fused = compehndly.Pipeline(spec, registry=registry, backend="expression").run(table)
+        assert fused.column_names == eager.column_names
+        for name in eager.column_names:
+            # the fused plan may fold scalar arithmetic differently: compare to the last ulp
+            np.testing.assert_allclose(fused[name].to_numpy(), eager[name].to_numpy(), rtol=1e-14)
+
+    def test_streaming_matches_eager(self, table, spec, registry):
+        eager = compehndly.Pipeline(spec, registry=registry).run(table, keep_inputs=True)
+        pipeline = compehndly.Pipeline(spec, registry=registry, backend="expression")
+        streamed = pipeline.execute(table.to_reader(max_chunksize=3), keep_inputs=True).read_all()
+        assert streamed.column_names == eager.column_names
+        for name in ["pcb153_lip", "lipids", "cd_mb"]:
+            np.testing.assert_allclose(streamed[name].to_numpy(), eager[name].to_numpy(), rtol=1e-14)
+        assert streamed["unused"].equals(table["unused"])
+
+    def test_rejects_functions_without_expression_form(self, registry):
+        spec = {"out": {"function": "random_single_imputation", "inputs": ["x"], "params": {"lod": 1.0, "loq": 2.0}}}
+        with pytest.raises(ValueError, match="expression"):
+            compehndly.Pipeline(spec, registry=registry, backend="expression")
+
+    def test_to_expression(self, registry):
+        from compehndly.core.expressions import to_expression
+
+        expr = to_expression(registry.get_raw("normalize_specific_gravity"), "cd", "sg", sg_ref=1.024)
+        assert isinstance(expr, pc.Expression)
+        with pytest.raises(TypeError):
+            to_expression(registry.get_raw("summation"), "a", "b")
@@ -0,0 +1,90 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
+import compehndly
+
+from compehndly.core import profiling
+from compehndly.core.conversion import AUTO
+
+
+def _double(x: pa.Array) -> pa.Array:
+    return pc.multiply(x, 2)
+
+
+@pytest.fixture
+def registry():
+    registry = compehndly.FunctionRegistry()
+    registry.register("double", "0.1.0", _double)
+    profiling.reset()
+    yield registry
+    profiling.disable()
+    profiling.reset()
+
+
+class TestProfiling:
+    def test_disabled_records_nothing(self, registry):
+        registry.get("double")(pa.array([1, 2]))
+        assert profiling.snapshot() == {}
+
+    def test_records_calls_rows_and_times(self, registry):
+        with profiling.profile():
+            f = registry.get("double")
+            f(pa.array([1, 2, 3]))
+            f(pa.array(range(1000)))
+        assert not profiling.is_enabled()
+        stats = profiling.snapshot()[("double", "0.1.0", "base")]
+        assert stats.calls == 2
+        assert stats.rows == 1003
+        assert stats.compute_seconds > 0
+        assert stats.seconds == pytest.approx(stats.to_arrow_seconds + stats.compute_seconds + stats.from_arrow_seconds)
+        # the results are allocated from the Arrow pool (at least 8 bytes per row)
+        assert stats.allocated_bytes >= 8000
+
+    def test_allocated_bytes_include_temporaries(self, registry):
+        def _sum_of_squares(x: pa.Array) -> pa.Scalar:
+            # a float64 temporary of 8 bytes per row, freed before returning
+            return pc.sum(pc.multiply(x, x))
+
+        registry.register("sum_of_squares", "0.1.0", _sum_of_squares)
+        x = pa.array(np.arange(100_000, dtype=np.float64))
+        with profiling.profile():
+            registry.get("sum_of_squares")(x)
+        assert profiling.snapshot()[("sum_of_squares", "0.1.0", "base")].allocated_bytes >= x.nbytes
+
+    def test_callback_and_adapter_per_call(self, registry):
+        records = []
+        auto = compehndly.FunctionRegistry(adapter=AUTO)
+        auto.register("double", "0.1.0", _double)
+        with profiling.profile(callback=records.append):
+            assert auto.get("double")([1, 2]).to_pylist() == [2, 4]
+        assert [(r.name, r.version, r.adapter, r.rows) for r in records] == [("double", "0.1.0", "base", 2)]
+
+    @pytest.mark.pandas
+    def test_keyed_by_adapter(self, registry):
+        import pandas as pd
+
+        pandas_registry = compehndly.FunctionRegistry(adapter="pandas")
+        pandas_registry.register("double", "0.1.0", _double)
+        with profiling.profile():
+            registry.get("double")(pa.array([1]))
+            pandas_registry.get("double")(pd.Series([1, 2]))
+        assert set(profiling.snapshot()) == {("double", "0.1.0", "base"), ("double", "0.1.0", "pandas")}
+
+    def test_lazy_and_parallel_functions_are_named(self, registry):
+        lazy = compehndly.FunctionRegistry()
+        lazy.register_lazy("double", "0.2.0", __name__, "_double")
+        with profiling.profile():
+            lazy.get("double")(pa.array([1]))
+            registry.get("double", parallel=False)(pa.array([1]))
+        assert set(profiling.snapshot()) == {("double", "0.2.0", "base"), ("double", "0.1.0", "base")}
+
+    def test_snapshot_is_a_copy(self, registry):
+        with profiling.profile():
+            registry.get("double")(pa.array([1]))
+            snapshot = profiling.snapshot()
+            registry.get("double")(pa.array([1]))
+        assert snapshot[("double", "0.1.0", "base")].calls == 1
+        profiling.reset()
+        assert profiling.snapshot() == {}
@@ -0,0 +1,142 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
+from compehndly.utils import reductions
+from compehndly.utils.reductions import reduce_rows
+
+
+@pytest.fixture
+def columns():
+    rng = np.random.default_rng(0)
+    return [pa.array(rng.normal(size=1000), mask=rng.random(1000) < 0.3) for _ in range(5)]
+
+
+@pytest.mark.base
+class TestReduceRows:
+    @pytest.mark.parametrize(
+        "op, expected",
+        [
+            ("sum", lambda m: np.nansum(m, axis=1)),
+            ("mean", lambda m: np.nanmean(m, axis=1)),
+            ("min", lambda m: np.nanmin(m, axis=1)),
+            ("max", lambda m: np.nanmax(m, axis=1)),
+            ("count", lambda m: np.sum(~np.isnan(m), axis=1)),
+        ],
+    )
+    @pytest.mark.filterwarnings("ignore::RuntimeWarning")
+    def test_matches_numpy(self, columns, op, expected, monkeypatch):
+        # blocks smaller than the input, to cover the block loop
+        monkeypatch.setattr(reductions, "BLOCK_ROWS", 128)
+        matrix = np.column_stack([c.to_numpy(zero_copy_only=False) for c in columns])
+        out = reduce_rows(columns, op)
+        np.testing.assert_allclose(out.to_numpy(zero_copy_only=False), expected(matrix))
+
+    def test_rows_without_values(self):
+        a = pa.array([1.0, None])
+        b = pa.array([None, None], type=pa.float64())
+        assert reduce_rows([a, b], "sum").to_pylist() == [1.0, 0.0]
+        for op in ["mean", "min", "max"]:
+            assert reduce_rows([a, b], op).to_pylist() == [1.0, None]
+        assert reduce_rows([a, b], "count").to_pylist() == [1, 0]
+
+    def test_entirely_null_column(self):
+        a = pa.array([1.0, 2.0])
+        b = pa.nulls(2, type=pa.float64())
+        assert reduce_rows([a, b], "sum").to_pylist() == [1.0, 2.0]
+        assert reduce_rows([a, b], "mean").to_pylist() == [1.0, 2.0]
+
+    def test_chunked_and_sliced_inputs(self):
+        a = pa.chunked_array([[1.0, 2.0], [3.0, None, 5.0]])
+        b = pa.array([0.0, 10.0, 20.0, 30.0, 40.0, 50.0]).slice(1)
+        assert reduce_rows([a, b], "sum").to_pylist() == [11.0, 22.0, 33.0, 40.0, 55.0]
+
+    def test_types(self):
+        a = pa.array([1, 2], type=pa.int32())
+        b = pa.array([3, None], type=pa.int32())
+        assert reduce_rows([a, b], "sum").type == pa.int32()
+        assert reduce_rows([a, b], "max").to_pylist() == [3, 2]
+        assert reduce_rows([a, pa.array([0.5, 0.5])], "sum").to_pylist() == [1.5, 2.5]
+        assert reduce_rows([a, b], "mean").type == pa.float64()
+        with pytest.raises(TypeError, match="numeric"):
+            reduce_rows([pa.array(["a"])], "sum")
+
+    @pytest.mark.parametrize(
+        "op, expected",
+        [("sum", [1000, 6]), ("min", [1000, 1]), ("max", [1000, 5]), ("mean", [1000.0, 3.0])],
+    )
+    def test_nulls_in_a_narrower_column(self, op, expected, monkeypatch):
+        monkeypatch.setattr(reductions, "BLOCK_ROWS", 1)
+        # the int8 identities (127, -128) are values in int64 and must not leak into the result
+        a = pa.array([None, 1], type=pa.int8())
+        b = pa.array([1000, 5])
+        assert reduce_rows([a, b], op).to_pylist() == expected
+
+    @pytest.mark.parametrize("op, expected", [("sum", [0.5, 6.0]), ("min", [0.5, 1.0]), ("max", [0.5, 5.0])])
+    def test_nulls_in_mixed_types(self, op, expected):
+        a = pa.array([None, 1], type=pa.int8())
+        b = pa.array([0.5, 5.0])
+        out = reduce_rows([a, b], op)
+        assert out.type == pa.float64()
+        assert out.to_pylist() == expected
+        # nothing but nulls in a row, with only integer columns
+        assert reduce_rows([a, pa.array([None, 2], type=pa.int16())], op).to_pylist()[0] == (0 if op == "sum" else None)
+
+    @pytest.mark.parametrize(
+        "types",
+        [
+            (pa.int64(), pa.float32()),
+            (pa.uint64(), pa.int64()),
+            (pa.int32(), pa.uint32()),
+            (pa.int8(), pa.float64()),
+            (pa.decimal128(10, 2), pa.decimal128(5, 3)),
+            (pa.decimal128(10, 2), pa.int64()),
+        ],
+    )
+    @pytest.mark.parametrize("op", ["sum", "min", "max"])
+    def test_result_type_is_arrows(self, types, op):
+        a, b = (pa.array([1.0, None, 3.0]).cast(t) for t in types)
+        out = reduce_rows([a, b], op)
+        assert out.type == pc.add(a, b).type
+        expected = {"sum": [2, 0, 6], "min": [1, None, 3], "max": [1, None, 3]}[op]
+        assert out.to_pylist() == expected
+
+    def test_decimal_mean_and_count(self):
+        a = pa.array([1.0, None, 3.0]).cast(pa.decimal128(10, 2))
+        b = pa.array([2.0, None, None])
+        assert reduce_rows([a, b], "mean").to_pylist() == [1.5, None, 3.0]
+        assert reduce_rows([a, b], "count").to_pylist() == [2, 0, 1]
+
+    def test_out_of_range_cast_fails_as_in_arrow(self):
+        a = pa.array([2**63], type=pa.uint64())
+        b = pa.array([1], type=pa.int64())
+        with pytest.raises(pa.ArrowInvalid):
+            pc.add(a, b)
+        with pytest.raises(pa.ArrowInvalid):
+            reduce_rows([a, b], "sum")
+
+    def test_rejects_non_numeric(self):
+        with pytest.raises(TypeError, match="numeric"):
+            reduce_rows([pa.array(["a"])], "sum")
+
+    def test_nan_propagates(self):
+        a = pa.array([np.nan, 1.0])
+        b = pa.array([1.0, 2.0])
+        for op in ["sum", "mean", "min", "max"]:
+            assert np.isnan(reduce_rows([a, b], op)[0].as_py())
+
+    def test_table_columns(self):
+        table = pa.table({"a": [1.0, 2.0], "b": [3.0, 4.0], "c": [5.0, 6.0]})
+        assert reduce_rows(table, "sum", columns=["a", "c"]).to_pylist() == [6.0, 8.0]
+        assert reduce_rows(table, "sum").equals(pc.add(pc.add(table["a"], table["b"]), table["c"]).combine_chunks())
+        with pytest.raises(KeyError, match="d"):
+            reduce_rows(table, "sum", columns=["d"])
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="Unknown reduction"):
+            reduce_rows([pa.array([1.0])], "median")
+        with pytest.raises(ValueError, match="At least one"):
+            reduce_rows([], "sum")
+        with pytest.raises(ValueError, match="same length"):
+            reduce_rows([pa.array([1.0]), pa.array([1.0, 2.0])], "sum")
@@ -1,5 +1,16 @@
+import os
+import subprocess
+import sys
+
+from pathlib import Path
+
+import pytest
+
 import compehndly
 
+from compehndly.core.manifest import generate_manifest, load_manifest, manifest_paths
+from compehndly.core.registry import MANIFEST_MODULES
+
 
 class TestBuildRegistry:
     def test_build(self):
@@ -16,3 +27,84 @@ class TestFunctionAccessor:
         compehndly._set_registry_builder(lambda: compehndly.FunctionRegistry.build_registry(_to_register=to_register))
         f = compehndly.add_one["0.0.1"]
         assert callable(f)
+
+
+class TestVersionIndex:
+    def test_latest_pointer(self):
+        registry = compehndly.FunctionRegistry.build_registry(["tests.utils"])
+        assert registry.latest_version("add_one") == "0.1.0"
+        assert registry.get("add_one")(-1) == 0
+
+    def test_out_of_order_registration(self):
+        registry = compehndly.FunctionRegistry()
+        registry.register("f", "0.2.0", lambda x: 2)
+        registry.register("f", "0.10.0", lambda x: 10)
+        registry.register("f", "0.1.0", lambda x: 1)
+        assert registry.list_versions("f") == ["0.1.0", "0.2.0", "0.10.0"]
+        assert registry.latest_version("f") == "0.10.0"
+        assert registry.get("f")(0) == 10
+        assert registry.get("f", "0.2.0")(0) == 2
+
+    def test_unknown_name(self):
+        registry = compehndly.FunctionRegistry()
+        with pytest.raises(KeyError):
+            registry.get("missing")
+
+
+class TestAccessorBinding:
+    def test_rebinds_after_builder_change(self):
+        def builder(offset):
+            registry = compehndly.FunctionRegistry()
+            registry.register("add", "0.0.1", lambda x: x + offset)
+            return registry
+
+        compehndly._set_registry_builder(lambda: builder(1))
+        add = compehndly.add
+        assert add(1) == 2
+
+        compehndly._set_registry_builder(lambda: builder(10))
+        assert add(1) == 11
+        assert compehndly.add(1) == 11
+
+    def test_rebinds_after_new_version(self):
+        registry = compehndly.FunctionRegistry()
+        registry.register("add", "0.0.1", lambda x: x + 1)
+        compehndly._set_registry_builder(lambda: registry)
+        add = compehndly.add
+        assert add(1) == 2
+
+        registry.register("add", "0.0.2", lambda x: x + 2)
+        assert add(1) == 3
+
+
+class TestManifest:
+    def test_manifest_in_sync_with_registrations(self):
+        for stem, modules in MANIFEST_MODULES.items():
+            (path,) = [p for p in manifest_paths() if p.stem == stem]
+            assert load_manifest([path]) == generate_manifest(modules), f"{path} is out of date"
+
+    def test_from_manifest_matches_build_registry(self):
+        lazy = compehndly.FunctionRegistry.from_manifest()
+        eager = compehndly.FunctionRegistry.build_registry()
+        assert sorted(lazy._functions) == sorted(eager._functions)
+        for name in eager._functions:
+            assert lazy.list_versions(name) == eager.list_versions(name)
+
+    def test_lazy_function_resolves_on_first_call(self):
+        registry = compehndly.FunctionRegistry()
+        registry.register_lazy("add_one", "0.0.1", "tests.utils", "_add_one_v0_0_1")
+        placeholder = registry.get("add_one")
+        assert placeholder(1) == 2
+        assert registry.get("add_one") is not placeholder
+        assert registry.get("add_one")(1) == 2
+
+    def test_unused_modules_are_not_imported(self):
+        code = (
+            "import sys, pyarrow as pa, compehndly\n"
+            "out = compehndly.standardize_creatinine(pa.array([50.0]), pa.array([25.0]))\n"
+            "assert out.to_pylist() == [200.0], out\n"
+            "assert 'compehndly.derived_variables.imputation' not in sys.modules\n"
+            "assert 'scipy' not in sys.modules\n"
+        )
+        env = {**os.environ, "PYTHONPATH": str(Path(compehndly.__file__).parents[1])}
+        subprocess.run([sys.executable, "-c", code], check=True, env=env)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from scipy import stats
+
+from compehndly.core.rng import new_seed, stream_id, uniforms
+
+
+@pytest.mark.base
+class TestRng:
+    def test_draw_depends_only_on_seed_row_and_stream(self):
+        rows = np.arange(10_000)
+        full = uniforms(42, rows, 3)
+        # any subset or order of rows draws the same values
+        picked = np.array([9_999, 17, 0, 5_000])
+        np.testing.assert_array_equal(uniforms(42, picked, 3), full[picked])
+        np.testing.assert_array_equal(np.concatenate([uniforms(42, rows[:123], 3), uniforms(42, rows[123:], 3)]), full)
+
+    def test_seeds_and_streams_differ(self):
+        rows = np.arange(1000)
+        base = uniforms(1, rows)
+        assert not np.array_equal(base, uniforms(2, rows))
+        assert not np.array_equal(base, uniforms(1, rows, 0))
+        assert not np.array_equal(uniforms(1, rows, 0), uniforms(1, rows, 1))
+
+    def test_uniform(self):
+        u = uniforms(7, np.arange(200_000))
+        assert np.all((u > 0) & (u < 1))
+        assert stats.kstest(u, "uniform").pvalue > 1e-3
+        # consecutive rows are not correlated
+        assert abs(np.corrcoef(u[:-1], u[1:])[0, 1]) < 0.01
+
+    def test_stream_id(self):
+        assert stream_id("lab-a") == stream_id("lab-a")
+        assert stream_id("lab-a") != stream_id("lab-b")
+        assert stream_id("1") != stream_id(1)
+        assert stream_id(-1) == 2**64 - 1
+        assert 0 <= new_seed() < 2**64